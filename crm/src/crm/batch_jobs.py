@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+from pydantic import BaseModel
+
+from crm.paths import course_work_dir
+from crm.settings import OPENAI_BACKEND
+from crm.translation_backends import ModelBackend, OpenAITranslationBackend
+
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+BATCH_ENDPOINT = "/v1/responses"
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_STATE_FILE_NAME = "batch_state.json"
+COMPLETED_STATUS = "completed"
+FAILED_STATUSES = {"failed", "expired", "cancelled"}
+
+
+@dataclass
+class BatchState:
+    backend: str
+    batch_id: str
+    input_file: str
+    video_ids: list[str]
+    requests: dict[str, list[dict[str, Any]]]
+    output_file: str | None = None
+    ingested: bool = False
+    # Translation cache model the requests were built for; results are stored under it even if
+    # the collecting run is configured with another model. Missing in states from older versions.
+    cache_model: str | None = None
+
+
+class BatchBackend(Protocol):
+    name: str
+
+    def submit(self, input_file: Path) -> str: ...
+
+    def fetch_results(self, batch_id: str, output_file: Path) -> str: ...
+
+
+class OpenAIBatchBackend:
+    name = "openai"
+
+    def __init__(self, client: OpenAI):
+        self._client = client
+
+    def submit(self, input_file: Path) -> str:
+        with input_file.open("rb") as handle:
+            uploaded = self._client.files.create(file=handle, purpose="batch")
+        batch = self._client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW,
+        )
+        return batch.id
+
+    def fetch_results(self, batch_id: str, output_file: Path) -> str:
+        batch = self._client.batches.retrieve(batch_id)
+        if batch.status != COMPLETED_STATUS:
+            return batch.status
+
+        # Failed requests land in the error file; both use the same per-line shape.
+        lines: list[str] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                lines.extend(line for line in self._client.files.content(file_id).text.splitlines() if line.strip())
+        output_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return COMPLETED_STATUS
+
+
+class FileBatchBackend:
+    # Offline stand-in: submitting copies the input into a directory, and a batch counts as
+    # completed once a `<batch_id>.output.jsonl` file in the OpenAI batch output format appears there.
+    name = "file"
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    def submit(self, input_file: Path) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        batch_id = f"file-{input_file.stem.removesuffix('.input')}"
+        shutil.copyfile(input_file, self.directory / f"{batch_id}.input.jsonl")
+        return batch_id
+
+    def fetch_results(self, batch_id: str, output_file: Path) -> str:
+        result_file = self.directory / f"{batch_id}.output.jsonl"
+        if not result_file.exists():
+            return "in_progress"
+        shutil.copyfile(result_file, output_file)
+        return COMPLETED_STATUS
+
+
+def batch_work_dir(language_code: str) -> Path:
+    return course_work_dir(language_code) / "batches"
+
+
+def default_file_backend_dir(language_code: str) -> Path:
+    return batch_work_dir(language_code) / "file-backend"
+
+
+def get_batch_backend(
+    name: str,
+    language_code: str,
+    model_backend: ModelBackend,
+    file_backend_dir: Path | None = None,
+) -> BatchBackend:
+    if name == OpenAIBatchBackend.name:
+        # The Batch API shares the translation backend's client, so the course and CLI settings
+        # (key, base URL, timeouts, retries) apply here too.
+        if model_backend.name != OPENAI_BACKEND or not isinstance(model_backend, OpenAITranslationBackend):
+            raise ValueError(f"The OpenAI Batch API needs the '{OPENAI_BACKEND}' translation backend.")
+        return OpenAIBatchBackend(model_backend.client())
+    if name == FileBatchBackend.name:
+        return FileBatchBackend(file_backend_dir or default_file_backend_dir(language_code))
+    raise ValueError(f"Unknown batch backend '{name}'.")
+
+
+def strict_json_schema(model: type[BaseModel]) -> dict[str, Any]:
+    schema = model.model_json_schema()
+
+    def tighten(node: Any) -> None:
+        if isinstance(node, dict):
+            if node.get("type") == "object":
+                node["additionalProperties"] = False
+                node["required"] = list(node.get("properties", {}).keys())
+            for value in node.values():
+                tighten(value)
+        elif isinstance(node, list):
+            for value in node:
+                tighten(value)
+
+    tighten(schema)
+    return schema
+
+
+def batch_request_line(custom_id: str, body: dict[str, Any]) -> str:
+    return json.dumps(
+        {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body},
+        ensure_ascii=False,
+    )
+
+
+def read_batch_output(output_file: Path) -> dict[str, str | None]:
+    # Maps custom_id to the response output text, or None when the request failed.
+    results: dict[str, str | None] = {}
+    with output_file.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            body = response.get("body") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                results[record["custom_id"]] = None
+                continue
+            texts = [
+                content.get("text", "")
+                for item in body.get("output", [])
+                if item.get("type") == "message"
+                for content in item.get("content", [])
+                if content.get("type") == "output_text"
+            ]
+            results[record["custom_id"]] = "".join(texts) or None
+    return results
+
+
+def load_batch_state(language_code: str) -> BatchState | None:
+    state_file = batch_work_dir(language_code) / BATCH_STATE_FILE_NAME
+    if not state_file.exists():
+        return None
+    with state_file.open("r", encoding="utf-8") as handle:
+        return BatchState(**json.load(handle))
+
+
+def save_batch_state(language_code: str, state: BatchState) -> None:
+    state_file = batch_work_dir(language_code) / BATCH_STATE_FILE_NAME
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = state_file.with_suffix(".tmp")
+    with temp_file.open("w", encoding="utf-8") as handle:
+        json.dump(asdict(state), handle, ensure_ascii=False, indent=2)
+    temp_file.replace(state_file)
+
+
+def archive_batch_state(language_code: str, state: BatchState) -> Path:
+    state_file = batch_work_dir(language_code) / BATCH_STATE_FILE_NAME
+    archived_file = batch_work_dir(language_code) / f"{state.batch_id}.state.json"
+    state_file.replace(archived_file)
+    return archived_file
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import random
+
+SYNTHETIC_WORDS = (
+    "hola", "mundo", "cómo", "estás", "gracias", "el", "la", "que", "de", "en",
+    "un", "por", "con", "para", "tiempo", "día", "casa", "agua", "ciudad", "camino",
+)
+
+
+def _format_vtt_timestamp(seconds: float) -> str:
+    milliseconds = round(seconds * 1000)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def build_synthetic_vtt(cue_count: int, seed: int = 0) -> str:
+    # Mimics long livestream captions: positioned timecodes, occasional inline tags,
+    # entities and two-line cues.
+    rng = random.Random(seed)
+    lines = ["WEBVTT", "Kind: captions", "Language: es", ""]
+    cursor = 0.0
+    for index in range(cue_count):
+        duration = rng.uniform(0.8, 4.0)
+        lines.append(
+            f"{_format_vtt_timestamp(cursor)} --> {_format_vtt_timestamp(cursor + duration)} align:start position:0%"
+        )
+        text = " ".join(rng.choices(SYNTHETIC_WORDS, k=rng.randint(3, 12)))
+        if index % 7 == 0:
+            text = f"<c>{text}</c>"
+        if index % 11 == 0:
+            text = f"{text} &amp; más"
+        if index % 5 == 0:
+            lines.append(text)
+            text = " ".join(rng.choices(SYNTHETIC_WORDS, k=rng.randint(2, 6)))
+        lines.append(text)
+        lines.append("")
+        cursor += duration
+    return "\n".join(lines)
+
+
+def build_synthetic_corpus(video_count: int, cue_count: int, seed: int = 0) -> dict[str, str]:
+    # Video ids have the 11-character YouTube shape so they pass through the real path helpers.
+    return {
+        f"bench{index:06d}": build_synthetic_vtt(cue_count, seed=seed + index)
+        for index in range(video_count)
+    }
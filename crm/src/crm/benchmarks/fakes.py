@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import io
+import json
+import random
+import threading
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+from openai import APIConnectionError
+from pydantic import BaseModel
+
+from crm.snippet_packing import CHARS_PER_TOKEN_ESTIMATE
+
+SUBTITLE_URL_PREFIX = "fake-subtitles://"
+
+
+class FakeYoutubeDL:
+    # Stands in for yt_dlp.YoutubeDL: every video in the corpus has one manual track whose
+    # "URL" resolves to the corpus body. Counts extractions and body reads across instances.
+    extractions = 0
+    reads = 0
+
+    def __init__(self, corpus: dict[str, str], language: str, options: dict[str, Any] | None = None):
+        self.corpus = corpus
+        self.language = language
+        self.options = options or {}
+
+    def __enter__(self) -> FakeYoutubeDL:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+    def extract_info(self, url: str, download: bool = False) -> dict[str, Any]:
+        video_id = parse_qs(urlparse(url).query)["v"][0]
+        if video_id not in self.corpus:
+            raise RuntimeError(f"Video '{video_id}' is not in the synthetic corpus.")
+        FakeYoutubeDL.extractions += 1
+        return {
+            "id": video_id,
+            "subtitles": {
+                self.language: [{"ext": "vtt", "url": f"{SUBTITLE_URL_PREFIX}{video_id}/{self.language}"}],
+            },
+            "automatic_captions": {},
+        }
+
+    def urlopen(self, url: str) -> io.BytesIO:
+        FakeYoutubeDL.reads += 1
+        video_id = url.removeprefix(SUBTITLE_URL_PREFIX).split("/")[0]
+        return io.BytesIO(self.corpus[video_id].encode("utf-8"))
+
+
+@dataclass(frozen=True)
+class FakeUsage:
+    input_tokens: int
+    output_tokens: int
+
+
+class FakeParsedResponse:
+    def __init__(self, output_parsed: BaseModel, usage: FakeUsage):
+        self.output_parsed = output_parsed
+        self.usage = usage
+
+
+class FakeResponses:
+    # Answers structured translation requests from the request text alone. A seeded share of
+    # calls fails, alternating between a connection error and a response with one item missing,
+    # so retries and shape-mismatch splits run the same way on every run.
+    def __init__(self, failure_rate: float = 0.0, seed: int = 0):
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.failures = 0
+        self.requested_words = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def parse(self, model: str, input: list[dict[str, str]], text_format: type[BaseModel]) -> FakeParsedResponse:
+        content = input[-1]["content"]
+        if "snippets" in text_format.model_fields:
+            snippets = json.loads(content.split("Snippets: ", 1)[1])
+            word_count = sum(len(snippet["words"]) for snippet in snippets)
+        else:
+            words = json.loads(content.split("Words to translate in order: ", 1)[1])
+            word_count = len(words)
+
+        with self._lock:
+            self.calls += 1
+            self.requested_words += word_count
+            failure = self._rng.random() < self.failure_rate
+            if failure:
+                self.failures += 1
+                raise_error = self.failures % 2 == 1
+
+        if failure and raise_error:
+            raise APIConnectionError(
+                message="Injected translation failure.",
+                request=httpx.Request("POST", "https://fake-openai.invalid/v1/responses"),
+            )
+        if "snippets" in text_format.model_fields:
+            payload = {
+                "snippets": [
+                    {"id": snippet["id"], "translations": _fake_translations(snippet["words"])}
+                    for snippet in snippets
+                ]
+            }
+            if failure:
+                payload["snippets"][-1]["translations"].pop()
+        else:
+            payload = {"translations": _fake_translations(words)}
+            if failure:
+                payload["translations"].pop()
+        usage = FakeUsage(
+            input_tokens=sum(len(message["content"]) for message in input) // CHARS_PER_TOKEN_ESTIMATE,
+            output_tokens=len(json.dumps(payload, ensure_ascii=False)) // CHARS_PER_TOKEN_ESTIMATE,
+        )
+        return FakeParsedResponse(text_format.model_validate(payload), usage)
+
+
+def _fake_translations(words: list[str]) -> list[dict[str, str]]:
+    return [{"word": word, "meaning": f"gloss of {word}"} for word in words]
+
+
+class FakeOpenAI:
+    def __init__(self, failure_rate: float = 0.0, seed: int = 0):
+        self.responses = FakeResponses(failure_rate=failure_rate, seed=seed)
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest import mock
+
+import crm.subtitle_utils as subtitle_utils
+from crm.benchmarks.corpus import build_synthetic_corpus
+from crm.benchmarks.fakes import FakeOpenAI, FakeYoutubeDL
+from crm.commands import generate_data
+from crm.benchmarks.settings import DEFAULT_TOLERANCE, PipelineSettings
+from crm.settings import CHUNKED_FORMAT, COMPACT_FORMAT, LEGACY_FORMAT
+from crm.snippet_packing import SnippetSource, build_snippet_sources, extract_words
+from crm.subtitle_cache import SubtitleCache
+from crm.subtitle_utils import parse_vtt_segments
+from crm.translation_backends import BackendSettings, OpenAITranslationBackend
+from crm.translation_cache import TranslationCache
+from crm.video_data import read_video_data, video_data_file, write_video_data
+
+BENCHMARK_RESULTS_VERSION = 1
+BENCHMARK_LANGUAGE = "es"
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    unit: str
+    items: int
+    seconds: float
+    peak_bytes: int
+    details: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.items / self.seconds if self.seconds else 0.0
+
+
+@dataclass(frozen=True)
+class BenchmarkComparison:
+    name: str
+    throughput_ratio: float
+    peak_ratio: float
+    regressed: bool
+
+
+@dataclass
+class _Workspace:
+    root: Path
+    translation_cache: TranslationCache
+    subtitle_cache: SubtitleCache
+    client: FakeOpenAI
+    model_backend: OpenAITranslationBackend
+
+
+@contextlib.contextmanager
+def _quiet() -> Iterator[None]:
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def _offline_pipeline(corpus: dict[str, str], settings: PipelineSettings) -> Iterator[_Workspace]:
+    # Fresh caches per run, so every run translates and fetches the same amount of work.
+    root = Path(tempfile.mkdtemp(prefix="crm-benchmark-"))
+    client = FakeOpenAI(failure_rate=settings.failure_rate, seed=settings.seed)
+    workspace = _Workspace(
+        root=root,
+        translation_cache=TranslationCache(root / "translations.sqlite3"),
+        subtitle_cache=SubtitleCache(root / "subtitles"),
+        client=client,
+        # Injected failures are retried at once; real backoff would only measure sleeping.
+        model_backend=OpenAITranslationBackend(
+            BackendSettings(backoff_seconds=0.0, breaker_cooldown_seconds=0.0),
+            client=client,
+        ),
+    )
+    try:
+        with (
+            mock.patch.object(subtitle_utils, "YoutubeDL", partial(FakeYoutubeDL, corpus, BENCHMARK_LANGUAGE)),
+            mock.patch.object(subtitle_utils, "get_subtitle_cache", lambda: workspace.subtitle_cache),
+            mock.patch.object(generate_data, "get_translation_cache", lambda: workspace.translation_cache),
+            _quiet(),
+        ):
+            yield workspace
+    finally:
+        workspace.translation_cache.close()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def _measure(
+    name: str,
+    unit: str,
+    repeats: int,
+    run: Callable[[], tuple[int, dict[str, Any]]],
+) -> BenchmarkResult:
+    # Best-of-n wall time without tracing, then one traced run for peak memory, since
+    # tracemalloc slows allocation-heavy code several times over.
+    best = float("inf")
+    items, details = 0, {}
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        items, details = run()
+        best = min(best, time.perf_counter() - started)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return BenchmarkResult(name=name, unit=unit, items=items, seconds=best, peak_bytes=peak_bytes, details=details)
+
+
+def _fake_translations(sources: list[SnippetSource]) -> list[list[generate_data.WordEntry]]:
+    return [
+        [generate_data.WordEntry(word=word, meaning=f"gloss of {word}") for word in source.words]
+        for source in sources
+    ]
+
+
+def run_pipeline_benchmarks(settings: PipelineSettings) -> list[BenchmarkResult]:
+    corpus = build_synthetic_corpus(settings.video_count, settings.cue_count, seed=settings.seed)
+    documents = list(corpus.values())
+    cues = [cue for document in documents for cue in parse_vtt_segments(document)]
+    cue_texts = [cue.text for cue in cues]
+    sources = build_snippet_sources(cues)
+    translations = _fake_translations(sources)
+    results: list[BenchmarkResult] = []
+
+    def parse() -> tuple[int, dict[str, Any]]:
+        return sum(len(parse_vtt_segments(document)) for document in documents), {
+            "bytes": sum(len(document.encode("utf-8")) for document in documents)
+        }
+
+    def words() -> tuple[int, dict[str, Any]]:
+        return sum(len(extract_words(text)) for text in cue_texts), {}
+
+    def assemble() -> tuple[int, dict[str, Any]]:
+        return len(build_snippet_sources(cues)), {}
+
+    results.append(_measure("parse_vtt_segments", "cues", settings.repeats, parse))
+    results.append(_measure("extract_words", "words", settings.repeats, words))
+    results.append(_measure("build_snippet_sources", "snippets", settings.repeats, assemble))
+
+    for data_format in (LEGACY_FORMAT, COMPACT_FORMAT, CHUNKED_FORMAT):
+        def write(data_format: str = data_format) -> tuple[int, dict[str, Any]]:
+            with tempfile.TemporaryDirectory(prefix="crm-benchmark-") as temp_dir:
+                output_file = Path(temp_dir) / "video.json"
+                write_video_data(output_file, sources, translations, data_format=data_format)
+                written = sum(path.stat().st_size for path in Path(temp_dir).rglob("*") if path.is_file())
+            return len(sources), {"bytes": written}
+
+        results.append(_measure(f"write_video_data[{data_format}]", "snippets", settings.repeats, write))
+
+    def process_videos() -> tuple[int, dict[str, Any]]:
+        with _offline_pipeline(corpus, settings) as workspace:
+            output_dir = workspace.root / "videos"
+            output_dir.mkdir()
+            snippet_count = 0
+            for video_id in corpus:
+                generate_data.process_video(
+                    video_id,
+                    BENCHMARK_LANGUAGE,
+                    output_dir,
+                    local_translator=None,
+                    model_backend=workspace.model_backend,
+                )
+                snippet_count += len(read_video_data(video_data_file(output_dir, video_id)))
+            responses = workspace.client.responses
+            return snippet_count, {"requests": responses.calls, "failed_requests": responses.failures}
+
+    results.append(_measure("process_video", "snippets", settings.repeats, process_videos))
+
+    def translate() -> tuple[int, dict[str, Any]]:
+        with _offline_pipeline(corpus, settings) as workspace:
+            translated = 0
+            requested = 0
+            for source in sources:
+                requested += len(source.words)
+                translated += len(
+                    generate_data.translate_words(
+                        workspace.model_backend, list(source.words), source.context, BENCHMARK_LANGUAGE
+                    )
+                )
+            responses = workspace.client.responses
+            return requested, {
+                "requests": responses.calls,
+                "failed_requests": responses.failures,
+                "untranslated_words": requested - translated,
+            }
+
+    results.append(_measure("translate_words", "words", settings.repeats, translate))
+    return results
+
+
+def save_results(path: Path, settings: PipelineSettings, results: list[BenchmarkResult]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": BENCHMARK_RESULTS_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": asdict(settings),
+        "results": [{**asdict(result), "throughput": result.throughput} for result in results],
+    }
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+    temp_path.replace(path)
+
+
+def load_results(path: Path) -> tuple[PipelineSettings, list[BenchmarkResult]]:
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if data.get("version") != BENCHMARK_RESULTS_VERSION:
+        raise ValueError(f"Unsupported benchmark results version in {path}: {data.get('version')!r}.")
+    results = []
+    for item in data["results"]:
+        item = dict(item)
+        item.pop("throughput", None)
+        results.append(BenchmarkResult(**item))
+    return PipelineSettings(**data["settings"]), results
+
+
+def compare_results(
+    results: list[BenchmarkResult],
+    baseline: list[BenchmarkResult],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[BenchmarkComparison]:
+    baseline_by_name = {result.name: result for result in baseline}
+    comparisons = []
+    for result in results:
+        previous = baseline_by_name.get(result.name)
+        if previous is None:
+            continue
+        throughput_ratio = result.throughput / previous.throughput if previous.throughput else 0.0
+        peak_ratio = result.peak_bytes / previous.peak_bytes if previous.peak_bytes else 0.0
+        comparisons.append(
+            BenchmarkComparison(
+                name=result.name,
+                throughput_ratio=throughput_ratio,
+                peak_ratio=peak_ratio,
+                regressed=throughput_ratio < 1 - tolerance or peak_ratio > 1 + tolerance,
+            )
+        )
+    return comparisons
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from crm.paths import CRM_DATA_ROOT
+
+BENCHMARK_ROOT = CRM_DATA_ROOT / "benchmarks"
+DEFAULT_RESULTS_FILE = BENCHMARK_ROOT / "latest.json"
+DEFAULT_BASELINE_FILE = BENCHMARK_ROOT / "baseline.json"
+DEFAULT_VIDEO_COUNT = 4
+DEFAULT_CUE_COUNT = 2_000
+DEFAULT_FAILURE_RATE = 0.1
+DEFAULT_TOLERANCE = 0.1
+DEFAULT_STARTUP_BUDGET_MS = 200.0
+
+
+@dataclass(frozen=True)
+class PipelineSettings:
+    video_count: int = DEFAULT_VIDEO_COUNT
+    cue_count: int = DEFAULT_CUE_COUNT
+    repeats: int = 3
+    failure_rate: float = DEFAULT_FAILURE_RATE
+    seed: int = 0
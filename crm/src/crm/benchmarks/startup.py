@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import crm
+
+STARTUP_MODULE = "crm.cli"
+# Packages that only the command needing them may import; any of them at startup means a
+# command module or an SDK leaked back into the CLI's import graph.
+DEFERRED_PACKAGES = (
+    "argostranslate",
+    "googleapiclient",
+    "httpx",
+    "langcodes",
+    "openai",
+    "pydantic",
+    "tqdm",
+    "youtube_transcript_api",
+    "yt_dlp",
+)
+# The only crm modules the parser may load: dependency-free settings, so the budget does not
+# rest on every feature module keeping its own imports deferred.
+STARTUP_CRM_MODULES = ("crm", "crm.benchmarks", "crm.benchmarks.settings", "crm.cli", "crm.paths", "crm.settings")
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+@dataclass(frozen=True)
+class StartupResult:
+    module: str
+    total_ms: float
+    timings: list[ImportTiming]
+    deferred_imports: list[str]
+    feature_imports: list[str]
+
+
+def parse_importtime(output: str) -> list[ImportTiming]:
+    # Lines look like "import time:       350 |     975318 |   crm.cli"; the header repeats the
+    # column names instead of numbers.
+    timings = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line.removeprefix("import time:").split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        timings.append(ImportTiming(fields[2].strip(), int(fields[0]), int(fields[1])))
+    return timings
+
+
+def _importtime_run(module: str) -> list[ImportTiming]:
+    # A fresh interpreter per run, with crm importable the same way as in this process.
+    source_root = str(Path(crm.__file__).resolve().parent.parent)
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [source_root, env.get("PYTHONPATH")]))
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return parse_importtime(completed.stderr)
+
+
+def measure_startup(module: str = STARTUP_MODULE, repeats: int = 5) -> StartupResult:
+    # The first run may compile bytecode, so the fastest of the runs is reported.
+    best: list[ImportTiming] | None = None
+    best_total = float("inf")
+    for _ in range(max(1, repeats)):
+        timings = _importtime_run(module)
+        total = next((timing.cumulative_us for timing in reversed(timings) if timing.module == module), 0)
+        if total < best_total:
+            best, best_total = timings, total
+
+    timings = best or []
+    deferred_imports = sorted(
+        {timing.module for timing in timings if timing.module.split(".")[0] in DEFERRED_PACKAGES}
+    )
+    feature_imports = sorted(
+        {
+            timing.module
+            for timing in timings
+            if timing.module.split(".")[0] == "crm" and timing.module not in STARTUP_CRM_MODULES
+        }
+    )
+    return StartupResult(
+        module=module,
+        total_ms=best_total / 1000,
+        timings=timings,
+        deferred_imports=deferred_imports,
+        feature_imports=feature_imports,
+    )
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import html
+import time
+from dataclasses import dataclass
+
+from crm.benchmarks.corpus import build_synthetic_vtt
+from crm.subtitle_utils import TAG_RE, TIMECODE_RE, iter_vtt_cues
+
+DEFAULT_CUE_COUNTS = (10_000, 50_000, 100_000)
+
+
+@dataclass(frozen=True)
+class VttParsingResult:
+    cue_count: int
+    document_bytes: int
+    legacy_seconds: float
+    streaming_seconds: float
+
+    @property
+    def speedup(self) -> float:
+        return self.legacy_seconds / self.streaming_seconds if self.streaming_seconds else 0.0
+
+
+def _legacy_parse_timestamp(value: str) -> float:
+    hours, minutes, seconds = value.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def legacy_parse_vtt_segments(vtt_text: str) -> list[dict[str, float | str]]:
+    # Frozen copy of the previous splitlines/regex/dict-per-cue parser, kept as the baseline.
+    segments: list[dict[str, float | str]] = []
+    cue_lines: list[str] = []
+    start: float | None = None
+    end: float | None = None
+
+    def flush() -> None:
+        nonlocal cue_lines, start, end
+        if start is None or end is None:
+            cue_lines = []
+            return
+        text = " ".join(line.strip() for line in cue_lines if line.strip())
+        text = html.unescape(TAG_RE.sub("", text)).strip()
+        if text:
+            segments.append({"text": text, "start": start, "duration": max(0.0, end - start)})
+        cue_lines = []
+        start = None
+        end = None
+
+    for raw_line in vtt_text.splitlines():
+        line = raw_line.strip("\ufeff").strip()
+        if not line:
+            flush()
+            continue
+        if line == "WEBVTT" or line.startswith(("NOTE", "STYLE", "REGION")):
+            continue
+        if "-->" in line:
+            match = TIMECODE_RE.match(line)
+            if not match:
+                continue
+            start = _legacy_parse_timestamp(match.group("start"))
+            end = _legacy_parse_timestamp(match.group("end"))
+            continue
+        if start is None and line.isdigit():
+            continue
+        cue_lines.append(line)
+
+    flush()
+    return segments
+
+
+def _best_of(repeats: int, function, *args) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def _consume_streaming(vtt_text: str) -> list[tuple[str, float, float]]:
+    return [(cue.text, cue.start, cue.duration) for cue in iter_vtt_cues(vtt_text)]
+
+
+def benchmark_vtt_parsing(cue_count: int, repeats: int = 3) -> VttParsingResult:
+    vtt_text = build_synthetic_vtt(cue_count)
+    legacy_seconds, legacy_segments = _best_of(repeats, legacy_parse_vtt_segments, vtt_text)
+    streaming_seconds, streaming_cues = _best_of(repeats, _consume_streaming, vtt_text)
+
+    expected = [(segment["text"], segment["start"], segment["duration"]) for segment in legacy_segments]
+    if expected != streaming_cues:
+        raise RuntimeError(f"Streaming VTT parser disagrees with the legacy parser on {cue_count} synthetic cues.")
+
+    return VttParsingResult(
+        cue_count=cue_count,
+        document_bytes=len(vtt_text.encode("utf-8")),
+        legacy_seconds=legacy_seconds,
+        streaming_seconds=streaming_seconds,
+    )
@@ -1,8 +1,40 @@
 from __future__ import annotations
 
 import argparse
+import importlib
+from pathlib import Path
+from types import ModuleType
 
-from crm.commands import extract_subtitles, find_videos, generate_data, migrate_legacy_data
+from crm.benchmarks.settings import (
+    DEFAULT_BASELINE_FILE,
+    DEFAULT_CUE_COUNT,
+    DEFAULT_FAILURE_RATE,
+    DEFAULT_RESULTS_FILE,
+    DEFAULT_STARTUP_BUDGET_MS,
+    DEFAULT_TOLERANCE,
+    DEFAULT_VIDEO_COUNT,
+    PipelineSettings,
+)
+from crm.settings import (
+    DEFAULT_CHUNK_SECONDS,
+    DEFAULT_DAILY_QUOTA,
+    DEFAULT_INTER_THREADS,
+    DEFAULT_INTRA_THREADS,
+    DEFAULT_PACK_TOKEN_BUDGET,
+    DEFAULT_PROBE_RATE,
+    DEFAULT_PROBE_WORKERS,
+    DEFAULT_TRACK_WORKERS,
+    LEGACY_FORMAT,
+    TRACK_SELECTIONS,
+    TRANSLATION_BACKENDS,
+    VIDEO_DATA_FORMATS,
+)
+
+
+def _command(name: str) -> ModuleType:
+    # Command modules pull in the OpenAI, Google and yt-dlp clients, so each one is imported
+    # only when its subcommand runs; the parser itself needs nothing but the settings modules above.
+    return importlib.import_module(f"crm.commands.{name}")
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -10,7 +42,7 @@ def build_parser() -> argparse.ArgumentParser:
     subparsers = parser.add_subparsers(dest="command", required=True)
 
     migrate_parser = subparsers.add_parser("migrate-legacy-data")
-    migrate_parser.set_defaults(handler=lambda args: migrate_legacy_data.run())
+    migrate_parser.set_defaults(handler=lambda args: _command("migrate_legacy_data").run())
 
     generate_parser = subparsers.add_parser("generate-data")
     generate_parser.add_argument("--course", required=True)
@@ -19,32 +51,328 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Prefer local Argos translation to English when the subtitle language is supported.",
     )
+    generate_parser.add_argument(
+        "--backend",
+        choices=TRANSLATION_BACKENDS,
+        help="Translation backend; overrides the course's translation settings ('argos' is --local-translation).",
+    )
+    generate_parser.add_argument(
+        "--backend-model",
+        help="Model name sent to the translation backend.",
+    )
+    generate_parser.add_argument(
+        "--backend-url",
+        help="Base URL of an OpenAI-compatible server, e.g. http://localhost:8080/v1.",
+    )
+    generate_parser.add_argument(
+        "--backend-timeout",
+        type=float,
+        help="Seconds to wait for one translation response.",
+    )
+    generate_parser.add_argument(
+        "--backend-max-connections",
+        type=int,
+        help="Size of the HTTP connection pool shared by all translation requests.",
+    )
+    generate_parser.add_argument(
+        "--requests-per-minute",
+        type=float,
+        help="Translation requests per minute shared by all videos and workers (0 disables the limit).",
+    )
+    generate_parser.add_argument(
+        "--tokens-per-minute",
+        type=float,
+        help="Estimated translation tokens per minute shared by all videos and workers (0 disables the limit).",
+    )
+    generate_parser.add_argument(
+        "--local-inter-threads",
+        type=int,
+        default=DEFAULT_INTER_THREADS,
+        help="Number of local translation batches CTranslate2 may run in parallel.",
+    )
+    generate_parser.add_argument(
+        "--local-intra-threads",
+        type=int,
+        default=DEFAULT_INTRA_THREADS,
+        help="Number of CPU threads CTranslate2 uses per local translation batch (0 picks a default).",
+    )
     generate_parser.add_argument(
         "--one-new",
         action="store_true",
         help="Stop after generating data for the first unprocessed video.",
     )
+    generate_parser.add_argument(
+        "--pack-tokens",
+        type=int,
+        default=DEFAULT_PACK_TOKEN_BUDGET,
+        help="Estimated token budget for packing several snippets into one translation request (0 sends one request per snippet).",
+    )
+    generate_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Number of translation requests to keep in flight per video using the async client.",
+    )
+    generate_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of videos to fetch, translate and write in parallel.",
+    )
+    batch_group = generate_parser.add_mutually_exclusive_group()
+    batch_group.add_argument(
+        "--batch-submit",
+        action="store_true",
+        help="Write all pending translation requests for the course as one offline batch job and submit it.",
+    )
+    batch_group.add_argument(
+        "--batch-collect",
+        action="store_true",
+        help="Ingest the results of the submitted batch job and write the per-video JSON files.",
+    )
+    generate_parser.add_argument(
+        "--batch-backend",
+        choices=["openai", "file"],
+        default="openai",
+        help="Batch backend; 'file' reads results from a local directory for offline runs.",
+    )
+    generate_parser.add_argument(
+        "--batch-dir",
+        type=Path,
+        help="Directory used by the 'file' batch backend.",
+    )
+    generate_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve subtitles only from the local subtitle cache, without network access.",
+    )
+    generate_parser.add_argument(
+        "--format",
+        choices=VIDEO_DATA_FORMATS,
+        default=LEGACY_FORMAT,
+        help=(
+            "Per-video output format; 'compact' writes a shared word table, millisecond times and .gz/.br copies, "
+            "'chunked' splits that into time chunks behind a seek index."
+        ),
+    )
+    generate_parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=DEFAULT_CHUNK_SECONDS,
+        help="Snippet start times covered by each chunk of the 'chunked' format.",
+    )
+    generate_parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Revisit already generated videos and re-translate only snippets whose text or translation settings changed.",
+    )
     generate_parser.set_defaults(
-        handler=lambda args: generate_data.run(
+        handler=lambda args: _command("generate_data").run(
             args.course,
             use_local_translation=args.local_translation,
             stop_after_one_new=args.one_new,
+            pack_token_budget=args.pack_tokens,
+            concurrency=args.concurrency,
+            jobs=args.jobs,
+            local_inter_threads=args.local_inter_threads,
+            local_intra_threads=args.local_intra_threads,
+            batch_submit=args.batch_submit,
+            batch_collect=args.batch_collect,
+            batch_backend=args.batch_backend,
+            batch_dir=args.batch_dir,
+            offline=args.offline,
+            data_format=args.format,
+            chunk_seconds=args.chunk_seconds,
+            refresh=args.refresh,
+            translation_backend=args.backend,
+            backend_model=args.backend_model,
+            backend_url=args.backend_url,
+            backend_timeout=args.backend_timeout,
+            backend_max_connections=args.backend_max_connections,
+            requests_per_minute=args.requests_per_minute,
+            tokens_per_minute=args.tokens_per_minute,
         )
     )
 
+    convert_parser = subparsers.add_parser("convert-video-data")
+    convert_parser.add_argument("--course", required=True)
+    convert_parser.add_argument("--format", choices=VIDEO_DATA_FORMATS, required=True)
+    convert_parser.add_argument("--chunk-seconds", type=float, default=DEFAULT_CHUNK_SECONDS)
+    convert_parser.set_defaults(
+        handler=lambda args: _command("convert_video_data").run(args.course, args.format, args.chunk_seconds)
+    )
+
     subtitles_parser = subparsers.add_parser("extract-subtitles")
     subtitles_parser.add_argument("--course", required=True)
-    subtitles_parser.set_defaults(handler=lambda args: extract_subtitles.run(args.course))
+    subtitles_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of videos to process in parallel.",
+    )
+    subtitles_parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve subtitles only from the local subtitle cache, without network access.",
+    )
+    subtitles_parser.add_argument(
+        "--tracks",
+        choices=TRACK_SELECTIONS,
+        default="all",
+        help="Extract every track, or only manually created ones (no automatic captions or auto-translations).",
+    )
+    subtitles_parser.add_argument(
+        "--languages",
+        nargs="+",
+        help="Only extract tracks in these languages (e.g. ar en-US); a base code also matches its regional variants.",
+    )
+    subtitles_parser.add_argument(
+        "--track-workers",
+        type=int,
+        default=DEFAULT_TRACK_WORKERS,
+        help="Number of fetched tracks per video parsed and written in parallel.",
+    )
+    subtitles_parser.set_defaults(
+        handler=lambda args: _command("extract_subtitles").run(
+            args.course,
+            jobs=args.jobs,
+            offline=args.offline,
+            selection=args.tracks,
+            languages=args.languages,
+            track_workers=args.track_workers,
+        )
+    )
 
     find_parser = subparsers.add_parser("find-videos")
     find_parser.add_argument("--course", required=True)
     find_parser.add_argument("--target-count", type=int, default=20)
     find_parser.add_argument("--max-attempts", type=int, default=10)
+    find_parser.add_argument(
+        "--probe-workers",
+        type=int,
+        default=DEFAULT_PROBE_WORKERS,
+        help="Number of candidate videos whose transcript lists are checked in parallel.",
+    )
+    find_parser.add_argument(
+        "--probe-rate",
+        type=float,
+        default=DEFAULT_PROBE_RATE,
+        help="Maximum transcript list requests per second to YouTube (0 disables the limit).",
+    )
+    find_parser.add_argument(
+        "--quota-budget",
+        type=int,
+        help="Maximum YouTube Data API quota units this run may spend (default: whatever is left today).",
+    )
+    find_parser.add_argument(
+        "--daily-quota",
+        type=int,
+        default=DEFAULT_DAILY_QUOTA,
+        help="Daily YouTube Data API quota of the API key.",
+    )
     find_parser.set_defaults(
-        handler=lambda args: find_videos.run(
+        handler=lambda args: _command("find_videos").run(
             args.course,
             target_count=args.target_count,
             max_attempts=args.max_attempts,
+            probe_workers=args.probe_workers,
+            probe_rate=args.probe_rate,
+            quota_budget=args.quota_budget,
+            daily_quota=args.daily_quota,
+        )
+    )
+
+    cache_parser = subparsers.add_parser("cache")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+    cache_info_parser = cache_subparsers.add_parser("info")
+    cache_info_parser.set_defaults(handler=lambda args: _command("cache").run_info())
+    cache_prune_parser = cache_subparsers.add_parser("prune")
+    cache_prune_parser.add_argument(
+        "--older-than-days",
+        type=float,
+        help="Only remove cached subtitles fetched more than this many days ago.",
+    )
+    cache_prune_parser.add_argument("--video", help="Only remove cached subtitles for this video id.")
+    cache_prune_parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Remove every cached subtitle; needed when no filter is given.",
+    )
+    cache_prune_parser.set_defaults(
+        handler=lambda args: _command("cache").run_prune(
+            older_than_days=args.older_than_days,
+            video_id=args.video,
+            remove_all=args.all,
+        )
+    )
+
+    benchmark_parser = subparsers.add_parser("benchmark")
+    benchmark_subparsers = benchmark_parser.add_subparsers(dest="benchmark_command", required=True)
+    benchmark_vtt_parser = benchmark_subparsers.add_parser("vtt")
+    benchmark_vtt_parser.add_argument(
+        "--cues",
+        type=int,
+        nargs="+",
+        help="Synthetic document sizes in cues (default: 10000 50000 100000).",
+    )
+    benchmark_vtt_parser.add_argument("--repeats", type=int, default=3)
+    benchmark_vtt_parser.set_defaults(
+        handler=lambda args: _command("benchmark").run_vtt(args.cues, repeats=args.repeats)
+    )
+    benchmark_pipeline_parser = benchmark_subparsers.add_parser("pipeline")
+    benchmark_pipeline_parser.add_argument("--videos", type=int, default=DEFAULT_VIDEO_COUNT)
+    benchmark_pipeline_parser.add_argument("--cues", type=int, default=DEFAULT_CUE_COUNT, help="Cues per synthetic video.")
+    benchmark_pipeline_parser.add_argument("--repeats", type=int, default=3)
+    benchmark_pipeline_parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=DEFAULT_FAILURE_RATE,
+        help="Share of fake translation requests that fail, to exercise retries and batch splitting.",
+    )
+    benchmark_pipeline_parser.add_argument("--seed", type=int, default=0)
+    benchmark_pipeline_parser.add_argument("--output", type=Path, default=DEFAULT_RESULTS_FILE)
+    benchmark_pipeline_parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE_FILE)
+    benchmark_pipeline_parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Record this run as the baseline instead of comparing against it.",
+    )
+    benchmark_pipeline_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help="Relative throughput drop or peak memory growth reported as a regression.",
+    )
+    benchmark_pipeline_parser.set_defaults(
+        handler=lambda args: _command("benchmark").run_pipeline(
+            PipelineSettings(
+                video_count=args.videos,
+                cue_count=args.cues,
+                repeats=args.repeats,
+                failure_rate=args.failure_rate,
+                seed=args.seed,
+            ),
+            output_file=args.output,
+            baseline_file=args.baseline,
+            save_baseline=args.save_baseline,
+            tolerance=args.tolerance,
+        )
+    )
+
+    benchmark_startup_parser = benchmark_subparsers.add_parser("startup")
+    benchmark_startup_parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_STARTUP_BUDGET_MS,
+        help="Fail when importing the CLI takes longer than this.",
+    )
+    benchmark_startup_parser.add_argument("--repeats", type=int, default=5)
+    benchmark_startup_parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list.")
+    benchmark_startup_parser.set_defaults(
+        handler=lambda args: _command("benchmark").run_startup(
+            budget_ms=args.budget_ms,
+            repeats=args.repeats,
+            top=args.top,
         )
     )
 
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from pathlib import Path
+
+from crm.benchmarks.pipeline import compare_results, load_results, run_pipeline_benchmarks, save_results
+from crm.benchmarks.settings import (
+    DEFAULT_BASELINE_FILE,
+    DEFAULT_RESULTS_FILE,
+    DEFAULT_STARTUP_BUDGET_MS,
+    DEFAULT_TOLERANCE,
+    PipelineSettings,
+)
+from crm.benchmarks.startup import measure_startup
+from crm.benchmarks.vtt_parsing import DEFAULT_CUE_COUNTS, benchmark_vtt_parsing
+
+
+def run_vtt(cue_counts: list[int] | None = None, repeats: int = 3) -> None:
+    print(f"{'cues':>8} {'MB':>7} {'legacy cues/s':>14} {'streaming cues/s':>17} {'speedup':>8}")
+    for cue_count in cue_counts or DEFAULT_CUE_COUNTS:
+        result = benchmark_vtt_parsing(cue_count, repeats=repeats)
+        print(
+            f"{result.cue_count:>8} "
+            f"{result.document_bytes / 1_000_000:>7.1f} "
+            f"{result.cue_count / result.legacy_seconds:>14,.0f} "
+            f"{result.cue_count / result.streaming_seconds:>17,.0f} "
+            f"{result.speedup:>7.2f}x"
+        )
+
+
+def run_pipeline(
+    settings: PipelineSettings,
+    output_file: Path = DEFAULT_RESULTS_FILE,
+    baseline_file: Path = DEFAULT_BASELINE_FILE,
+    save_baseline: bool = False,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> None:
+    print(
+        f"Benchmarking the pipeline offline on {settings.video_count} synthetic videos of {settings.cue_count} cues "
+        f"({settings.failure_rate:.0%} injected translation failures, best of {settings.repeats})"
+    )
+    results = run_pipeline_benchmarks(settings)
+
+    print(f"{'benchmark':<26} {'items':>9} {'seconds':>9} {'items/s':>12} {'peak MB':>8}  details")
+    for result in results:
+        details = " ".join(f"{key}={value}" for key, value in result.details.items())
+        print(
+            f"{result.name:<26} "
+            f"{result.items:>9} "
+            f"{result.seconds:>9.3f} "
+            f"{result.throughput:>12,.0f} "
+            f"{result.peak_bytes / 1_000_000:>8.1f}  {details}"
+        )
+
+    save_results(output_file, settings, results)
+    print(f"Results written to {output_file}")
+    if save_baseline:
+        save_results(baseline_file, settings, results)
+        print(f"Baseline written to {baseline_file}")
+        return
+    if not baseline_file.exists():
+        print(f"No baseline at {baseline_file}; save one with --save-baseline.")
+        return
+
+    baseline_settings, baseline = load_results(baseline_file)
+    if replace(baseline_settings, repeats=settings.repeats) != settings:
+        print(f"Warning: the baseline was recorded with different settings: {baseline_settings}")
+    comparisons = compare_results(results, baseline, tolerance=tolerance)
+    print(f"{'benchmark':<26} {'throughput':>11} {'peak memory':>12}")
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison.regressed else ""
+        print(
+            f"{comparison.name:<26} {comparison.throughput_ratio:>10.2f}x {comparison.peak_ratio:>11.2f}x{flag}"
+        )
+    regressions = [comparison.name for comparison in comparisons if comparison.regressed]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {tolerance:.0%} against {baseline_file}.")
+        raise SystemExit(1)
+
+
+def run_startup(
+    budget_ms: float = DEFAULT_STARTUP_BUDGET_MS,
+    repeats: int = 5,
+    top: int = 10,
+) -> None:
+    result = measure_startup(repeats=repeats)
+    print(f"Importing {result.module} takes {result.total_ms:.1f} ms (best of {repeats}, budget {budget_ms:.0f} ms)")
+    print(f"{'module':<40} {'self ms':>8} {'cumulative ms':>14}")
+    for timing in sorted(result.timings, key=lambda timing: timing.self_us, reverse=True)[:top]:
+        print(f"{timing.module:<40} {timing.self_us / 1000:>8.1f} {timing.cumulative_us / 1000:>14.1f}")
+
+    failed = False
+    if result.deferred_imports:
+        print(f"Startup imports modules that should load with their command: {', '.join(result.deferred_imports)}")
+        failed = True
+    if result.feature_imports:
+        print(f"Startup imports crm modules beyond the settings: {', '.join(result.feature_imports)}")
+        failed = True
+    if result.total_ms > budget_ms:
+        print(f"Startup exceeds its import budget of {budget_ms:.0f} ms.")
+        failed = True
+    if failed:
+        raise SystemExit(1)
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import time
+
+from crm.subtitle_cache import get_subtitle_cache
+from crm.translation_cache import get_translation_cache
+
+
+def _format_time(timestamp: float | None) -> str:
+    if timestamp is None:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+
+
+def run_info() -> None:
+    subtitle_cache = get_subtitle_cache()
+    summary = subtitle_cache.summary()
+    print(f"Subtitle cache: {subtitle_cache.root}")
+    print(f"  track lists: {summary.track_lists}")
+    print(f"  subtitle entries: {summary.bodies} ({summary.blobs} unique bodies, {summary.blob_bytes / 1_000_000:.1f} MB)")
+    print(f"  oldest fetch: {_format_time(summary.oldest_fetch)}")
+    print(f"  newest fetch: {_format_time(summary.newest_fetch)}")
+    print(f"  revalidated after: {subtitle_cache.ttl_seconds / 86400:.0f} days")
+
+    translation_cache = get_translation_cache()
+    print(f"Translation cache: {translation_cache.path}")
+    print(f"  entries: {translation_cache.entry_count} (limit {translation_cache.max_entries})")
+
+
+def run_prune(older_than_days: float | None = None, video_id: str | None = None, remove_all: bool = False) -> None:
+    if remove_all == (older_than_days is not None or video_id is not None):
+        print("Pass --older-than-days and/or --video, or --all to clear the whole subtitle cache.")
+        raise SystemExit(1)
+    older_than_seconds = older_than_days * 86400 if older_than_days is not None else None
+    removed_entries, removed_blobs = get_subtitle_cache().prune(
+        older_than_seconds=older_than_seconds,
+        video_id=video_id,
+        remove_all=remove_all,
+    )
+    print(f"Removed {removed_entries} cached subtitle entries and {removed_blobs} unused subtitle bodies.")
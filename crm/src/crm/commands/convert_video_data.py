@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from crm.course_index import ensure_course_registered, load_course
+from crm.paths import course_video_dir
+from crm.settings import DEFAULT_CHUNK_SECONDS
+from crm.video_data import read_video_data, stored_video_data_bytes, video_data_file, write_video_data
+
+
+def run(language_code: str, data_format: str, chunk_seconds: float = DEFAULT_CHUNK_SECONDS) -> None:
+    ensure_course_registered(language_code)
+    course = load_course(language_code)
+    output_dir = course_video_dir(language_code)
+
+    before_bytes = 0
+    after_bytes = 0
+    converted = 0
+    for video in course.videos:
+        output_file = video_data_file(output_dir, video.id)
+        if not output_file.exists():
+            continue
+        before_bytes += stored_video_data_bytes(output_file)
+        snippets = read_video_data(output_file)
+        write_video_data(
+            output_file,
+            snippets,
+            [snippet.words for snippet in snippets],
+            data_format=data_format,
+            chunk_seconds=chunk_seconds,
+        )
+        after_bytes += stored_video_data_bytes(output_file)
+        converted += 1
+
+    print(
+        f"Converted {converted} video files for '{language_code}' to the {data_format} format: "
+        f"{before_bytes / 1_000_000:.1f} MB -> {after_bytes / 1_000_000:.1f} MB"
+    )
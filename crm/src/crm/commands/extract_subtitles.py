@@ -1,12 +1,20 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from tqdm import tqdm
-
 from crm.course_index import ensure_course_registered, load_course
+from crm.instrumentation import recording_run, stage
 from crm.paths import course_subtitle_dir, ensure_directories
-from crm.subtitle_utils import SubtitleTrack, download_subtitle_track, list_available_subtitle_tracks, parse_vtt_segments
+from crm.settings import DEFAULT_TRACK_WORKERS
+from crm.subtitle_selection import select_tracks
+from crm.subtitle_utils import (
+    SubtitleCue,
+    SubtitleTrack,
+    fetch_subtitle_tracks,
+    parse_vtt_segments,
+)
+from crm.video_jobs import run_video_jobs
 
 
 def format_timestamp(seconds: float) -> str:
@@ -16,64 +24,123 @@ def format_timestamp(seconds: float) -> str:
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
 
 
-def write_subtitle_text(
-    video_id: str,
-    track: SubtitleTrack,
-    segments: list[dict[str, float | str]],
-    output_dir: Path,
-) -> None:
+def subtitle_text_file(output_dir: Path, video_id: str, track: SubtitleTrack) -> Path:
     metadata = []
     if track.is_generated:
         metadata.append("auto")
 
     metadata_str = "_" + "_".join(metadata) if metadata else ""
-    output_file = output_dir / f"{video_id}_{track.language_code}{metadata_str}.txt"
+    return output_dir / f"{video_id}_{track.language_code}{metadata_str}.txt"
+
+
+def write_subtitle_text(
+    video_id: str,
+    track: SubtitleTrack,
+    segments: list[SubtitleCue],
+    output_dir: Path,
+) -> None:
+    output_file = subtitle_text_file(output_dir, video_id, track)
     if output_file.exists():
         print(f"Skipping transcript {track.language_code} for video {video_id} - already processed")
         return
 
     with output_file.open("w", encoding="utf-8") as handle:
         for segment in segments:
-            handle.write(f"[{format_timestamp(float(segment['start']))}] {segment['text']}\n")
+            handle.write(f"[{format_timestamp(segment.start)}] {segment.text}\n")
 
     print(f"Text file generated for video {video_id}, language {track.language_code}: {output_file}")
 
 
-def process_video(video_id: str, output_dir: Path) -> None:
+def _write_track(video_id: str, track: SubtitleTrack, subtitle_text: str, output_dir: Path) -> None:
+    try:
+        # Runs on the per-video track pool, so the video is named explicitly.
+        with stage("parse", video_id) as parse_counters:
+            segments = parse_vtt_segments(subtitle_text)
+            parse_counters["cues"] = len(segments)
+        if not segments:
+            print(
+                f"Downloaded subtitle track '{track.language_code}' for video '{video_id}', "
+                "but it contained no parseable cues."
+            )
+            return
+        with stage("write", video_id):
+            write_subtitle_text(video_id, track, segments, output_dir)
+    except Exception as exc:
+        print(f"Error writing subtitle '{track.language_code}' for video '{video_id}': {exc}")
+
+
+def process_video(
+    video_id: str,
+    output_dir: Path,
+    offline: bool = False,
+    selection: str = "all",
+    languages: list[str] | None = None,
+    track_workers: int = DEFAULT_TRACK_WORKERS,
+) -> None:
     print(f"Processing video: {video_id}")
+
+    def pending_tracks(tracks: list[SubtitleTrack]) -> list[SubtitleTrack]:
+        # Tracks that already have a text file are neither fetched nor rewritten.
+        return [
+            track
+            for track in select_tracks(tracks, selection, languages)
+            if not subtitle_text_file(output_dir, video_id, track).exists()
+        ]
+
     try:
-        tracks = list_available_subtitle_tracks(video_id)
+        with stage("fetch") as fetch_counters:
+            bodies, errors = fetch_subtitle_tracks(video_id, pending_tracks, offline=offline)
+            fetch_counters["tracks"] = len(bodies)
+            fetch_counters["failed_tracks"] = len(errors)
     except Exception as exc:
         print(exc)
         return
 
-    if not tracks:
-        print(f"No subtitles available for video '{video_id}'")
+    for track, message in errors.items():
+        print(f"Error fetching subtitle '{track.language_code}' for video '{video_id}': {message}")
+    if not bodies:
+        if not errors:
+            print(f"No new subtitle tracks to extract for video '{video_id}'")
         return
 
-    for track in tracks:
-        try:
-            subtitle_text, _ = download_subtitle_track(video_id, track)
-            segments = parse_vtt_segments(subtitle_text)
-            if not segments:
-                print(
-                    f"Downloaded subtitle track '{track.language_code}' for video '{video_id}', "
-                    "but it contained no parseable cues."
-                )
-                continue
-            write_subtitle_text(video_id, track, segments, output_dir)
-        except Exception as exc:
-            print(f"Error fetching subtitle '{track.language_code}' for video '{video_id}': {exc}")
-
-
-def run(language_code: str) -> None:
+    # Parsing and writing are independent per track; the single extraction above already paid
+    # for the network round trips.
+    with ThreadPoolExecutor(max_workers=max(1, min(track_workers, len(bodies)))) as executor:
+        list(
+            executor.map(
+                lambda item: _write_track(video_id, item[0], item[1], output_dir),
+                bodies.items(),
+            )
+        )
+
+
+def run(
+    language_code: str,
+    jobs: int = 1,
+    offline: bool = False,
+    selection: str = "all",
+    languages: list[str] | None = None,
+    track_workers: int = DEFAULT_TRACK_WORKERS,
+) -> None:
     ensure_course_registered(language_code)
     course = load_course(language_code)
     ensure_directories(language_code)
     output_dir = course_subtitle_dir(language_code)
 
     print(f"Processing videos for language: {language_code}")
-    for video in tqdm(course.videos, desc=f"Processing videos for {language_code}"):
-        process_video(video.id, output_dir)
+    with recording_run("extract-subtitles", language_code):
+        run_video_jobs(
+            [video.id for video in course.videos],
+            lambda video_id: process_video(
+                video_id,
+                output_dir,
+                offline=offline,
+                selection=selection,
+                languages=languages,
+                track_workers=track_workers,
+            ),
+            jobs=jobs,
+            desc=f"Processing videos for {language_code}",
+        )
 
     print("Subtitle extraction complete.")
@@ -1,316 +1,354 @@
 from __future__ import annotations
 
 import json
-import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 import googleapiclient.discovery
+from googleapiclient.errors import HttpError
 from tqdm import tqdm
 from youtube_transcript_api import NoTranscriptFound, TranscriptsDisabled, YouTubeTranscriptApi
 
-from crm.course_index import ensure_course_registered, load_course
+from crm.course_index import CourseDefinition, ensure_course_registered, load_course
+from crm.discovery_store import DiscoveryStore
 from crm.env import get_required_env_var
+from crm.instrumentation import count, recording_run, stage
 from crm.paths import course_work_dir, ensure_directories
-ARABIC_UNICODE_RANGE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
-
+from crm.rate_limit import RateLimiter, host_rate_limiter
+from crm.settings import DEFAULT_DAILY_QUOTA, DEFAULT_PROBE_RATE, DEFAULT_PROBE_WORKERS
+from crm.video_discovery import (
+    QUOTA_LEDGER_FILE,
+    SEARCH_LIST_COST,
+    VIDEOS_LIST_COST,
+    DiscoverySettings,
+    QuotaLedger,
+    SearchPageCache,
+    SearchStrategy,
+    discovery_work_dir,
+    load_discovery_settings,
+    load_strategy_book,
+    save_strategy_book,
+)
+
+TRANSCRIPT_HOST = "www.youtube.com"
+SEARCH_PAGE_SIZE = 50
+EMPTY_PAGES_BEFORE_ROTATION = 3
+
+
+class QuotaBudgetReached(RuntimeError):
+    pass
+
+
+def _base_language(language_code: str) -> str:
+    return language_code.split("-")[0].lower()
+
+
+@dataclass(frozen=True)
+class TranscriptProbe:
+    # Everything find-videos needs from one transcript listing of a video.
+    languages: frozenset[str] = frozenset()
+    manual_language_codes: frozenset[str] = frozenset()
+    translation_languages: frozenset[str] = frozenset()
+
+    def has_language(self, language: str) -> bool:
+        return language in self.languages or language in self.translation_languages
+
+    def has_manual_track(self, language_prefix: str) -> bool:
+        return any(code.startswith(language_prefix) for code in self.manual_language_codes)
+
+
+def probe_transcripts(video_id: str, rate_limiter: RateLimiter | None = None) -> TranscriptProbe:
+    if rate_limiter is not None:
+        with stage("probe:wait"):
+            rate_limiter.acquire()
+    with stage("probe", requests=1) as probe_counters:
+        try:
+            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
+            transcripts = list(transcript_list)
+        except (TranscriptsDisabled, NoTranscriptFound):
+            return TranscriptProbe()
+        except Exception as exc:
+            probe_counters["failed_requests"] = 1
+            print(f"Error checking transcripts for video '{video_id}': {exc}")
+            return TranscriptProbe()
 
-class EgyptVideoFinder:
-    def __init__(self, api_key: str, work_dir: Path):
+    translation_languages: set[str] = set()
+    for transcript in transcripts:
+        try:
+            translation_languages.update(
+                _base_language(lang["language_code"]) for lang in getattr(transcript, "translation_languages", [])
+            )
+        except Exception:
+            pass
+
+    return TranscriptProbe(
+        languages=frozenset(_base_language(transcript.language_code) for transcript in transcripts),
+        manual_language_codes=frozenset(
+            transcript.language_code for transcript in transcripts if not transcript.is_generated
+        ),
+        translation_languages=frozenset(translation_languages),
+    )
+
+
+class VideoFinder:
+    def __init__(
+        self,
+        api_key: str,
+        course: CourseDefinition,
+        ledger: QuotaLedger,
+        probe_workers: int = DEFAULT_PROBE_WORKERS,
+        probe_rate: float = DEFAULT_PROBE_RATE,
+    ):
+        self.course = course
+        self.settings: DiscoverySettings = load_discovery_settings(course)
+        self.title_pattern = self.settings.title_pattern
+        self.ledger = ledger
+        self.search_cache = SearchPageCache()
+        self.probe_workers = max(1, probe_workers)
+        self.probe_rate_limiter = host_rate_limiter(TRANSCRIPT_HOST, probe_rate)
         self.youtube = googleapiclient.discovery.build("youtube", "v3", developerKey=api_key)
-        self.output_file = work_dir / "egypt_videos.json"
-        self.processed_videos_file = work_dir / "processed_videos.json"
-        self.pagination_token_file = work_dir / "pagination_token.json"
-        self.processed_videos = self.load_processed_videos()
-        self.next_page_token = self.load_pagination_token()
-
-    def load_processed_videos(self) -> dict[str, bool]:
-        if self.processed_videos_file.exists():
-            try:
-                with self.processed_videos_file.open("r", encoding="utf-8") as handle:
-                    return json.load(handle)
-            except Exception as exc:
-                print(f"Error loading processed videos: {exc}")
-        return {}
-
-    def save_processed_videos(self) -> None:
-        with self.processed_videos_file.open("w", encoding="utf-8") as handle:
-            json.dump(self.processed_videos, handle, ensure_ascii=False, indent=2)
-
-    def load_pagination_token(self) -> str | None:
-        if self.pagination_token_file.exists():
-            try:
-                with self.pagination_token_file.open("r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-                    return data.get("nextPageToken")
-            except Exception as exc:
-                print(f"Error loading pagination token: {exc}")
-        return None
-
-    def save_pagination_token(self, token: str | None) -> None:
-        with self.pagination_token_file.open("w", encoding="utf-8") as handle:
-            json.dump({"nextPageToken": token}, handle, ensure_ascii=False, indent=2)
-
-    def search_videos(self, max_results: int = 50) -> tuple[list[dict[str, Any]], str | None]:
-        request = self.youtube.search().list(
-            part="snippet",
-            type="video",
-            regionCode="EG",
-            maxResults=max_results,
-            relevanceLanguage="ar",
-            videoCaption="closedCaption",
-            pageToken=self.next_page_token,
-        )
-        response = request.execute()
-        video_items = response.get("items", [])
-        next_page_token = response.get("nextPageToken")
 
-        video_ids = [item["id"]["videoId"] for item in video_items]
-        if not video_ids:
-            return [], next_page_token
+        work_dir = course_work_dir(course.language_code)
+        self.output_file = work_dir / "found_videos.json"
+        legacy_output_file = work_dir / "egypt_videos.json"
+        if legacy_output_file.exists() and not self.output_file.exists():
+            legacy_output_file.replace(self.output_file)
+        self.strategy_file = discovery_work_dir(course.language_code) / "strategies.json"
+        self.store = DiscoveryStore(discovery_work_dir(course.language_code) / "discovery.sqlite3")
+        legacy_processed_file = work_dir / "processed_videos.json"
+        if legacy_processed_file.exists() or (self.output_file.exists() and self.store.result_count() == 0):
+            self.store.import_legacy_files(legacy_processed_file, self.output_file)
+        self.strategies = load_strategy_book(self.strategy_file, self.settings)
+        self._adopt_legacy_pagination_token(work_dir / "pagination_token.json")
+
+    def _adopt_legacy_pagination_token(self, token_file: Path) -> None:
+        if not token_file.exists():
+            return
+        with token_file.open("r", encoding="utf-8") as handle:
+            token = json.load(handle).get("nextPageToken")
+        first = self.strategies.strategies[0]
+        if token and first.next_page_token is None and first.pages == 0:
+            first.next_page_token = token
+        save_strategy_book(self.strategy_file, self.strategies)
+        token_file.unlink()
+
+    def _search_params(self, strategy: SearchStrategy) -> dict[str, Any]:
+        params: dict[str, Any] = {
+            "part": "snippet",
+            "type": "video",
+            "maxResults": SEARCH_PAGE_SIZE,
+            "relevanceLanguage": self.settings.subtitle_language,
+            "videoCaption": "closedCaption",
+        }
+        if strategy.region:
+            params["regionCode"] = strategy.region
+        if strategy.query:
+            params["q"] = strategy.query
+        if strategy.next_page_token:
+            params["pageToken"] = strategy.next_page_token
+        return params
+
+    def search_videos(self, strategy: SearchStrategy) -> tuple[list[dict[str, Any]], str | None, int]:
+        # Returns the page's video details, the next page token and the quota units spent;
+        # pages already fetched within the cache TTL cost nothing.
+        params = self._search_params(strategy)
+        cached = self.search_cache.get(params)
+        if cached is not None:
+            count("search", cache_hits=1)
+            return cached["videos"], cached["nextPageToken"], 0
+
+        if not self.ledger.can_spend(SEARCH_LIST_COST + VIDEOS_LIST_COST):
+            raise QuotaBudgetReached(f"{self.ledger.remaining()} quota units left in the budget")
 
-        videos_request = self.youtube.videos().list(
-            part="contentDetails,snippet,statistics",
-            id=",".join(video_ids),
-        )
-        videos_response = videos_request.execute()
-        return videos_response.get("items", []), next_page_token
-
-    def search_videos_with_fallback(self, max_results: int = 50) -> tuple[list[dict[str, Any]], str | None]:
-        videos, next_page_token = self.search_videos(max_results)
-        if videos:
-            return videos, next_page_token
-
-        if next_page_token:
-            self.next_page_token = next_page_token
-            return self.search_videos(max_results)
-
-        self.next_page_token = None
-        self.save_pagination_token(None)
-
-        print("No results found with EG region code. Trying SA region code...")
-        request = self.youtube.search().list(
-            part="snippet",
-            type="video",
-            regionCode="SA",
-            maxResults=max_results,
-            relevanceLanguage="ar",
-            videoCaption="closedCaption",
-        )
+        try:
+            response = self.youtube.search().list(**params).execute()
+            self.ledger.spend(SEARCH_LIST_COST)
+            count("search", requests=1)
+            units = SEARCH_LIST_COST
+            video_ids = [item["id"]["videoId"] for item in response.get("items", [])]
+            videos: list[dict[str, Any]] = []
+            if video_ids:
+                videos_response = self.youtube.videos().list(
+                    part="contentDetails,snippet,statistics",
+                    id=",".join(video_ids),
+                ).execute()
+                self.ledger.spend(VIDEOS_LIST_COST)
+                count("search", requests=1)
+                units += VIDEOS_LIST_COST
+                videos = videos_response.get("items", [])
+        except HttpError as exc:
+            if "quotaExceeded" in str(exc):
+                self.ledger.mark_exhausted()
+                raise QuotaBudgetReached("YouTube reported the daily quota as exceeded") from exc
+            raise
 
-        response = request.execute()
-        video_items = response.get("items", [])
         next_page_token = response.get("nextPageToken")
-        video_ids = [item["id"]["videoId"] for item in video_items]
-        if not video_ids:
-            return [], next_page_token
-
-        videos_request = self.youtube.videos().list(
-            part="contentDetails,snippet,statistics",
-            id=",".join(video_ids),
-        )
-        videos_response = videos_request.execute()
-        return videos_response.get("items", []), next_page_token
-
-    def is_arabic_video(self, video: dict[str, Any]) -> bool:
-        if "snippet" in video and "defaultLanguage" in video["snippet"]:
-            lang_code = video["snippet"]["defaultLanguage"]
-            if lang_code and lang_code.startswith("ar"):
-                return True
-
-        if "contentDetails" in video and "defaultAudioLanguage" in video["contentDetails"]:
-            lang_code = video["contentDetails"]["defaultAudioLanguage"]
-            if lang_code and lang_code.startswith("ar"):
-                return True
+        self.search_cache.put(params, {"videos": videos, "nextPageToken": next_page_token})
+        return videos, next_page_token, units
 
-        return False
+    def _matches_language(self, language_code: str | None) -> bool:
+        return bool(language_code) and language_code.lower().startswith(self.settings.subtitle_language)
 
-    def has_arabic_in_title(self, title: str) -> bool:
-        return bool(ARABIC_UNICODE_RANGE.search(title))
+    def is_target_language_video(self, video: dict[str, Any]) -> bool:
+        return self._matches_language(video.get("snippet", {}).get("defaultLanguage")) or self._matches_language(
+            video.get("contentDetails", {}).get("defaultAudioLanguage")
+        )
 
-    def check_transcripts(self, video_id: str) -> dict[str, bool]:
-        try:
-            transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-            has_ar = False
-            has_en = False
-
-            for transcript in transcript_list:
-                lang_code = transcript.language_code.split("-")[0].lower()
-                if lang_code == "ar":
-                    has_ar = True
-                elif lang_code == "en":
-                    has_en = True
-                if has_ar and has_en:
-                    break
-
-            if not (has_ar and has_en):
-                translation_languages = []
-                try:
-                    if transcript_list and hasattr(transcript_list, "translation_languages"):
-                        translation_languages = [
-                            lang["language_code"].split("-")[0].lower()
-                            for lang in transcript_list.translation_languages
-                        ]
-                except Exception:
-                    for transcript in transcript_list:
-                        try:
-                            if hasattr(transcript, "translation_languages"):
-                                translation_languages.extend(
-                                    [
-                                        lang["language_code"].split("-")[0].lower()
-                                        for lang in transcript.translation_languages
-                                    ]
-                                )
-                        except Exception:
-                            pass
-
-                if "ar" in translation_languages:
-                    has_ar = True
-                if "en" in translation_languages:
-                    has_en = True
-
-            return {"ar": has_ar, "en": has_en}
-        except (TranscriptsDisabled, NoTranscriptFound):
-            return {"ar": False, "en": False}
-        except Exception as exc:
-            print(f"Error checking transcripts for video '{video_id}': {exc}")
-            return {"ar": False, "en": False}
+    def has_target_script_in_title(self, title: str) -> bool:
+        return self.title_pattern is None or bool(self.title_pattern.search(title))
 
-    def process_videos(self, max_results: int = 50) -> list[dict[str, Any]]:
-        print(f"Searching for up to {max_results} videos with captions and in Arabic language...")
-        videos, next_page_token = self.search_videos_with_fallback(max_results)
-        self.next_page_token = next_page_token
-        self.save_pagination_token(next_page_token)
+    def check_transcripts(self, probe: TranscriptProbe) -> dict[str, bool]:
+        language = self.settings.subtitle_language
+        return {language: probe.has_language(language), "en": probe.has_language("en")}
 
+    def process_videos(self, videos: list[dict[str, Any]]) -> list[dict[str, Any]]:
         results = []
         new_videos_processed = 0
+        candidates: list[dict[str, Any]] = []
 
-        for video in tqdm(videos, desc="Checking transcripts"):
+        for video in videos:
             video_id = video["id"]
-            if video_id in self.processed_videos:
+            if self.store.is_processed(video_id):
                 print(f"Skipping already processed video: {video_id}")
                 continue
 
             title = video["snippet"]["title"]
-            channel_title = video["snippet"]["channelTitle"]
-            published_at = video["snippet"]["publishedAt"]
-
-            if not self.has_arabic_in_title(title):
-                print(f"Skipping video with no Arabic in title: {title}")
-                self.processed_videos[video_id] = False
+            if not self.has_target_script_in_title(title):
+                print(f"Skipping video without {'/'.join(self.settings.scripts)} script in title: {title}")
+                self.store.record(video_id, False, "title script")
                 new_videos_processed += 1
                 continue
 
-            is_arabic = self.is_arabic_video(video)
-            if not is_arabic:
-                try:
-                    transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-                    for transcript in transcript_list:
-                        if transcript.language_code.startswith("ar") and not transcript.is_generated:
-                            is_arabic = True
-                            break
-                except Exception:
-                    pass
-
-            transcripts = self.check_transcripts(video_id)
-            self.processed_videos[video_id] = transcripts["ar"] and transcripts["en"] and is_arabic
-            new_videos_processed += 1
-
-            if transcripts["ar"] and transcripts["en"] and is_arabic:
-                results.append({
+            candidates.append(video)
+
+        # Each candidate's transcript list is fetched once, by a bounded pool sharing one rate limit.
+        with ThreadPoolExecutor(max_workers=self.probe_workers) as executor:
+            probes = executor.map(
+                lambda video: probe_transcripts(video["id"], self.probe_rate_limiter),
+                candidates,
+            )
+            for video, probe in tqdm(zip(candidates, probes), total=len(candidates), desc="Checking transcripts"):
+                video_id = video["id"]
+                title = video["snippet"]["title"]
+                channel_title = video["snippet"]["channelTitle"]
+                published_at = video["snippet"]["publishedAt"]
+
+                in_language = self.is_target_language_video(video) or probe.has_manual_track(
+                    self.settings.subtitle_language
+                )
+                missing_transcripts = [
+                    language for language, available in self.check_transcripts(probe).items() if not available
+                ]
+                new_videos_processed += 1
+                if not in_language:
+                    self.store.record(video_id, False, "language")
+                    continue
+                if missing_transcripts:
+                    self.store.record(video_id, False, f"missing transcripts: {', '.join(missing_transcripts)}")
+                    continue
+
+                result = {
                     "id": video_id,
                     "title": title,
                     "channel_title": channel_title,
                     "published_at": published_at,
                     "url": f"https://www.youtube.com/watch?v={video_id}",
-                })
-                print(f"Found Arabic video with both Arabic and English transcripts: {title}")
+                }
+                self.store.record(video_id, True, "accepted", result)
+                results.append(result)
+                print(f"Found video with {self.settings.subtitle_language} and English transcripts: {title}")
 
         if new_videos_processed > 0:
-            self.save_processed_videos()
-            print(f"Processed {new_videos_processed} new videos. Total processed: {len(self.processed_videos)}")
+            print(f"Processed {new_videos_processed} new videos. Total processed: {self.store.processed_count()}")
 
         return results
 
-    def save_results(self, results: list[dict[str, Any]]) -> None:
-        existing_results = []
-        if self.output_file.exists():
-            try:
-                with self.output_file.open("r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-                    existing_results = data.get("videos", [])
-            except Exception as exc:
-                print(f"Error loading existing results: {exc}")
-
-        video_ids = {video["id"] for video in existing_results}
-        for video in results:
-            if video["id"] not in video_ids:
-                existing_results.append(video)
-                video_ids.add(video["id"])
-
-        with self.output_file.open("w", encoding="utf-8") as handle:
-            json.dump({"videos": existing_results}, handle, ensure_ascii=False, indent=2)
-
-        print(f"Saved {len(existing_results)} videos to {self.output_file}")
+    def _record_page(self, strategy: SearchStrategy, next_page_token: str | None, units: int, accepted: int) -> None:
+        strategy.pages += 1
+        strategy.units += units
+        strategy.accepted += accepted
+        strategy.next_page_token = next_page_token
+        strategy.consecutive_empty = 0 if accepted else strategy.consecutive_empty + 1
+        if next_page_token is None or strategy.consecutive_empty >= EMPTY_PAGES_BEFORE_ROTATION:
+            # Start this strategy over later and let the others run first.
+            strategy.next_page_token = None
+            strategy.consecutive_empty = 0
+            strategy.exhausted = True
+        save_strategy_book(self.strategy_file, self.strategies)
 
     def run_until_target_reached(self, target_count: int = 20, max_attempts: int = 10) -> None:
-        existing_count = 0
-        if self.output_file.exists():
-            try:
-                with self.output_file.open("r", encoding="utf-8") as handle:
-                    data = json.load(handle)
-                    existing_results = data.get("videos", [])
-                    existing_count = len(existing_results)
-            except Exception as exc:
-                print(f"Error loading existing results: {exc}")
-
+        existing_count = self.store.result_count()
         print(f"Currently have {existing_count} videos. Target is {target_count}.")
         if existing_count >= target_count:
             print(f"Already have {existing_count} videos, which meets or exceeds the target of {target_count}.")
             return
 
         attempts = 0
-        consecutive_empty_results = 0
+        accepted_this_run = 0
         while existing_count < target_count and attempts < max_attempts:
+            strategy = self.strategies.pick()
+            if strategy is None:
+                break
             attempts += 1
-            print(f"\nAttempt {attempts}/{max_attempts} to find more videos...")
-            results = self.process_videos(max_results=50)
-            self.save_results(results)
-
-            if self.output_file.exists():
-                try:
-                    with self.output_file.open("r", encoding="utf-8") as handle:
-                        data = json.load(handle)
-                        existing_results = data.get("videos", [])
-                        existing_count = len(existing_results)
-                except Exception as exc:
-                    print(f"Error loading updated results: {exc}")
-
-            print(f"Now have {existing_count} videos. Target is {target_count}.")
-
-            if not results:
-                consecutive_empty_results += 1
-                print(f"No new videos found in this batch. (Consecutive empty results: {consecutive_empty_results})")
-                if consecutive_empty_results >= 3:
-                    print("Resetting pagination token to start fresh...")
-                    self.next_page_token = None
-                    self.save_pagination_token(None)
-                    consecutive_empty_results = 0
-            else:
-                consecutive_empty_results = 0
-
+            print(
+                f"\nAttempt {attempts}/{max_attempts}: searching region {strategy.region or 'any'}"
+                f"{f' for {strategy.query!r}' if strategy.query else ''} "
+                f"({strategy.accepted} accepted for {strategy.units} quota units so far)..."
+            )
+            try:
+                with stage("search") as search_counters:
+                    videos, next_page_token, units = self.search_videos(strategy)
+                    search_counters["quota_units"] = units
+            except QuotaBudgetReached as exc:
+                print(f"Stopping: quota budget reached ({exc}).")
+                break
+
+            results = self.process_videos(videos)
+            self._record_page(strategy, next_page_token, units, len(results))
+            existing_count = self.store.result_count()
+            accepted_this_run += len(results)
+            print(
+                f"Now have {existing_count} videos. Target is {target_count}. "
+                f"Spent {units} quota units on this page{' (cached)' if units == 0 else ''}."
+            )
+
+        self.store.export_results(self.output_file)
+        print(f"Saved {existing_count} videos to {self.output_file}")
+
+        spent = self.ledger.run_units
+        rate = f"{accepted_this_run / spent * 100:.2f} videos per 100 units" if spent else "no quota spent"
+        used_today = (
+            "YouTube reports today's quota as exhausted"
+            if self.ledger.exhausted
+            else f"{self.ledger.day_units} of {self.ledger.daily_limit} units used today"
+        )
+        print(f"Accepted {accepted_this_run} videos for {spent} quota units ({rate}); {used_today}.")
         if existing_count >= target_count:
             print(f"Successfully reached target of {target_count} videos!")
         else:
             print(f"Could only find {existing_count} videos after {attempts} attempts.")
 
 
-def run(language_code: str, target_count: int = 20, max_attempts: int = 10) -> None:
+def run(
+    language_code: str,
+    target_count: int = 20,
+    max_attempts: int = 10,
+    probe_workers: int = DEFAULT_PROBE_WORKERS,
+    probe_rate: float = DEFAULT_PROBE_RATE,
+    quota_budget: int | None = None,
+    daily_quota: int = DEFAULT_DAILY_QUOTA,
+) -> None:
     ensure_course_registered(language_code)
-    load_course(language_code)
-    if language_code != "arz":
-        raise ValueError("find-videos currently only supports the 'arz' course.")
-
+    course = load_course(language_code)
     ensure_directories(language_code)
-    finder = EgyptVideoFinder(get_required_env_var("GOOGLE_API_KEY"), course_work_dir(language_code))
-    finder.run_until_target_reached(target_count=target_count, max_attempts=max_attempts)
+    finder = VideoFinder(
+        get_required_env_var("GOOGLE_API_KEY"),
+        course,
+        QuotaLedger(QUOTA_LEDGER_FILE, daily_limit=daily_quota, run_budget=quota_budget),
+        probe_workers=probe_workers,
+        probe_rate=probe_rate,
+    )
+    with recording_run("find-videos", language_code):
+        finder.run_until_target_reached(target_count=target_count, max_attempts=max_attempts)
@@ -1,22 +1,103 @@
 from __future__ import annotations
 
+import asyncio
 import json
-import re
-from functools import lru_cache
+import time
+from collections.abc import Awaitable, Callable
 from pathlib import Path
+from typing import Any
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 from pydantic import BaseModel
 from tqdm import tqdm
 
-from crm.env import get_required_env_var
-from crm.course_index import ensure_course_registered, load_course
-from crm.local_translation import supports_local_translation, translate_word_to_english
-from crm.paths import course_video_dir, ensure_directories
+from crm.batch_jobs import (
+    COMPLETED_STATUS,
+    FAILED_STATUSES,
+    BatchBackend,
+    BatchState,
+    OpenAIBatchBackend,
+    archive_batch_state,
+    batch_request_line,
+    batch_work_dir,
+    get_batch_backend,
+    load_batch_state,
+    read_batch_output,
+    save_batch_state,
+    strict_json_schema,
+)
+from crm.instrumentation import count, recording_run, stage
+from crm.course_index import CourseDefinition, ensure_course_registered, load_course
+from crm.local_translation import LOCAL_TRANSLATION_MODEL, LocalTranslator, get_local_translator
+from crm.paths import course_video_dir, course_vocab_dir, ensure_directories
+from crm.settings import (
+    ARGOS_BACKEND,
+    DEFAULT_CHUNK_SECONDS,
+    DEFAULT_INTER_THREADS,
+    DEFAULT_INTRA_THREADS,
+    DEFAULT_PACK_TOKEN_BUDGET,
+    LEGACY_FORMAT,
+    OPENAI_BACKEND,
+)
+from crm.snippet_packing import (
+    TOKENIZER_VERSION,
+    PackedSnippet,
+    SnippetPack,
+    SnippetSource,
+    build_snippet_sources,
+    estimate_tokens,
+    pack_snippets,
+    split_pack,
+)
+from crm.snippet_journal import SnippetJournal, snippet_journal_dir, transcript_fingerprint
 from crm.subtitle_utils import fetch_subtitle_segments
+from crm.translation_cache import (
+    NO_CONTEXT_FINGERPRINT,
+    context_fingerprint,
+    get_translation_cache,
+    normalize_cache_word,
+)
+from crm.translation_backends import (
+    RATE_LIMITED,
+    SHAPE_MISMATCH,
+    TRANSIENT,
+    BackendSettings,
+    ModelBackend,
+    OutputShapeError,
+    StructuredResponse,
+    classify_failure,
+    failure_retry_after,
+    get_model_backend,
+    load_backend_settings,
+)
+from crm.video_data import (
+    read_video_data,
+    video_data_file,
+    video_data_layout,
+    write_video_data,
+)
+from crm.video_jobs import run_video_jobs
+from crm.video_manifest import (
+    VideoManifest,
+    layout_fingerprint,
+    load_video_manifest,
+    save_video_manifest,
+    snippet_input_hash,
+    snippet_source_hash,
+    translation_settings_fingerprint,
+    video_manifest_dir,
+    video_manifest_file,
+)
+from crm.vocab_index import write_course_vocab_index, write_video_vocab_index
 
-TRANSLATION_MODEL = "gpt-5.4-mini"
+# Bump when the translation prompts or their parsing change; cached meanings and video manifests
+# from earlier versions then count as stale.
+TRANSLATION_PROMPT_VERSION = 1
+# Attempts at a request whose answer had the wrong shape before it is split in half.
 TRANSLATION_ATTEMPTS = 2
+LOCAL_TRANSLATION_STAGE = f"translate:{LOCAL_TRANSLATION_MODEL}"
+
+PackCallback = Callable[[SnippetPack, dict[int, dict[str, str]]], None]
 
 
 class WordEntry(BaseModel):
@@ -33,201 +114,1150 @@ class TranslationBatch(BaseModel):
     translations: list[TranslatedWord]
 
 
-def extract_words(text: str) -> list[str]:
-    return re.findall(r"\b\w+\b", text, re.UNICODE)
-
-
-@lru_cache(maxsize=1)
-def get_openai_client() -> OpenAI:
-    return OpenAI(api_key=get_required_env_var("OPENAI_API_KEY"))
-
-
-def request_translation_batch(words: list[str], context: str, lang_code: str) -> list[WordEntry]:
-    client = get_openai_client()
-    response = client.responses.parse(
-        model=TRANSLATION_MODEL,
-        input=[
-            {
-                "role": "developer",
-                "content": (
-                    "You translate subtitle tokens into concise American English glossary meanings. "
-                    "Return one item per input word in the same order. "
-                    "Preserve duplicate input words as duplicate output items. "
-                    "Use the surrounding subtitle context to disambiguate meaning. "
-                    "Keep meanings short, plain, and dictionary-like. "
-                    "Do not omit items, merge items, add explanations, or transliterate unless that is the only useful gloss."
-                ),
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Source language code: {lang_code}\n"
-                    f"Context subtitle text: {context}\n"
-                    f"Words to translate in order: {json.dumps(words, ensure_ascii=False)}"
-                ),
-            },
-        ],
-        text_format=TranslationBatch,
-    )
+class SnippetTranslation(BaseModel):
+    id: int
+    translations: list[TranslatedWord]
+
+
+class PackTranslationBatch(BaseModel):
+    snippets: list[SnippetTranslation]
+
+
+def translation_cache_model(model_backend: ModelBackend) -> str:
+    return f"{model_backend.model_key}+prompt{TRANSLATION_PROMPT_VERSION}"
 
-    parsed = response.output_parsed
+
+def _translation_stage(model_backend: ModelBackend) -> str:
+    return f"translate:{model_backend.name}"
+
+
+def _word_translation_input(words: list[str], context: str, lang_code: str) -> list[dict[str, str]]:
+    return [
+        {
+            "role": "developer",
+            "content": (
+                "You translate subtitle tokens into concise American English glossary meanings. "
+                "Return one item per input word in the same order. "
+                "Preserve duplicate input words as duplicate output items. "
+                "Use the surrounding subtitle context to disambiguate meaning. "
+                "Keep meanings short, plain, and dictionary-like. "
+                "Do not omit items, merge items, add explanations, or transliterate unless that is the only useful gloss."
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Source language code: {lang_code}\n"
+                f"Context subtitle text: {context}\n"
+                f"Words to translate in order: {json.dumps(words, ensure_ascii=False)}"
+            ),
+        },
+    ]
+
+
+def _parse_word_translations(words: list[str], parsed: TranslationBatch | None) -> list[WordEntry]:
     if parsed is None:
-        raise RuntimeError("OpenAI returned no parsed translation output.")
+        raise OutputShapeError("The translation model returned no parsed translation output.")
     if len(parsed.translations) != len(words):
-        raise RuntimeError(
-            f"OpenAI returned {len(parsed.translations)} translations for {len(words)} input words."
+        raise OutputShapeError(
+            f"The translation model returned {len(parsed.translations)} translations for {len(words)} input words."
         )
 
     translated_words: list[WordEntry] = []
     for source_word, item in zip(words, parsed.translations):
         meaning = item.meaning.strip()
         if not meaning:
-            raise RuntimeError(f"OpenAI returned a blank translation for '{source_word}'.")
+            raise OutputShapeError(f"The translation model returned a blank translation for '{source_word}'.")
         translated_words.append(WordEntry(word=source_word, meaning=meaning))
 
     return translated_words
 
 
-def translate_words(words: list[str], context: str, lang_code: str) -> list[WordEntry]:
-    if not words:
-        return []
+def _pack_translation_input(pack: SnippetPack, lang_code: str) -> list[dict[str, str]]:
+    return [
+        {
+            "role": "developer",
+            "content": (
+                "You translate subtitle tokens into concise American English glossary meanings. "
+                "The input is a list of subtitle snippets, each with an id, its surrounding subtitle context, "
+                "and the words to translate. "
+                "Return one entry per input snippet with the same id, "
+                "and within it one item per input word in the same order. "
+                "Use each snippet's own context to disambiguate meaning. "
+                "Keep meanings short, plain, and dictionary-like. "
+                "Do not omit items, merge items, add explanations, or transliterate unless that is the only useful gloss."
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Source language code: {lang_code}\n"
+                "Snippets: "
+                + json.dumps(
+                    [
+                        {
+                            "id": snippet.source.index,
+                            "context": snippet.source.context,
+                            "words": list(snippet.requested_words),
+                        }
+                        for snippet in pack.snippets
+                        if snippet.requested_words
+                    ],
+                    ensure_ascii=False,
+                )
+            ),
+        },
+    ]
+
+
+def _parse_pack_translations(pack: SnippetPack, parsed: PackTranslationBatch | None) -> dict[str, str]:
+    if parsed is None:
+        raise OutputShapeError("The translation model returned no parsed translation output.")
+
+    items_by_id = {item.id: item for item in parsed.snippets}
+    meanings: dict[str, str] = {}
+    for snippet in pack.snippets:
+        if not snippet.requested_words:
+            continue
+        item = items_by_id.get(snippet.source.index)
+        if item is None:
+            raise OutputShapeError(
+                f"The translation model returned no translations for snippet {snippet.source.index}."
+            )
+        if len(item.translations) != len(snippet.requested_words):
+            raise OutputShapeError(
+                f"The translation model returned {len(item.translations)} translations for {len(snippet.requested_words)} "
+                f"input words in snippet {snippet.source.index}."
+            )
+        for source_word, translated in zip(snippet.requested_words, item.translations):
+            meaning = translated.meaning.strip()
+            if not meaning:
+                raise OutputShapeError(f"The translation model returned a blank translation for '{source_word}'.")
+            meanings[normalize_cache_word(source_word)] = meaning
+
+    return meanings
+
 
-    last_error: Exception | None = None
-    for attempt in range(1, TRANSLATION_ATTEMPTS + 1):
+def _record_request(model_backend: ModelBackend, started: float, response: StructuredResponse | None) -> None:
+    count(
+        _translation_stage(model_backend),
+        requests=1,
+        latency_seconds=time.perf_counter() - started,
+        input_tokens=(response.input_tokens or 0) if response is not None else 0,
+        output_tokens=(response.output_tokens or 0) if response is not None else 0,
+    )
+
+
+def _estimate_request_tokens(messages: list[dict[str, str]]) -> int:
+    return sum(estimate_tokens(message["content"]) for message in messages)
+
+
+def _record_outcome(
+    model_backend: ModelBackend,
+    estimated_tokens: int,
+    response: StructuredResponse | None,
+    error: Exception | None,
+) -> None:
+    scheduler = model_backend.scheduler
+    if response is not None:
+        scheduler.record_success(estimated_tokens, response.used_tokens)
+        return
+    if error is None or classify_failure(error) not in (RATE_LIMITED, TRANSIENT):
+        return
+    retry_after = failure_retry_after(error)
+    if classify_failure(error) == RATE_LIMITED and retry_after is None:
+        retry_after = scheduler.retry_policy.delay(1)
+    pause = scheduler.record_failure(retry_after)
+    if pause > 0:
+        print(f"Pausing {model_backend.name} translation requests for {pause:.1f}s: {error}")
+        count(_translation_stage(model_backend), pauses=1, paused_seconds=pause)
+
+
+def _parse_response(
+    model_backend: ModelBackend,
+    messages: list[dict[str, str]],
+    text_format: type[BaseModel],
+) -> StructuredResponse:
+    estimated_tokens = _estimate_request_tokens(messages)
+    model_backend.scheduler.acquire(estimated_tokens)
+    started = time.perf_counter()
+    response = None
+    error = None
+    try:
+        response = model_backend.parse(messages, text_format)
+        return response
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        _record_request(model_backend, started, response)
+        _record_outcome(model_backend, estimated_tokens, response, error)
+
+
+async def _parse_response_async(
+    model_backend: ModelBackend,
+    client: AsyncOpenAI,
+    messages: list[dict[str, str]],
+    text_format: type[BaseModel],
+) -> StructuredResponse:
+    estimated_tokens = _estimate_request_tokens(messages)
+    await model_backend.scheduler.acquire_async(estimated_tokens)
+    started = time.perf_counter()
+    response = None
+    error = None
+    try:
+        response = await model_backend.parse_async(client, messages, text_format)
+        return response
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        _record_request(model_backend, started, response)
+        _record_outcome(model_backend, estimated_tokens, response, error)
+
+
+def _retry_delay(model_backend: ModelBackend, description: str, attempt: int, exc: Exception) -> float | None:
+    # Seconds to wait before the next attempt, or None when this failure is not retried here.
+    kind = classify_failure(exc)
+    if kind == SHAPE_MISMATCH:
+        retry, delay = attempt < TRANSLATION_ATTEMPTS, 0.0
+    elif kind in (RATE_LIMITED, TRANSIENT):
+        policy = model_backend.scheduler.retry_policy
+        retry, delay = attempt < policy.max_attempts, policy.delay(attempt, failure_retry_after(exc))
+    else:
+        retry, delay = False, 0.0
+    count(_translation_stage(model_backend), failed_requests=1, retries=int(retry))
+    if not retry:
+        return None
+    print(f"Retrying {description} in {delay:.1f}s after attempt {attempt} failed ({kind}): {exc}")
+    return delay
+
+
+def _request_with_retries[T](model_backend: ModelBackend, description: str, request: Callable[[], T]) -> T:
+    attempt = 1
+    while True:
         try:
-            return request_translation_batch(words, context, lang_code)
+            return request()
         except Exception as exc:
-            last_error = exc
-            if attempt < TRANSLATION_ATTEMPTS:
-                print(
-                    f"Retrying translation batch of {len(words)} words after attempt {attempt} failed: {exc}"
-                )
+            delay = _retry_delay(model_backend, description, attempt, exc)
+            if delay is None:
+                raise
+        time.sleep(delay)
+        attempt += 1
+
+
+async def _request_with_retries_async[T](
+    model_backend: ModelBackend,
+    description: str,
+    request: Callable[[], Awaitable[T]],
+) -> T:
+    attempt = 1
+    while True:
+        try:
+            return await request()
+        except Exception as exc:
+            delay = _retry_delay(model_backend, description, attempt, exc)
+            if delay is None:
+                raise
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+def request_translation_batch(
+    model_backend: ModelBackend,
+    words: list[str],
+    context: str,
+    lang_code: str,
+) -> list[WordEntry]:
+    response = _parse_response(model_backend, _word_translation_input(words, context, lang_code), TranslationBatch)
+    return _parse_word_translations(words, response.output_parsed)
+
+
+def request_pack_translation(model_backend: ModelBackend, pack: SnippetPack, lang_code: str) -> dict[str, str]:
+    response = _parse_response(model_backend, _pack_translation_input(pack, lang_code), PackTranslationBatch)
+    return _parse_pack_translations(pack, response.output_parsed)
+
+
+async def request_translation_batch_async(
+    model_backend: ModelBackend,
+    client: AsyncOpenAI,
+    words: list[str],
+    context: str,
+    lang_code: str,
+) -> list[WordEntry]:
+    response = await _parse_response_async(
+        model_backend, client, _word_translation_input(words, context, lang_code), TranslationBatch
+    )
+    return _parse_word_translations(words, response.output_parsed)
+
+
+async def request_pack_translation_async(
+    model_backend: ModelBackend,
+    client: AsyncOpenAI,
+    pack: SnippetPack,
+    lang_code: str,
+) -> dict[str, str]:
+    response = await _parse_response_async(
+        model_backend, client, _pack_translation_input(pack, lang_code), PackTranslationBatch
+    )
+    return _parse_pack_translations(pack, response.output_parsed)
+
+
+def _translate_uncached_words(
+    model_backend: ModelBackend,
+    words: list[str],
+    context: str,
+    lang_code: str,
+) -> list[WordEntry]:
+    if not words:
+        return []
+
+    try:
+        return _request_with_retries(
+            model_backend,
+            f"translation batch of {len(words)} words",
+            lambda: request_translation_batch(model_backend, words, context, lang_code),
+        )
+    except Exception as exc:
+        # Only a malformed answer gets smaller requests; throttling and outages would just
+        # turn into more of the same failures.
+        if classify_failure(exc) != SHAPE_MISMATCH:
+            raise
+        last_error = exc
+
+    if len(words) == 1:
+        print(f"Skipping untranslated word '{words[0]}' after repeated translation failures: {last_error}")
+        count(_translation_stage(model_backend), skipped_words=1)
+        return []
+
+    midpoint = len(words) // 2
+    print(
+        f"Splitting translation batch of {len(words)} words after malformed answers: {last_error}"
+    )
+    count(_translation_stage(model_backend), splits=1)
+    return (
+        _translate_uncached_words(model_backend, words[:midpoint], context, lang_code)
+        + _translate_uncached_words(model_backend, words[midpoint:], context, lang_code)
+    )
+
+
+async def _translate_uncached_words_async(
+    model_backend: ModelBackend,
+    client: AsyncOpenAI,
+    words: list[str],
+    context: str,
+    lang_code: str,
+) -> list[WordEntry]:
+    if not words:
+        return []
+
+    try:
+        return await _request_with_retries_async(
+            model_backend,
+            f"translation batch of {len(words)} words",
+            lambda: request_translation_batch_async(model_backend, client, words, context, lang_code),
+        )
+    except Exception as exc:
+        if classify_failure(exc) != SHAPE_MISMATCH:
+            raise
+        last_error = exc
 
     if len(words) == 1:
         print(f"Skipping untranslated word '{words[0]}' after repeated translation failures: {last_error}")
+        count(_translation_stage(model_backend), skipped_words=1)
         return []
 
     midpoint = len(words) // 2
     print(
-        f"Splitting translation batch of {len(words)} words after repeated failures: {last_error}"
+        f"Splitting translation batch of {len(words)} words after malformed answers: {last_error}"
     )
+    count(_translation_stage(model_backend), splits=1)
     return (
-        translate_words(words[:midpoint], context, lang_code)
-        + translate_words(words[midpoint:], context, lang_code)
+        await _translate_uncached_words_async(model_backend, client, words[:midpoint], context, lang_code)
+        + await _translate_uncached_words_async(model_backend, client, words[midpoint:], context, lang_code)
     )
 
 
-def translate_words_locally(words: list[str], lang_code: str) -> list[WordEntry]:
+def _missing_words(words: list[str], meanings: dict[str, str]) -> list[str]:
+    missing: dict[str, str] = {}
+    for word in words:
+        key = normalize_cache_word(word)
+        if key not in meanings and key not in missing:
+            missing[key] = word
+    return list(missing.values())
+
+
+def _expand_meanings(words: list[str], meanings: dict[str, str]) -> list[WordEntry]:
     translated_words: list[WordEntry] = []
     for word in words:
-        meaning = translate_word_to_english(word, lang_code)
-        if not meaning:
-            raise RuntimeError(f"Local translation returned a blank result for '{word}'.")
-        translated_words.append(WordEntry(word=word, meaning=meaning))
+        meaning = meanings.get(normalize_cache_word(word))
+        if meaning:
+            translated_words.append(WordEntry(word=word, meaning=meaning))
     return translated_words
 
 
+def translate_words(model_backend: ModelBackend, words: list[str], context: str, lang_code: str) -> list[WordEntry]:
+    if not words:
+        return []
+
+    cache = get_translation_cache()
+    fingerprint = context_fingerprint(context)
+    cache_model = translation_cache_model(model_backend)
+    meanings = cache.lookup(lang_code, cache_model, fingerprint, words)
+    missing_words = _missing_words(words, meanings)
+    count(_translation_stage(model_backend), cache_hits=len(meanings), cache_misses=len(missing_words))
+    if missing_words:
+        fresh_meanings = {
+            normalize_cache_word(entry.word): entry.meaning
+            for entry in _translate_uncached_words(model_backend, missing_words, context, lang_code)
+        }
+        cache.store(lang_code, cache_model, fingerprint, fresh_meanings)
+        meanings.update(fresh_meanings)
+
+    return _expand_meanings(words, meanings)
+
+
+def translate_words_locally(words: list[str], lang_code: str, local_translator: LocalTranslator) -> dict[str, str]:
+    cache = get_translation_cache()
+    meanings = cache.lookup(lang_code, LOCAL_TRANSLATION_MODEL, NO_CONTEXT_FINGERPRINT, words)
+    missing_words = _missing_words(words, meanings)
+    count(LOCAL_TRANSLATION_STAGE, cache_hits=len(meanings), cache_misses=len(missing_words))
+    fresh_meanings = {
+        normalize_cache_word(word): meaning
+        for word, meaning in zip(missing_words, local_translator.translate_words(missing_words))
+        if meaning
+    }
+    cache.store(lang_code, LOCAL_TRANSLATION_MODEL, NO_CONTEXT_FINGERPRINT, fresh_meanings)
+    meanings.update(fresh_meanings)
+    return meanings
+
+
+def _store_pack_meanings(
+    model_backend: ModelBackend,
+    pack: SnippetPack,
+    meanings: dict[str, str],
+    lang_code: str,
+) -> None:
+    cache = get_translation_cache()
+    for snippet in pack.snippets:
+        snippet_meanings = {
+            key: meanings[key]
+            for key in (normalize_cache_word(word) for word in snippet.requested_words)
+            if key in meanings
+        }
+        cache.store(
+            lang_code,
+            translation_cache_model(model_backend),
+            context_fingerprint(snippet.source.context),
+            snippet_meanings,
+        )
+
+
+def _expand_pack_meanings(pack: SnippetPack, meanings: dict[str, str]) -> dict[int, dict[str, str]]:
+    return {
+        snippet.source.index: {
+            key: meanings[key]
+            for key in (normalize_cache_word(word) for word in snippet.missing_words)
+            if key in meanings
+        }
+        for snippet in pack.snippets
+    }
+
+
+def translate_pack(model_backend: ModelBackend, pack: SnippetPack, lang_code: str) -> dict[int, dict[str, str]]:
+    if len(pack.snippets) == 1:
+        snippet = pack.snippets[0]
+        meanings = {
+            normalize_cache_word(entry.word): entry.meaning
+            for entry in _translate_uncached_words(
+                model_backend, list(snippet.requested_words), snippet.source.context, lang_code
+            )
+        }
+        _store_pack_meanings(model_backend, pack, meanings, lang_code)
+        return _expand_pack_meanings(pack, meanings)
+
+    try:
+        meanings = _request_with_retries(
+            model_backend,
+            f"translation pack of {len(pack.snippets)} snippets",
+            lambda: request_pack_translation(model_backend, pack, lang_code),
+        )
+    except Exception as exc:
+        if classify_failure(exc) != SHAPE_MISMATCH:
+            raise
+        last_error = exc
+    else:
+        _store_pack_meanings(model_backend, pack, meanings, lang_code)
+        return _expand_pack_meanings(pack, meanings)
+
+    print(
+        f"Splitting translation pack of {len(pack.snippets)} snippets after malformed answers: {last_error}"
+    )
+    count(_translation_stage(model_backend), splits=1)
+    first_half, second_half = split_pack(pack)
+    return {
+        **translate_pack(model_backend, first_half, lang_code),
+        **translate_pack(model_backend, second_half, lang_code),
+    }
+
+
+async def translate_pack_async(
+    model_backend: ModelBackend,
+    client: AsyncOpenAI,
+    pack: SnippetPack,
+    lang_code: str,
+) -> dict[int, dict[str, str]]:
+    if len(pack.snippets) == 1:
+        snippet = pack.snippets[0]
+        meanings = {
+            normalize_cache_word(entry.word): entry.meaning
+            for entry in await _translate_uncached_words_async(
+                model_backend, client, list(snippet.requested_words), snippet.source.context, lang_code
+            )
+        }
+        _store_pack_meanings(model_backend, pack, meanings, lang_code)
+        return _expand_pack_meanings(pack, meanings)
+
+    try:
+        meanings = await _request_with_retries_async(
+            model_backend,
+            f"translation pack of {len(pack.snippets)} snippets",
+            lambda: request_pack_translation_async(model_backend, client, pack, lang_code),
+        )
+    except Exception as exc:
+        if classify_failure(exc) != SHAPE_MISMATCH:
+            raise
+        last_error = exc
+    else:
+        _store_pack_meanings(model_backend, pack, meanings, lang_code)
+        return _expand_pack_meanings(pack, meanings)
+
+    print(
+        f"Splitting translation pack of {len(pack.snippets)} snippets after malformed answers: {last_error}"
+    )
+    count(_translation_stage(model_backend), splits=1)
+    first_half, second_half = split_pack(pack)
+    return {
+        **await translate_pack_async(model_backend, client, first_half, lang_code),
+        **await translate_pack_async(model_backend, client, second_half, lang_code),
+    }
+
+
+def _report_pack_error(video_id: str, pack: SnippetPack, exc: Exception) -> None:
+    first_index, last_index = pack.snippets[0].source.index, pack.snippets[-1].source.index
+    print(f"Error translating snippets {first_index}-{last_index} for video '{video_id}': {exc}")
+
+
+def translate_packs_sequentially(
+    model_backend: ModelBackend,
+    video_id: str,
+    packs: list[SnippetPack],
+    lang_code: str,
+    on_pack_translated: PackCallback | None = None,
+) -> list[dict[int, dict[str, str]]]:
+    results: list[dict[int, dict[str, str]]] = []
+    for pack in tqdm(packs, desc=f"Translating snippet packs for video {video_id}", leave=False):
+        try:
+            result = translate_pack(model_backend, pack, lang_code)
+        except Exception as exc:
+            _report_pack_error(video_id, pack, exc)
+            result = {}
+        if on_pack_translated is not None:
+            on_pack_translated(pack, result)
+        results.append(result)
+    return results
+
+
+async def translate_packs_concurrently(
+    model_backend: ModelBackend,
+    video_id: str,
+    packs: list[SnippetPack],
+    lang_code: str,
+    concurrency: int,
+    on_pack_translated: PackCallback | None = None,
+) -> list[dict[int, dict[str, str]]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with model_backend.async_client() as client:
+        with tqdm(total=len(packs), desc=f"Translating snippet packs for video {video_id}", leave=False) as progress:
+            async def run_pack(pack: SnippetPack) -> dict[int, dict[str, str]]:
+                async with semaphore:
+                    try:
+                        result = await translate_pack_async(model_backend, client, pack, lang_code)
+                    except Exception as exc:
+                        _report_pack_error(video_id, pack, exc)
+                        result = {}
+                    finally:
+                        progress.update(1)
+                if on_pack_translated is not None:
+                    on_pack_translated(pack, result)
+                return result
+
+            # gather keeps results in pack order, so merging them matches the sequential run.
+            return await asyncio.gather(*(run_pack(pack) for pack in packs))
+
+
+def plan_frontier_packs(
+    model_backend: ModelBackend,
+    sources: list[SnippetSource],
+    subtitle_language: str,
+    pack_token_budget: int,
+) -> tuple[dict[int, dict[str, str]], list[SnippetPack]]:
+    cache = get_translation_cache()
+    snippet_meanings: dict[int, dict[str, str]] = {}
+    pending: list[tuple[SnippetSource, list[str]]] = []
+    cache_model = translation_cache_model(model_backend)
+    cache_hits = cache_misses = 0
+    for source in sources:
+        words = list(source.words)
+        meanings = cache.lookup(subtitle_language, cache_model, context_fingerprint(source.context), words)
+        snippet_meanings[source.index] = meanings
+        missing_words = _missing_words(words, meanings)
+        pending.append((source, missing_words))
+        cache_hits += len(meanings)
+        cache_misses += len(missing_words)
+    count(_translation_stage(model_backend), cache_hits=cache_hits, cache_misses=cache_misses)
+    return snippet_meanings, pack_snippets(pending, pack_token_budget)
+
+
+def translate_snippets(
+    video_id: str,
+    sources: list[SnippetSource],
+    subtitle_language: str,
+    local_translator: LocalTranslator | None,
+    pack_token_budget: int,
+    model_backend: ModelBackend,
+    concurrency: int = 1,
+    journal: SnippetJournal | None = None,
+) -> list[list[WordEntry]]:
+    translations: dict[int, list[WordEntry]] = {}
+    frontier_sources: list[SnippetSource] = []
+
+    if journal is not None:
+        for index, words in journal.load().items():
+            translations[index] = [WordEntry(word=word, meaning=meaning) for word, meaning in words]
+        if translations:
+            print(
+                f"Resuming video {video_id} from its snippet journal: "
+                f"{len(translations)} of {len(sources)} snippets already translated"
+            )
+        sources_to_translate = [source for source in sources if source.index not in translations]
+    else:
+        sources_to_translate = sources
+
+    def complete_snippet(source: SnippetSource, meanings: dict[str, str]) -> None:
+        words = list(source.words)
+        translations[source.index] = _expand_meanings(words, meanings)
+        # Snippets with untranslated words stay out of the journal so a restart retries them.
+        if journal is not None and not _missing_words(words, meanings):
+            journal.append(
+                source.index,
+                [(entry.word, entry.meaning) for entry in translations[source.index]],
+            )
+
+    local_meanings: dict[str, str] = {}
+    if local_translator is not None and sources_to_translate:
+        video_words = [word for source in sources_to_translate for word in source.words]
+        try:
+            with stage(LOCAL_TRANSLATION_STAGE, words=len(video_words)):
+                local_meanings = translate_words_locally(video_words, subtitle_language, local_translator)
+        except Exception as exc:
+            print(
+                f"Local translation failed for video '{video_id}': {exc}. "
+                "Falling back to the frontier model for this video."
+            )
+
+    for source in sources_to_translate:
+        words = list(source.words)
+        if local_translator is not None and local_meanings:
+            missing_words = _missing_words(words, local_meanings)
+            if not missing_words:
+                complete_snippet(source, local_meanings)
+                continue
+            print(
+                f"Local translation returned a blank result for '{missing_words[0]}' in snippet {source.index} "
+                f"of video '{video_id}'. Falling back to the frontier model for this snippet."
+            )
+
+        frontier_sources.append(source)
+
+    snippet_meanings, packs = plan_frontier_packs(
+        model_backend, frontier_sources, subtitle_language, pack_token_budget
+    )
+    packed_indexes = {snippet.source.index for pack in packs for snippet in pack.snippets}
+    for source in frontier_sources:
+        if source.index not in packed_indexes:
+            complete_snippet(source, snippet_meanings[source.index])
+
+    def complete_pack(pack: SnippetPack, pack_meanings: dict[int, dict[str, str]]) -> None:
+        for snippet in pack.snippets:
+            meanings = snippet_meanings[snippet.source.index]
+            meanings.update(pack_meanings.get(snippet.source.index, {}))
+            complete_snippet(snippet.source, meanings)
+
+    if packs:
+        word_count = sum(pack.word_count for pack in packs)
+        print(
+            f"Translating {word_count} words from {sum(len(pack.snippets) for pack in packs)} "
+            f"snippets in {len(packs)} requests for video {video_id}"
+        )
+        with stage(_translation_stage(model_backend), packs=len(packs), words=word_count):
+            if concurrency > 1 and len(packs) > 1:
+                asyncio.run(
+                    translate_packs_concurrently(
+                        model_backend, video_id, packs, subtitle_language, concurrency, on_pack_translated=complete_pack
+                    )
+                )
+            else:
+                translate_packs_sequentially(
+                    model_backend, video_id, packs, subtitle_language, on_pack_translated=complete_pack
+                )
+
+    return [translations[source.index] for source in sources]
+
+
+def _translation_settings(model_backend: ModelBackend, local_translator: LocalTranslator | None) -> dict[str, Any]:
+    return {
+        "tokenizer": TOKENIZER_VERSION,
+        "model": model_backend.model_key,
+        "prompt": TRANSLATION_PROMPT_VERSION,
+        "local_model": LOCAL_TRANSLATION_MODEL if local_translator is not None else None,
+    }
+
+
+def _reusable_translations(
+    output_file: Path,
+    manifest: VideoManifest | None,
+    input_hashes: list[str],
+    sources: list[SnippetSource],
+) -> dict[int, list[WordEntry]]:
+    # Matches snippets by input hash rather than position, so inserted or removed cues only
+    # re-translate the snippets whose text or neighbours changed.
+    if not output_file.exists():
+        return {}
+    stored_snippets = read_video_data(output_file)
+    if manifest is None:
+        # Files from before manifests keep the meanings of every snippet whose timing and
+        # words still match; the manifest written after this pass covers the next refresh.
+        stored_by_source = {
+            snippet_source_hash(stored.start, stored.duration, [word.word for word in stored.words]): [
+                WordEntry(word=word.word, meaning=word.meaning) for word in stored.words
+            ]
+            for stored in stored_snippets
+        }
+        return {
+            source.index: stored_by_source[source_hash]
+            for source in sources
+            if (source_hash := snippet_source_hash(source.start, source.duration, source.words)) in stored_by_source
+        }
+    if len(stored_snippets) != len(manifest.snippets):
+        return {}
+
+    stored_by_hash = {
+        input_hash: [WordEntry(word=word.word, meaning=word.meaning) for word in stored.words]
+        for input_hash, stored in zip(manifest.snippets, stored_snippets)
+    }
+    return {
+        index: stored_by_hash[input_hash]
+        for index, input_hash in enumerate(input_hashes)
+        if input_hash in stored_by_hash
+    }
+
+
 def process_video(
     video_id: str,
     subtitle_language: str,
     output_dir: Path,
-    use_local_translation: bool,
+    local_translator: LocalTranslator | None,
+    pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
+    concurrency: int = 1,
+    offline: bool = False,
+    data_format: str = LEGACY_FORMAT,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    vocab_dir: Path | None = None,
+    journal_dir: Path | None = None,
+    manifest_dir: Path | None = None,
+    refresh: bool = False,
+    model_backend: ModelBackend | None = None,
 ) -> bool:
-    output_file = output_dir / f"{video_id}.json"
-    if output_file.exists():
+    model_backend = model_backend or get_model_backend(BackendSettings())
+    output_file = video_data_file(output_dir, video_id)
+    if output_file.exists() and not refresh:
         print(f"Skipping video {video_id} - already processed")
         return False
 
-    print(f"Processing video: {video_id}")
+    print(f"{'Refreshing' if output_file.exists() else 'Processing'} video: {video_id}")
     try:
-        transcript, selected_track = fetch_subtitle_segments(video_id, subtitle_language)
+        transcript, selected_track = fetch_subtitle_segments(video_id, subtitle_language, offline=offline)
         track_kind = "auto" if selected_track.is_generated else "manual"
         print(f"Using {track_kind} subtitle track '{selected_track.language_code}' for video {video_id}")
     except Exception as exc:
         print(f"Error fetching transcript for video '{video_id}': {exc}")
         return False
 
-    snippets = []
-    for index, segment in enumerate(tqdm(transcript, desc=f"Processing snippets for video {video_id}", leave=False)):
-        text = segment.get("text") if isinstance(segment, dict) else segment.text
-        start = segment.get("start") if isinstance(segment, dict) else segment.start
-        duration = segment.get("duration") if isinstance(segment, dict) else segment.duration
+    with stage("tokenize") as tokenize_counters:
+        sources = build_snippet_sources(transcript)
+        tokenize_counters["snippets"] = len(sources)
+    settings = translation_settings_fingerprint(_translation_settings(model_backend, local_translator))
+    input_hashes = [snippet_input_hash(settings, source) for source in sources]
+    layout = layout_fingerprint(sources, video_data_layout(data_format, chunk_seconds))
+    manifest_file = video_manifest_file(manifest_dir, video_id) if manifest_dir is not None else None
+    manifest = load_video_manifest(manifest_file) if manifest_file is not None else None
+
+    reused: dict[int, list[WordEntry]] = {}
+    if refresh and output_file.exists():
+        if manifest is not None and manifest.snippets == input_hashes and manifest.layout == layout:
+            print(f"Skipping video {video_id} - up to date")
+            return False
+        reused = _reusable_translations(output_file, manifest, input_hashes, sources)
+        print(f"Reusing {len(reused)} of {len(sources)} snippets for video {video_id}")
 
-        prev_text = (
-            transcript[index - 1].get("text")
-            if index > 0 and isinstance(transcript[index - 1], dict)
-            else (transcript[index - 1].text if index > 0 else "")
+    stale_sources = [source for source in sources if source.index not in reused]
+    journal = (
+        SnippetJournal(
+            journal_dir / f"{video_id}.jsonl",
+            video_id,
+            transcript_fingerprint([settings, *(source.text for source in sources)]),
         )
-        next_text = (
-            transcript[index + 1].get("text")
-            if index < len(transcript) - 1 and isinstance(transcript[index + 1], dict)
-            else (transcript[index + 1].text if index < len(transcript) - 1 else "")
+        if journal_dir is not None and stale_sources
+        else None
+    )
+    try:
+        stale_translations = translate_snippets(
+            video_id,
+            stale_sources,
+            subtitle_language,
+            local_translator=local_translator,
+            pack_token_budget=pack_token_budget,
+            model_backend=model_backend,
+            concurrency=concurrency,
+            journal=journal,
         )
-        context_text = " ".join(filter(None, [prev_text, text, next_text]))
-
-        snippet_data = {"start": start, "duration": duration, "words": []}
-        words = extract_words(text)
-        try:
-            if use_local_translation:
-                try:
-                    translated_words = translate_words_locally(words, subtitle_language)
-                except Exception as exc:
-                    print(
-                        f"Local translation failed for snippet {index} in video '{video_id}': {exc}. "
-                        "Falling back to the frontier model for this snippet."
-                    )
-                    translated_words = translate_words(words, context_text, subtitle_language)
-            else:
-                translated_words = translate_words(words, context_text, subtitle_language)
-        except Exception as exc:
-            print(f"Error translating snippet {index} for video '{video_id}': {exc}")
-            translated_words = []
-
-        for word_entry in translated_words:
-            snippet_data["words"].append({
-                "native": word_entry.word,
-                "translation": word_entry.meaning,
-            })
+    finally:
+        if journal is not None:
+            journal.close()
 
-        snippets.append(snippet_data)
+    reused.update((source.index, words) for source, words in zip(stale_sources, stale_translations))
+    translations = [reused[source.index] for source in sources]
 
-    with output_file.open("w", encoding="utf-8") as handle:
-        json.dump({"snippets": snippets}, handle, ensure_ascii=False, indent=4)
+    with stage("write", snippets=len(sources)):
+        write_video_data(output_file, sources, translations, data_format=data_format, chunk_seconds=chunk_seconds)
+        if vocab_dir is not None:
+            write_video_vocab_index(vocab_dir, video_id, translations)
+        if manifest_file is not None:
+            save_video_manifest(manifest_file, VideoManifest(settings=settings, layout=layout, snippets=input_hashes))
+    if journal is not None:
+        journal.remove()
     print(f"JSON file generated for video {video_id}: {output_file}")
     return True
 
 
+def _pack_request_body(model_backend: ModelBackend, pack: SnippetPack, lang_code: str) -> dict[str, Any]:
+    return {
+        "model": model_backend.model,
+        "input": _pack_translation_input(pack, lang_code),
+        "text": {
+            "format": {
+                "type": "json_schema",
+                "name": "pack_translation_batch",
+                "schema": strict_json_schema(PackTranslationBatch),
+                "strict": True,
+            }
+        },
+    }
+
+
+def _pack_request_metadata(pack: SnippetPack) -> list[dict[str, Any]]:
+    return [
+        {
+            "id": snippet.source.index,
+            "context": snippet.source.context,
+            "missing": list(snippet.missing_words),
+            "requested": list(snippet.requested_words),
+        }
+        for snippet in pack.snippets
+    ]
+
+
+def _pack_from_metadata(metadata: list[dict[str, Any]]) -> SnippetPack:
+    return SnippetPack(snippets=tuple(
+        PackedSnippet(
+            source=SnippetSource(
+                index=item["id"],
+                start=0.0,
+                duration=0.0,
+                text="",
+                context=item["context"],
+                words=tuple(item["missing"]),
+            ),
+            missing_words=tuple(item["missing"]),
+            requested_words=tuple(item["requested"]),
+        )
+        for item in metadata
+    ))
+
+
+def submit_batch(
+    course: CourseDefinition,
+    output_dir: Path,
+    backend: BatchBackend,
+    model_backend: ModelBackend,
+    pack_token_budget: int,
+    jobs: int,
+    offline: bool = False,
+) -> None:
+    existing_state = load_batch_state(course.language_code)
+    if existing_state is not None:
+        print(
+            f"Batch {existing_state.batch_id} for course '{course.language_code}' has not been collected yet. "
+            "Run generate-data --batch-collect first."
+        )
+        return
+
+    planned_packs: dict[str, list[SnippetPack]] = {}
+
+    def plan_video(video_id: str) -> bool:
+        if video_data_file(output_dir, video_id).exists():
+            print(f"Skipping video {video_id} - already processed")
+            return False
+        transcript, _ = fetch_subtitle_segments(video_id, course.subtitle_language, offline=offline)
+        _, packs = plan_frontier_packs(
+            model_backend, build_snippet_sources(transcript), course.subtitle_language, pack_token_budget
+        )
+        planned_packs[video_id] = packs
+        return True
+
+    run_video_jobs(
+        [video.id for video in course.videos],
+        plan_video,
+        jobs=jobs,
+        desc=f"Planning batch requests for {course.language_code}",
+    )
+
+    video_ids = [video.id for video in course.videos if video.id in planned_packs]
+    lines: list[str] = []
+    requests: dict[str, list[dict[str, Any]]] = {}
+    for video_id in video_ids:
+        for number, pack in enumerate(planned_packs[video_id]):
+            custom_id = f"{video_id}:{number}"
+            lines.append(batch_request_line(custom_id, _pack_request_body(model_backend, pack, course.subtitle_language)))
+            requests[custom_id] = _pack_request_metadata(pack)
+
+    if not video_ids:
+        print("No unprocessed videos to submit.")
+        return
+    if not lines:
+        print("All pending words are already in the translation cache. Run generate-data without --batch-submit.")
+        return
+
+    work_dir = batch_work_dir(course.language_code)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    input_file = work_dir / f"{time.strftime('%Y%m%dT%H%M%S')}.input.jsonl"
+    input_file.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    batch_id = backend.submit(input_file)
+    save_batch_state(course.language_code, BatchState(
+        backend=backend.name,
+        batch_id=batch_id,
+        input_file=str(input_file),
+        video_ids=video_ids,
+        requests=requests,
+        cache_model=translation_cache_model(model_backend),
+    ))
+    print(
+        f"Submitted {backend.name} batch {batch_id} with {len(lines)} requests for {len(video_ids)} videos "
+        f"from {input_file}"
+    )
+
+
+def collect_batch(
+    course: CourseDefinition,
+    backend: BatchBackend,
+    model_backend: ModelBackend,
+) -> list[str] | None:
+    state = load_batch_state(course.language_code)
+    if state is None:
+        print(f"No submitted batch found for course '{course.language_code}'.")
+        return None
+    if state.backend != backend.name:
+        raise ValueError(
+            f"Batch {state.batch_id} was submitted with the '{state.backend}' backend, not '{backend.name}'."
+        )
+
+    if state.output_file is None:
+        output_file = batch_work_dir(course.language_code) / f"{state.batch_id}.output.jsonl"
+        status = backend.fetch_results(state.batch_id, output_file)
+        if status in FAILED_STATUSES:
+            archived_file = archive_batch_state(course.language_code, state)
+            print(f"Batch {state.batch_id} ended with status '{status}'. Its state was archived to {archived_file}.")
+            return None
+        if status != COMPLETED_STATUS:
+            print(f"Batch {state.batch_id} is still '{status}'. Collect again later.")
+            return None
+        state.output_file = str(output_file)
+        save_batch_state(course.language_code, state)
+
+    if not state.ingested:
+        cache_model = state.cache_model or translation_cache_model(model_backend)
+        if cache_model != translation_cache_model(model_backend):
+            print(
+                f"Batch {state.batch_id} was submitted for {cache_model}; its results are cached for that model, "
+                f"not for {translation_cache_model(model_backend)} of this run."
+            )
+        results = read_batch_output(Path(state.output_file))
+        ingested = 0
+        for custom_id, metadata in state.requests.items():
+            output_text = results.get(custom_id)
+            if output_text is None:
+                continue
+            pack = _pack_from_metadata(metadata)
+            try:
+                meanings = _parse_pack_translations(pack, PackTranslationBatch.model_validate_json(output_text))
+            except Exception as exc:
+                print(f"Ignoring batch result '{custom_id}': {exc}")
+                continue
+            # Store each snippet's expanded meanings under its own context so the regular
+            # generate pass finds every packed word in the cache.
+            cache = get_translation_cache()
+            for index, snippet_meanings in _expand_pack_meanings(pack, meanings).items():
+                context = next(snippet.source.context for snippet in pack.snippets if snippet.source.index == index)
+                cache.store(
+                    course.subtitle_language,
+                    cache_model,
+                    context_fingerprint(context),
+                    snippet_meanings,
+                )
+            ingested += 1
+
+        state.ingested = True
+        save_batch_state(course.language_code, state)
+        print(
+            f"Ingested {ingested} of {len(state.requests)} batch results. "
+            "Words from missing or invalid results are translated interactively."
+        )
+
+    return state.video_ids
+
+
 def run(
     language_code: str,
     use_local_translation: bool = False,
     stop_after_one_new: bool = False,
+    pack_token_budget: int = DEFAULT_PACK_TOKEN_BUDGET,
+    concurrency: int = 1,
+    jobs: int = 1,
+    local_inter_threads: int = DEFAULT_INTER_THREADS,
+    local_intra_threads: int = DEFAULT_INTRA_THREADS,
+    batch_submit: bool = False,
+    batch_collect: bool = False,
+    batch_backend: str = OpenAIBatchBackend.name,
+    batch_dir: Path | None = None,
+    offline: bool = False,
+    data_format: str = LEGACY_FORMAT,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    refresh: bool = False,
+    translation_backend: str | None = None,
+    backend_model: str | None = None,
+    backend_url: str | None = None,
+    backend_timeout: float | None = None,
+    backend_max_connections: int | None = None,
+    requests_per_minute: float | None = None,
+    tokens_per_minute: float | None = None,
 ) -> None:
     ensure_course_registered(language_code)
     course = load_course(language_code)
     ensure_directories(language_code)
     output_dir = course_video_dir(language_code)
 
-    local_translation_enabled = use_local_translation and supports_local_translation(course.subtitle_language)
-    if use_local_translation and not local_translation_enabled:
+    settings = load_backend_settings(
+        course,
+        name=ARGOS_BACKEND if use_local_translation and translation_backend is None else translation_backend,
+        model=backend_model,
+        base_url=backend_url,
+        timeout_seconds=backend_timeout,
+        max_connections=backend_max_connections,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+    )
+    use_local_translation = use_local_translation or settings.name == ARGOS_BACKEND
+    model_backend = get_model_backend(settings)
+    # Argos runs on the OpenAI backend as its fallback, so the backend name alone would let it
+    # through; batch requests would then ignore local translation altogether.
+    if (batch_submit or batch_collect) and (use_local_translation or model_backend.name != OPENAI_BACKEND):
+        raise ValueError(
+            f"Batch mode needs the '{OPENAI_BACKEND}' translation backend and cannot be combined with "
+            f"local translation; got '{settings.name}'."
+        )
+
+    video_ids = [video.id for video in course.videos]
+    if batch_submit:
+        backend = get_batch_backend(batch_backend, language_code, model_backend, batch_dir)
+        submit_batch(
+            course,
+            output_dir,
+            backend,
+            model_backend,
+            pack_token_budget=pack_token_budget,
+            jobs=jobs,
+            offline=offline,
+        )
+        return
+    if batch_collect:
+        backend = get_batch_backend(batch_backend, language_code, model_backend, batch_dir)
+        batch_video_ids = collect_batch(course, backend, model_backend)
+        if batch_video_ids is None:
+            return
+        video_ids = batch_video_ids
+
+    local_translator = (
+        get_local_translator(
+            course.subtitle_language,
+            inter_threads=local_inter_threads,
+            intra_threads=local_intra_threads,
+        )
+        if use_local_translation
+        else None
+    )
+    if use_local_translation and local_translator is None:
         print(
             f"Local translation is not available for subtitle language '{course.subtitle_language}'. "
-            "Falling back to the frontier model."
+            f"Falling back to {model_backend.model_key}."
         )
-    if local_translation_enabled:
+    if local_translator is not None:
         print(
             f"Using local translation for subtitle language '{course.subtitle_language}' with English output."
         )
+    print(f"Translating with the {model_backend.name} backend ({model_backend.model_key}).")
 
-    print(f"Processing videos for language: {language_code}")
-    for video in tqdm(course.videos, desc=f"Processing videos for {language_code}"):
-        processed_new_video = process_video(
-            video.id,
-            course.subtitle_language,
-            output_dir,
-            use_local_translation=local_translation_enabled,
+    with recording_run("generate-data", language_code):
+        print(f"Processing videos for language: {language_code}")
+        run_video_jobs(
+            video_ids,
+            lambda video_id: process_video(
+                video_id,
+                course.subtitle_language,
+                output_dir,
+                local_translator=local_translator,
+                pack_token_budget=pack_token_budget,
+                concurrency=concurrency,
+                offline=offline,
+                data_format=data_format,
+                chunk_seconds=chunk_seconds,
+                vocab_dir=course_vocab_dir(language_code),
+                journal_dir=snippet_journal_dir(language_code),
+                manifest_dir=video_manifest_dir(language_code),
+                refresh=refresh,
+                model_backend=model_backend,
+            ),
+            jobs=jobs,
+            desc=f"Processing videos for {language_code}",
+            stop_after_first_success=stop_after_one_new,
         )
-        if stop_after_one_new and processed_new_video:
-            print("Stopped after processing one new video.")
-            break
 
+        course_vocab = write_course_vocab_index(language_code, [video.id for video in course.videos], output_dir)
+        print(f"Vocabulary index updated: {len(course_vocab['words'])} words across {len(course_vocab['videos'])} videos")
+        print(get_translation_cache().describe_stats())
+    if batch_collect and all(video_data_file(output_dir, video_id).exists() for video_id in video_ids):
+        state = load_batch_state(language_code)
+        if state is not None:
+            print(f"Batch {state.batch_id} fully collected. State archived to {archive_batch_state(language_code, state)}")
     print("JSON generation complete.")
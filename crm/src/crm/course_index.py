@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 from crm.paths import PUBLIC_DATA_ROOT, course_dir, course_file
 
@@ -19,6 +20,8 @@ class CourseDefinition:
     subtitle_language: str
     direction: str
     videos: list[CourseVideo]
+    discovery: dict[str, Any] = field(default_factory=dict)
+    translation: dict[str, Any] = field(default_factory=dict)
 
 
 def _read_json(path: Path) -> dict:
@@ -70,4 +73,6 @@ def load_course(language_code: str) -> CourseDefinition:
         subtitle_language=data["subtitleLanguage"],
         direction=data["direction"],
         videos=videos,
+        discovery=data.get("discovery", {}),
+        translation=data.get("translation", {}),
     )
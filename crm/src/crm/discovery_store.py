@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+class DiscoveryStore:
+    # Verdicts for every checked video and the accepted results of find-videos. Each verdict is
+    # committed on its own, so an interrupted run keeps everything it checked.
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS processed_videos (
+                video_id TEXT PRIMARY KEY,
+                accepted INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                processed_at REAL NOT NULL
+            ) WITHOUT ROWID
+            """
+        )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS found_videos (
+                video_id TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                channel_title TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                url TEXT NOT NULL,
+                found_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.commit()
+
+    def is_processed(self, video_id: str) -> bool:
+        with self._lock:
+            return self._connection.execute(
+                "SELECT 1 FROM processed_videos WHERE video_id = ?",
+                (video_id,),
+            ).fetchone() is not None
+
+    def record(self, video_id: str, accepted: bool, reason: str, result: dict[str, Any] | None = None) -> None:
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO processed_videos (video_id, accepted, reason, processed_at) VALUES (?, ?, ?, ?)",
+                (video_id, int(accepted), reason, now),
+            )
+            if result is not None:
+                self._connection.execute(
+                    "INSERT OR IGNORE INTO found_videos "
+                    "(video_id, title, channel_title, published_at, url, found_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        result["id"],
+                        result["title"],
+                        result["channel_title"],
+                        result["published_at"],
+                        result["url"],
+                        now,
+                    ),
+                )
+
+    def processed_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM processed_videos").fetchone()[0]
+
+    def result_count(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM found_videos").fetchone()[0]
+
+    def results(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT video_id, title, channel_title, published_at, url FROM found_videos ORDER BY rowid"
+            ).fetchall()
+        return [
+            {"id": video_id, "title": title, "channel_title": channel_title, "published_at": published_at, "url": url}
+            for video_id, title, channel_title, published_at, url in rows
+        ]
+
+    def import_legacy_files(self, processed_file: Path, results_file: Path) -> None:
+        # Imports the JSON files earlier versions rewrote on every batch. The processed file is renamed
+        # afterwards; the results file doubles as the store's export and is left in place.
+        now = time.time()
+        with self._lock, self._connection:
+            if results_file.exists():
+                with results_file.open("r", encoding="utf-8") as handle:
+                    videos = json.load(handle).get("videos", [])
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO found_videos "
+                    "(video_id, title, channel_title, published_at, url, found_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (video["id"], video["title"], video["channel_title"], video["published_at"], video["url"], now)
+                        for video in videos
+                    ],
+                )
+            if processed_file.exists():
+                with processed_file.open("r", encoding="utf-8") as handle:
+                    processed = json.load(handle)
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO processed_videos (video_id, accepted, reason, processed_at) "
+                    "VALUES (?, ?, 'imported', ?)",
+                    [(video_id, int(bool(accepted)), now) for video_id, accepted in processed.items()],
+                )
+        if processed_file.exists():
+            processed_file.replace(processed_file.with_name(f"{processed_file.name}.imported"))
+
+    def export_results(self, path: Path) -> int:
+        results = self.results()
+        temp_path = path.with_name(f"{path.name}.tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"videos": results}, handle, ensure_ascii=False, indent=2)
+        temp_path.replace(path)
+        return len(results)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
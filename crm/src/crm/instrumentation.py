@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import resource
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+from crm.paths import course_work_dir
+
+COURSE_SCOPE = ""
+SUMMARY_COUNTERS = ("requests", "retries", "splits", "input_tokens", "output_tokens", "cache_hits")
+
+_current_video: ContextVar[str | None] = ContextVar("crm_current_video", default=None)
+_active_recorder: RunRecorder | None = None
+
+
+def run_log_dir(language_code: str) -> Path:
+    return course_work_dir(language_code) / "runs"
+
+
+def peak_rss_bytes() -> int:
+    # High-water mark of the whole process; ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageTotals:
+    calls: int = 0
+    seconds: float = 0.0
+    counters: dict[str, float] = field(default_factory=dict)
+
+    def add(self, counters: dict[str, float]) -> None:
+        for name, value in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+
+
+class RunRecorder:
+    # JSON-lines event log of one command run plus in-memory totals per video and stage. Stages
+    # of one video never nest, so their seconds add up to the time spent on that video.
+    def __init__(self, path: Path, command: str, language_code: str):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.command = command
+        self.language_code = language_code
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._handle = path.open("a", encoding="utf-8")
+        self._totals: dict[str, dict[str, StageTotals]] = {}
+        self._video_peak_rss: dict[str, int] = {}
+        with self._lock:
+            self._write({"event": "start", "command": command, "course": language_code})
+
+    def _write(self, record: dict[str, object]) -> None:
+        self._handle.write(json.dumps({"time": round(time.time(), 3), **record}, ensure_ascii=False) + "\n")
+        self._handle.flush()
+
+    def _stage_totals(self, video_id: str, stage: str) -> StageTotals:
+        return self._totals.setdefault(video_id, {}).setdefault(stage, StageTotals())
+
+    def record_stage(self, stage: str, video_id: str, seconds: float, counters: dict[str, float]) -> None:
+        peak_rss = peak_rss_bytes()
+        with self._lock:
+            totals = self._stage_totals(video_id, stage)
+            totals.calls += 1
+            totals.seconds += seconds
+            totals.add(counters)
+            self._video_peak_rss[video_id] = max(self._video_peak_rss.get(video_id, 0), peak_rss)
+            self._write(
+                {
+                    "event": "stage",
+                    "stage": stage,
+                    "video": video_id or None,
+                    "seconds": round(seconds, 6),
+                    "peak_rss_mb": round(peak_rss / 1_000_000, 1),
+                    **counters,
+                }
+            )
+
+    def record_counts(self, stage: str, video_id: str, counters: dict[str, float]) -> None:
+        with self._lock:
+            self._stage_totals(video_id, stage).add(counters)
+            self._write({"event": "count", "stage": stage, "video": video_id or None, **counters})
+
+    def close(self) -> None:
+        with self._lock:
+            self._write(
+                {
+                    "event": "end",
+                    "seconds": round(time.perf_counter() - self.started, 3),
+                    "peak_rss_mb": round(peak_rss_bytes() / 1_000_000, 1),
+                }
+            )
+            self._handle.close()
+
+    def print_summary(self) -> None:
+        with self._lock:
+            totals = {video_id: dict(stages) for video_id, stages in self._totals.items()}
+        video_ids = [video_id for video_id in totals if video_id != COURSE_SCOPE]
+        stages = list(dict.fromkeys(stage for video_id in video_ids for stage in totals[video_id]))
+
+        if video_ids:
+            header = f"{'video':<14} {'seconds':>8}" + "".join(f" {stage:>16}" for stage in stages)
+            header += "".join(f" {name:>13}" for name in SUMMARY_COUNTERS) + f" {'peak RSS MB':>11}"
+            print(header)
+            for video_id in video_ids:
+                video_totals = totals[video_id]
+                row = f"{video_id:<14} {sum(stage.seconds for stage in video_totals.values()):>8.2f}"
+                row += "".join(
+                    f" {video_totals[stage].seconds if stage in video_totals else 0.0:>16.2f}" for stage in stages
+                )
+                row += "".join(
+                    f" {sum(stage.counters.get(name, 0) for stage in video_totals.values()):>13,.0f}"
+                    for name in SUMMARY_COUNTERS
+                )
+                print(row + f" {self._video_peak_rss.get(video_id, 0) / 1_000_000:>11.1f}")
+
+        course: dict[str, StageTotals] = {}
+        for stages_by_name in totals.values():
+            for stage, stage_totals in stages_by_name.items():
+                merged = course.setdefault(stage, StageTotals())
+                merged.calls += stage_totals.calls
+                merged.seconds += stage_totals.seconds
+                merged.add(stage_totals.counters)
+
+        print(f"Course {self.language_code} ({self.command}, {time.perf_counter() - self.started:.1f}s wall):")
+        print(f"{'stage':<18} {'calls':>7} {'seconds':>9} {'mean latency':>13}  counters")
+        for stage, stage_totals in course.items():
+            requests = stage_totals.counters.get("requests", 0)
+            latency = stage_totals.counters.get("latency_seconds", 0.0)
+            mean_latency = f"{latency / requests:.3f}s" if requests and latency else "-"
+            counters = " ".join(
+                f"{name}={value:,.0f}" for name, value in stage_totals.counters.items() if name != "latency_seconds"
+            )
+            print(f"{stage:<18} {stage_totals.calls:>7} {stage_totals.seconds:>9.2f} {mean_latency:>13}  {counters}")
+        print(f"Peak RSS: {peak_rss_bytes() / 1_000_000:.1f} MB")
+
+
+@contextlib.contextmanager
+def recording_run(command: str, language_code: str) -> Iterator[RunRecorder]:
+    global _active_recorder
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    recorder = RunRecorder(run_log_dir(language_code) / f"{timestamp}-{command}.jsonl", command, language_code)
+    _active_recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _active_recorder = None
+        recorder.close()
+        recorder.print_summary()
+        print(f"Run log written to {recorder.path}")
+
+
+@contextlib.contextmanager
+def video_scope(video_id: str) -> Iterator[None]:
+    token = _current_video.set(video_id)
+    try:
+        yield
+    finally:
+        _current_video.reset(token)
+
+
+@contextlib.contextmanager
+def stage(name: str, video_id: str | None = None, **counters: float) -> Iterator[dict[str, float]]:
+    # Times the block and records it under the current video; the caller may add counters
+    # to the yielded dict before the block ends.
+    started = time.perf_counter()
+    stage_counters = dict(counters)
+    try:
+        yield stage_counters
+    finally:
+        recorder = _active_recorder
+        if recorder is not None:
+            recorder.record_stage(
+                name,
+                video_id or _current_video.get() or COURSE_SCOPE,
+                time.perf_counter() - started,
+                stage_counters,
+            )
+
+
+def count(name: str, video_id: str | None = None, **counters: float) -> None:
+    recorder = _active_recorder
+    if recorder is not None and counters:
+        recorder.record_counts(name, video_id or _current_video.get() or COURSE_SCOPE, counters)
@@ -1,10 +1,20 @@
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from functools import lru_cache
+from typing import Any
 
-from langcodes import Language
+from crm.settings import DEFAULT_INTER_THREADS, DEFAULT_INTRA_THREADS
 
 ENGLISH_ARGO_CODE = "en"
+LOCAL_TRANSLATION_MODEL = "argos"
+LOCAL_TRANSLATION_BATCH_SIZE = 64
+# Argos outputs kept in memory per loaded model; function words recur thousands of times per course.
+WORD_MEMO_SIZE = 50_000
+
+# Serializes pair resolution, so parallel videos do not install the same package twice.
+_resolution_lock = threading.Lock()
 
 
 @lru_cache(maxsize=1)
@@ -21,7 +31,10 @@ def _get_installed_pairs() -> set[tuple[str, str]]:
     }
 
 
+@lru_cache(maxsize=None)
 def _to_argos_language_code(language_code: str) -> str | None:
+    from langcodes import Language
+
     try:
         normalized = Language.get(language_code)
     except Exception:
@@ -33,6 +46,19 @@ def _to_argos_language_code(language_code: str) -> str | None:
     return base_language
 
 
+@lru_cache(maxsize=1)
+def _update_package_index() -> bool:
+    # Downloaded at most once per run, whether or not it worked.
+    from argostranslate import package
+
+    try:
+        package.update_package_index()
+    except Exception as exc:
+        print(f"Failed to update the Argos package index: {exc}")
+        return False
+    return True
+
+
 def _ensure_installed_pair(source_code: str, target_code: str) -> bool:
     direct_pair = (source_code, target_code)
     installed_pairs = _get_installed_pairs()
@@ -44,9 +70,10 @@ def _ensure_installed_pair(source_code: str, target_code: str) -> bool:
     except ImportError:
         return False
 
+    if not _update_package_index():
+        return False
     print(f"Installing Argos translation package {source_code}->{target_code}...")
     try:
-        package.update_package_index()
         if not package.install_package_for_language_pair(source_code, target_code):
             return False
     except Exception as exc:
@@ -57,32 +84,122 @@ def _ensure_installed_pair(source_code: str, target_code: str) -> bool:
     return direct_pair in _get_installed_pairs()
 
 
-def _resolve_language_pair(source_language: str) -> tuple[str, str] | None:
-    source_code = _to_argos_language_code(source_language)
-    if source_code is None:
-        return None
-
+@lru_cache(maxsize=None)
+def _resolve_argos_pair(source_code: str) -> tuple[str, str] | None:
+    # Memoized per Argos code, misses included, so a missing pair is looked for once per run.
     direct_pair = (source_code, ENGLISH_ARGO_CODE)
     if _ensure_installed_pair(*direct_pair):
         return direct_pair
 
+    print(f"No Argos translation package {source_code}->{ENGLISH_ARGO_CODE} is available for this run.")
     return None
 
 
-def supports_local_translation(source_language: str) -> bool:
-    return _resolve_language_pair(source_language) is not None
-
+def _resolve_language_pair(source_language: str) -> tuple[str, str] | None:
+    source_code = _to_argos_language_code(source_language)
+    if source_code is None:
+        return None
 
-def translate_word_to_english(word: str, source_language: str) -> str | None:
+    with _resolution_lock:
+        return _resolve_argos_pair(source_code)
+
+
+class LocalTranslator:
+    def __init__(self, package: Any, inter_threads: int, intra_threads: int, memo_size: int = WORD_MEMO_SIZE):
+        import ctranslate2
+        from argostranslate import settings
+
+        self.source_code = package.from_code
+        self.target_code = package.to_code
+        self._package = package
+        self._beam_size = max(1, settings.beam_size)
+        self._tokenizer_lock = threading.Lock()
+        self._memo: OrderedDict[str, str | None] = OrderedDict()
+        self._memo_size = memo_size
+        self._memo_lock = threading.Lock()
+        self._translator = ctranslate2.Translator(
+            str(package.package_path / "model"),
+            device=settings.device,
+            inter_threads=inter_threads,
+            intra_threads=intra_threads,
+            compute_type=settings.compute_type,
+        )
+
+    def _decode(self, tokens: list[str]) -> str:
+        value = self._package.tokenizer.decode(tokens)
+        target_prefix = self._package.target_prefix
+        if target_prefix and value.startswith(target_prefix):
+            value = value[len(target_prefix):]
+        return value.strip()
+
+    def translate_words(self, words: list[str]) -> list[str | None]:
+        # Repeated and recently seen words are answered from the memo; only the rest reach the model.
+        if not words:
+            return []
+
+        with self._memo_lock:
+            known = {word: self._memo[word] for word in dict.fromkeys(words) if word in self._memo}
+            for word in known:
+                self._memo.move_to_end(word)
+        missing = [word for word in dict.fromkeys(words) if word not in known]
+        if missing:
+            fresh = dict(zip(missing, self._translate_batch(missing)))
+            with self._memo_lock:
+                self._memo.update(fresh)
+                while len(self._memo) > self._memo_size:
+                    self._memo.popitem(last=False)
+            known.update(fresh)
+        return [known[word] for word in words]
+
+    def _translate_batch(self, words: list[str]) -> list[str | None]:
+        with self._tokenizer_lock:
+            tokenized = [self._package.tokenizer.encode(word) for word in words]
+        target_prefix = [[self._package.target_prefix]] * len(tokenized) if self._package.target_prefix else None
+
+        results = self._translator.translate_batch(
+            tokenized,
+            target_prefix=target_prefix,
+            replace_unknowns=True,
+            max_batch_size=LOCAL_TRANSLATION_BATCH_SIZE,
+            batch_type="examples",
+            beam_size=self._beam_size,
+            num_hypotheses=1,
+            length_penalty=0.2,
+        )
+
+        with self._tokenizer_lock:
+            return [self._decode(result.hypotheses[0]) or None for result in results]
+
+
+@lru_cache(maxsize=None)
+def get_local_translator(
+    source_language: str,
+    inter_threads: int = DEFAULT_INTER_THREADS,
+    intra_threads: int = DEFAULT_INTRA_THREADS,
+) -> LocalTranslator | None:
     pair = _resolve_language_pair(source_language)
     if pair is None:
         return None
 
     try:
-        from argostranslate import translate
+        from argostranslate import package
     except ImportError:
         return None
 
-    source_code, target_code = pair[0], pair[1]
-    translated = translate.translate(word, source_code, target_code).strip()
-    return translated or None
+    installed_package = next(
+        (
+            installed
+            for installed in package.get_installed_packages()
+            if (installed.from_code, installed.to_code) == pair
+        ),
+        None,
+    )
+    if installed_package is None:
+        return None
+
+    try:
+        return LocalTranslator(installed_package, inter_threads=inter_threads, intra_threads=intra_threads)
+    except Exception as exc:
+        print(f"Failed to load Argos translation model {pair[0]}->{pair[1]}: {exc}")
+        return None
+
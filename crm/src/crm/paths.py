@@ -11,6 +11,8 @@ CRM_DATA_ROOT = CRM_ROOT / "data"
 CRM_WORK_ROOT = CRM_DATA_ROOT / "work"
 CRM_CACHE_ROOT = CRM_DATA_ROOT / "cache"
 CRM_EXPORTS_ROOT = CRM_DATA_ROOT / "exports"
+TRANSLATION_CACHE_FILE = CRM_CACHE_ROOT / "translations.sqlite3"
+SUBTITLE_CACHE_ROOT = CRM_CACHE_ROOT / "subtitles"
 
 
 def course_dir(language_code: str) -> Path:
@@ -25,6 +27,14 @@ def course_video_dir(language_code: str) -> Path:
     return course_dir(language_code) / "videos"
 
 
+def course_vocab_dir(language_code: str) -> Path:
+    return course_dir(language_code) / "vocab"
+
+
+def course_vocab_file(language_code: str) -> Path:
+    return course_dir(language_code) / "vocab.json"
+
+
 def course_subtitle_dir(language_code: str) -> Path:
     return course_dir(language_code) / "subtitles"
 
@@ -36,6 +46,7 @@ def course_work_dir(language_code: str) -> Path:
 def ensure_directories(language_code: str) -> None:
     course_video_dir(language_code).mkdir(parents=True, exist_ok=True)
     course_subtitle_dir(language_code).mkdir(parents=True, exist_ok=True)
+    course_vocab_dir(language_code).mkdir(parents=True, exist_ok=True)
     course_work_dir(language_code).mkdir(parents=True, exist_ok=True)
     CRM_CACHE_ROOT.mkdir(parents=True, exist_ok=True)
     CRM_EXPORTS_ROOT.mkdir(parents=True, exist_ok=True)
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+
+class RateLimiter:
+    # Spaces calls at least 1/rate seconds apart across threads; each caller reserves the next
+    # free slot under the lock and sleeps outside it.
+    def __init__(self, rate_per_second: float):
+        self.interval = 1.0 / rate_per_second if rate_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_host_limiters: dict[str, RateLimiter] = {}
+_host_limiters_lock = threading.Lock()
+
+
+def host_rate_limiter(host: str, rate_per_second: float) -> RateLimiter:
+    with _host_limiters_lock:
+        limiter = _host_limiters.get(host)
+        if limiter is None or limiter.interval != (1.0 / rate_per_second if rate_per_second > 0 else 0.0):
+            limiter = _host_limiters[host] = RateLimiter(rate_per_second)
+        return limiter
+
+
+def retry_after_seconds(headers: Mapping[str, str] | None) -> float | None:
+    # Reads "retry-after-ms", then "retry-after" as seconds or an HTTP date.
+    if not headers:
+        return None
+    milliseconds = headers.get("retry-after-ms")
+    if milliseconds is not None:
+        try:
+            return max(float(milliseconds) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay_seconds: float = 1.0
+    max_delay_seconds: float = 60.0
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        # Full jitter: a random wait below the exponential cap, so workers that failed together
+        # do not retry together. A server-sent Retry-After is a lower bound.
+        cap = min(self.max_delay_seconds, self.base_delay_seconds * 2 ** max(attempt - 1, 0))
+        jittered = random.uniform(0, cap)
+        return max(jittered, retry_after) if retry_after is not None else jittered
+
+
+class TokenBucket:
+    # Refills continuously up to one minute's allowance. Callers reserve before they know the
+    # exact cost and may drive the level below zero; the deficit is how long the next caller
+    # waits, so reservations are served in arrival order.
+    def __init__(self, per_minute: float):
+        self.capacity = max(per_minute, 0.0)
+        self.rate = self.capacity / 60.0
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level -= amount
+            return -self._level / self.rate if self._level < 0 else 0.0
+
+    def adjust(self, amount: float) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self._level = min(self.capacity, self._level - amount)
+
+
+class CircuitBreaker:
+    # Opens after `failure_threshold` consecutive failures and blocks callers for the cooldown.
+    # Once it has cooled down, traffic resumes; one more failure reopens it straight away, one
+    # success closes it.
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.consecutive_failures = 0
+        self._lock = threading.Lock()
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.consecutive_failures = 0
+
+    def record_failure(self) -> float:
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.failure_threshold <= 0 or self.consecutive_failures < self.failure_threshold:
+                return 0.0
+            return self.cooldown_seconds
+
+
+class RequestScheduler:
+    # Shared by every worker that talks to one provider: request and token budgets per minute,
+    # plus a common pause after a circuit breaker trip or a Retry-After, so a throttled
+    # provider sees all workers back off together instead of a burst of retries.
+    def __init__(
+        self,
+        requests_per_minute: float = 0.0,
+        tokens_per_minute: float = 0.0,
+        retry_policy: RetryPolicy = RetryPolicy(),
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.retry_policy = retry_policy
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _pause_remaining(self) -> float:
+        with self._lock:
+            return max(self._paused_until - time.monotonic(), 0.0)
+
+    def _reserve(self, estimated_tokens: int) -> float:
+        return max(self.requests.reserve(1), self.tokens.reserve(estimated_tokens))
+
+    def acquire(self, estimated_tokens: int = 0) -> None:
+        wait = self._pause_remaining()
+        if wait > 0:
+            time.sleep(wait)
+        wait = self._reserve(estimated_tokens)
+        # A pause may start while this caller waits for its budget; honour it before sending.
+        while wait > 0:
+            time.sleep(wait)
+            wait = self._pause_remaining()
+
+    async def acquire_async(self, estimated_tokens: int = 0) -> None:
+        wait = self._pause_remaining()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        wait = self._reserve(estimated_tokens)
+        while wait > 0:
+            await asyncio.sleep(wait)
+            wait = self._pause_remaining()
+
+    def record_success(self, estimated_tokens: int = 0, used_tokens: int | None = None) -> None:
+        if used_tokens is not None:
+            self.tokens.adjust(used_tokens - estimated_tokens)
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def record_failure(self, retry_after: float | None = None) -> float:
+        # Returns the pause every worker now observes, or 0 when nobody has to wait.
+        pause = retry_after or 0.0
+        if self.breaker is not None:
+            pause = max(pause, self.breaker.record_failure())
+        if pause > 0:
+            self.pause(pause)
+        return pause
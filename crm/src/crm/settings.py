@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+# Defaults the CLI parser shows, kept free of imports so building the parser loads nothing
+# else; the modules that use them import them from here.
+
+# Translation backends (crm.translation_backends).
+OPENAI_BACKEND = "openai"
+OPENAI_COMPATIBLE_BACKEND = "openai-compatible"
+ARGOS_BACKEND = "argos"
+TRANSLATION_BACKENDS = (OPENAI_BACKEND, OPENAI_COMPATIBLE_BACKEND, ARGOS_BACKEND)
+
+# Argos/CTranslate2 threads (crm.local_translation).
+DEFAULT_INTER_THREADS = 1
+DEFAULT_INTRA_THREADS = 0
+
+# Request packing (crm.snippet_packing).
+DEFAULT_PACK_TOKEN_BUDGET = 2000
+
+# Subtitle tracks (crm.subtitle_selection, crm.commands.extract_subtitles).
+TRACK_SELECTIONS = ("all", "manual")
+DEFAULT_TRACK_WORKERS = 4
+
+# Per-video output files (crm.video_data).
+LEGACY_FORMAT = "legacy"
+COMPACT_FORMAT = "compact"
+CHUNKED_FORMAT = "chunked"
+VIDEO_DATA_FORMATS = (LEGACY_FORMAT, COMPACT_FORMAT, CHUNKED_FORMAT)
+DEFAULT_CHUNK_SECONDS = 60.0
+
+# YouTube discovery (crm.video_discovery).
+DEFAULT_DAILY_QUOTA = 10_000
+DEFAULT_PROBE_WORKERS = 8
+DEFAULT_PROBE_RATE = 5.0
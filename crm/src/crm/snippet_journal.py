@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from crm.paths import course_work_dir
+
+SNIPPET_JOURNAL_VERSION = 1
+
+
+def snippet_journal_dir(language_code: str) -> Path:
+    return course_work_dir(language_code) / "journal"
+
+
+def transcript_fingerprint(texts: list[str]) -> str:
+    digest = hashlib.sha1()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SnippetJournal:
+    # Append-only JSONL: a header line naming the transcript it belongs to, then one line per
+    # completed snippet with its (word, meaning) pairs. A torn last line from a crash is ignored.
+    def __init__(self, path: Path, video_id: str, transcript: str):
+        self.path = path
+        self.video_id = video_id
+        self.transcript = transcript
+        self._lock = threading.Lock()
+        self._handle = None
+
+    def _header(self) -> dict[str, object]:
+        return {"version": SNIPPET_JOURNAL_VERSION, "video_id": self.video_id, "transcript": self.transcript}
+
+    def load(self) -> dict[int, list[tuple[str, str]]]:
+        if not self.path.exists():
+            return {}
+
+        completed: dict[int, list[tuple[str, str]]] = {}
+        with self.path.open("rb") as handle:
+            lines = handle.readlines()
+        if not lines:
+            # A crash right after creating the file; nothing was recorded yet.
+            self.path.unlink()
+            return {}
+        try:
+            header = json.loads(lines[0]) if lines[0].endswith(b"\n") else None
+        except json.JSONDecodeError:
+            header = None
+        if header is None:
+            print(f"Discarding snippet journal for video '{self.video_id}': its header is incomplete.")
+            self.path.unlink()
+            return {}
+        if header != self._header():
+            print(f"Discarding snippet journal for video '{self.video_id}': it belongs to a different transcript.")
+            self.path.unlink()
+            return {}
+
+        valid_length = len(lines[0])
+        for line in lines[1:]:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            completed[record["index"]] = [(word, meaning) for word, meaning in record["words"]]
+            valid_length += len(line)
+
+        if valid_length < self.path.stat().st_size:
+            # Drop a line torn by a crash so new records start on a clean line.
+            with self.path.open("r+b") as handle:
+                handle.truncate(valid_length)
+        return completed
+
+    def append(self, index: int, words: list[tuple[str, str]]) -> None:
+        line = json.dumps({"index": index, "words": words}, ensure_ascii=False)
+        with self._lock:
+            if self._handle is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                is_new = not self.path.exists() or self.path.stat().st_size == 0
+                self._handle = self.path.open("a", encoding="utf-8")
+                if is_new:
+                    self._handle.write(json.dumps(self._header(), ensure_ascii=False) + "\n")
+            self._handle.write(line + "\n")
+            self._handle.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def remove(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
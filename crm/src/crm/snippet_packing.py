@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any
+
+from crm.translation_cache import normalize_cache_word
+from crm.word_normalization import extract_words
+
+CHARS_PER_TOKEN_ESTIMATE = 3
+SNIPPET_OVERHEAD_TOKENS = 12
+WORD_OVERHEAD_TOKENS = 3
+# Bump when extract_words changes, so manifests mark every snippet for re-translation.
+TOKENIZER_VERSION = 2
+
+
+@dataclass(frozen=True)
+class SnippetSource:
+    index: int
+    start: float
+    duration: float
+    text: str
+    context: str
+    words: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class PackedSnippet:
+    source: SnippetSource
+    missing_words: tuple[str, ...]
+    requested_words: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SnippetPack:
+    snippets: tuple[PackedSnippet, ...]
+
+    @property
+    def word_count(self) -> int:
+        return sum(len(snippet.requested_words) for snippet in self.snippets)
+
+
+def _segment_field(segment: Any, name: str) -> Any:
+    return segment.get(name) if isinstance(segment, dict) else getattr(segment, name)
+
+
+def build_snippet_sources(transcript: list[Any]) -> list[SnippetSource]:
+    # Snippets follow the playback order, so neighbouring context, manifests and every output
+    # format agree on the order even when a track lists overlapping cues out of order.
+    transcript = sorted(transcript, key=lambda segment: _segment_field(segment, "start"))
+    texts = [_segment_field(segment, "text") or "" for segment in transcript]
+    sources: list[SnippetSource] = []
+    for index, segment in enumerate(transcript):
+        prev_text = texts[index - 1] if index > 0 else ""
+        next_text = texts[index + 1] if index < len(texts) - 1 else ""
+        sources.append(SnippetSource(
+            index=index,
+            start=_segment_field(segment, "start"),
+            duration=_segment_field(segment, "duration"),
+            text=texts[index],
+            context=" ".join(filter(None, [prev_text, texts[index], next_text])),
+            words=tuple(extract_words(texts[index])),
+        ))
+    return sources
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN_ESTIMATE)
+
+
+def _estimate_snippet_tokens(source: SnippetSource, requested_words: list[str]) -> int:
+    return (
+        SNIPPET_OVERHEAD_TOKENS
+        + estimate_tokens(source.context)
+        + sum(estimate_tokens(word) + WORD_OVERHEAD_TOKENS for word in requested_words)
+    )
+
+
+def _unrequested_words(words: list[str], requested_keys: set[str]) -> list[str]:
+    unrequested: list[str] = []
+    seen: set[str] = set()
+    for word in words:
+        key = normalize_cache_word(word)
+        if key in requested_keys or key in seen:
+            continue
+        seen.add(key)
+        unrequested.append(word)
+    return unrequested
+
+
+def pack_snippets(
+    pending: list[tuple[SnippetSource, list[str]]],
+    token_budget: float,
+) -> list[SnippetPack]:
+    # Each word is requested once per pack, from the first snippet that needs it; later
+    # snippets in the same pack reuse that meaning when results are expanded.
+    packs: list[SnippetPack] = []
+    current: list[PackedSnippet] = []
+    current_keys: set[str] = set()
+    current_tokens = 0
+
+    for source, missing_words in pending:
+        if not missing_words:
+            continue
+
+        requested_words = _unrequested_words(missing_words, current_keys)
+        cost = _estimate_snippet_tokens(source, requested_words)
+        if current and current_tokens + cost > token_budget:
+            packs.append(SnippetPack(snippets=tuple(current)))
+            current, current_keys, current_tokens = [], set(), 0
+            requested_words = _unrequested_words(missing_words, current_keys)
+            cost = _estimate_snippet_tokens(source, requested_words)
+
+        current.append(PackedSnippet(
+            source=source,
+            missing_words=tuple(missing_words),
+            requested_words=tuple(requested_words),
+        ))
+        current_keys.update(normalize_cache_word(word) for word in requested_words)
+        current_tokens += cost
+
+    if current:
+        packs.append(SnippetPack(snippets=tuple(current)))
+    return packs
+
+
+def split_pack(pack: SnippetPack) -> tuple[SnippetPack, SnippetPack]:
+    midpoint = len(pack.snippets) // 2
+    halves = (pack.snippets[:midpoint], pack.snippets[midpoint:])
+    # Each half is deduplicated again, since a word may have been requested only by the other half.
+    first, second = (
+        pack_snippets(
+            [(snippet.source, list(snippet.missing_words)) for snippet in half],
+            token_budget=math.inf,
+        )
+        for half in halves
+    )
+    return first[0], second[0]
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from crm.paths import SUBTITLE_CACHE_ROOT
+
+SUBTITLE_CACHE_TTL_SECONDS = 30 * 24 * 3600
+
+
+@dataclass(frozen=True)
+class CachedTrackList:
+    tracks: list[tuple[str, bool]]
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class CachedSubtitleBody:
+    text: str
+    sha256: str
+    fetched_at: float
+
+
+@dataclass(frozen=True)
+class SubtitleCacheSummary:
+    track_lists: int
+    bodies: int
+    blobs: int
+    blob_bytes: int
+    oldest_fetch: float | None
+    newest_fetch: float | None
+
+
+class SubtitleCache:
+    def __init__(self, root: Path, ttl_seconds: float = SUBTITLE_CACHE_TTL_SECONDS):
+        self.root = root
+        self.blob_dir = root / "blobs"
+        self.ttl_seconds = ttl_seconds
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(root / "index.sqlite3", check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS track_lists (
+                video_id TEXT PRIMARY KEY,
+                tracks TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bodies (
+                video_id TEXT NOT NULL,
+                language_code TEXT NOT NULL,
+                is_generated INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (video_id, language_code, is_generated)
+            )
+            """
+        )
+        self._connection.commit()
+
+    def is_fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl_seconds
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}.vtt"
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Connection]:
+        # Blob files change only inside a SQLite write transaction, which also excludes other
+        # processes sharing the cache: a prune cannot unlink a blob between put_body writing or
+        # reusing it and committing the row that references it.
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._connection
+            except BaseException:
+                self._connection.rollback()
+                raise
+            self._connection.commit()
+
+    def get_tracks(self, video_id: str) -> CachedTrackList | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT tracks, fetched_at FROM track_lists WHERE video_id = ?",
+                (video_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        tracks = [(language_code, bool(is_generated)) for language_code, is_generated in json.loads(row[0])]
+        return CachedTrackList(tracks=tracks, fetched_at=row[1])
+
+    def put_tracks(self, video_id: str, tracks: list[tuple[str, bool]]) -> None:
+        payload = json.dumps(tracks, ensure_ascii=False)
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO track_lists (video_id, tracks, fetched_at) VALUES (?, ?, ?) "
+                "ON CONFLICT DO UPDATE SET tracks = excluded.tracks, fetched_at = excluded.fetched_at",
+                (video_id, payload, time.time()),
+            )
+            self._connection.commit()
+
+    def get_body(self, video_id: str, language_code: str, is_generated: bool) -> CachedSubtitleBody | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT sha256, fetched_at FROM bodies "
+                "WHERE video_id = ? AND language_code = ? AND is_generated = ?",
+                (video_id, language_code, int(is_generated)),
+            ).fetchone()
+        if row is None:
+            return None
+        blob_path = self._blob_path(row[0])
+        if not blob_path.exists():
+            return None
+        return CachedSubtitleBody(text=blob_path.read_text(encoding="utf-8"), sha256=row[0], fetched_at=row[1])
+
+    def put_body(self, video_id: str, language_code: str, is_generated: bool, text: str) -> None:
+        sha256 = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        blob_path = self._blob_path(sha256)
+        with self._write_transaction() as connection:
+            if not blob_path.exists():
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = blob_path.with_suffix(f".{threading.get_ident()}.tmp")
+                temp_path.write_text(text, encoding="utf-8")
+                temp_path.replace(blob_path)
+            connection.execute(
+                "INSERT INTO bodies (video_id, language_code, is_generated, sha256, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT DO UPDATE SET sha256 = excluded.sha256, fetched_at = excluded.fetched_at",
+                (video_id, language_code, int(is_generated), sha256, time.time()),
+            )
+
+    def summary(self) -> SubtitleCacheSummary:
+        with self._lock:
+            track_lists = self._connection.execute("SELECT COUNT(*) FROM track_lists").fetchone()[0]
+            bodies, oldest, newest = self._connection.execute(
+                "SELECT COUNT(*), MIN(fetched_at), MAX(fetched_at) FROM bodies"
+            ).fetchone()
+        blob_files = list(self.blob_dir.glob("*/*.vtt"))
+        return SubtitleCacheSummary(
+            track_lists=track_lists,
+            bodies=bodies,
+            blobs=len(blob_files),
+            blob_bytes=sum(path.stat().st_size for path in blob_files),
+            oldest_fetch=oldest,
+            newest_fetch=newest,
+        )
+
+    def prune(
+        self,
+        older_than_seconds: float | None = None,
+        video_id: str | None = None,
+        remove_all: bool = False,
+    ) -> tuple[int, int]:
+        # Clearing the whole cache has to be asked for; a missing filter must not wipe it.
+        filtered = older_than_seconds is not None or video_id is not None
+        if filtered == remove_all:
+            raise ValueError("Pass a filter (an age or a video id) or remove everything, not both or neither.")
+        conditions: list[str] = []
+        parameters: list[object] = []
+        if older_than_seconds is not None:
+            conditions.append("fetched_at < ?")
+            parameters.append(time.time() - older_than_seconds)
+        if video_id is not None:
+            conditions.append("video_id = ?")
+            parameters.append(video_id)
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        removed_blobs = 0
+        with self._write_transaction() as connection:
+            connection.execute(f"DELETE FROM track_lists{where}", parameters)
+            removed_entries = connection.execute(f"DELETE FROM bodies{where}", parameters).rowcount
+            referenced = {row[0] for row in connection.execute("SELECT DISTINCT sha256 FROM bodies")}
+            for blob_path in self.blob_dir.glob("*/*.vtt"):
+                if blob_path.stem not in referenced:
+                    blob_path.unlink()
+                    removed_blobs += 1
+        return removed_entries, removed_blobs
+
+
+@lru_cache(maxsize=1)
+def get_subtitle_cache() -> SubtitleCache:
+    return SubtitleCache(SUBTITLE_CACHE_ROOT)
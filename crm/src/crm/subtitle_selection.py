@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from crm.subtitle_utils import SubtitleTrack
+
+
+def select_tracks(
+    tracks: list[SubtitleTrack],
+    selection: str = "all",
+    languages: list[str] | None = None,
+) -> list[SubtitleTrack]:
+    chosen = [track for track in tracks if selection == "all" or not track.is_generated]
+    if languages:
+        wanted = {language.lower() for language in languages}
+        chosen = [
+            track
+            for track in chosen
+            if track.language_code.lower() in wanted or track.language_code.split("-")[0].lower() in wanted
+        ]
+    return chosen
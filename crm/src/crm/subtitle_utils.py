@@ -1,14 +1,19 @@
 from __future__ import annotations
 
 import html
+import io
 import re
-import tempfile
+import time
+from collections.abc import Callable, Iterable, Iterator
 from dataclasses import dataclass
-from pathlib import Path
+from typing import NamedTuple
 
 from yt_dlp import YoutubeDL
 from yt_dlp.utils import DownloadError
 
+from crm.instrumentation import count, stage
+from crm.subtitle_cache import get_subtitle_cache
+
 
 TAG_RE = re.compile(r"<[^>]+>")
 TIMECODE_RE = re.compile(
@@ -22,6 +27,12 @@ class SubtitleTrack:
     is_generated: bool
 
 
+class SubtitleCue(NamedTuple):
+    text: str
+    start: float
+    duration: float
+
+
 def _youtube_url(video_id: str) -> str:
     return f"https://www.youtube.com/watch?v={video_id}"
 
@@ -50,13 +61,18 @@ def describe_subtitle_error(video_id: str, exc: Exception) -> str:
     return f"Subtitle request failed for video '{video_id}': {message}"
 
 
-def list_available_subtitle_tracks(video_id: str) -> list[SubtitleTrack]:
+def _extract_video_info(ydl: YoutubeDL, video_id: str) -> dict:
+    started = time.perf_counter()
     try:
-        with YoutubeDL(_ydl_options()) as ydl:
-            info = ydl.extract_info(_youtube_url(video_id), download=False)
+        return ydl.extract_info(_youtube_url(video_id), download=False)
     except DownloadError as exc:
+        count("fetch", failed_requests=1)
         raise RuntimeError(describe_subtitle_error(video_id, exc)) from exc
+    finally:
+        count("fetch", requests=1, latency_seconds=time.perf_counter() - started)
+
 
+def _tracks_from_info(info: dict) -> list[SubtitleTrack]:
     tracks: list[SubtitleTrack] = []
     for language_code in sorted((info.get("subtitles") or {}).keys()):
         tracks.append(SubtitleTrack(language_code=language_code, is_generated=False))
@@ -65,15 +81,62 @@ def list_available_subtitle_tracks(video_id: str) -> list[SubtitleTrack]:
     return tracks
 
 
+def _cached_tracks(video_id: str, allow_stale: bool) -> list[SubtitleTrack] | None:
+    cache = get_subtitle_cache()
+    cached = cache.get_tracks(video_id)
+    if cached is None or not (allow_stale or cache.is_fresh(cached.fetched_at)):
+        return None
+    return [SubtitleTrack(language_code=language_code, is_generated=is_generated) for language_code, is_generated in cached.tracks]
+
+
+def _cached_body(video_id: str, track: SubtitleTrack, allow_stale: bool) -> str | None:
+    cache = get_subtitle_cache()
+    cached = cache.get_body(video_id, track.language_code, track.is_generated)
+    if cached is None or not (allow_stale or cache.is_fresh(cached.fetched_at)):
+        return None
+    return cached.text
+
+
+def _remember_tracks(video_id: str, tracks: list[SubtitleTrack]) -> None:
+    get_subtitle_cache().put_tracks(video_id, [(track.language_code, track.is_generated) for track in tracks])
+
+
+def _remember_body(video_id: str, track: SubtitleTrack, text: str) -> None:
+    get_subtitle_cache().put_body(video_id, track.language_code, track.is_generated, text)
+
+
+def _offline_miss(video_id: str, what: str) -> RuntimeError:
+    return RuntimeError(f"{what} for video '{video_id}' is not in the subtitle cache and offline mode is enabled.")
+
+
+def list_available_subtitle_tracks(video_id: str, offline: bool = False) -> list[SubtitleTrack]:
+    tracks = _cached_tracks(video_id, allow_stale=offline)
+    if tracks is not None:
+        return tracks
+    if offline:
+        raise _offline_miss(video_id, "The subtitle track list")
+
+    try:
+        with YoutubeDL(_ydl_options()) as ydl:
+            tracks = _tracks_from_info(_extract_video_info(ydl, video_id))
+    except RuntimeError as exc:
+        stale_tracks = _cached_tracks(video_id, allow_stale=True)
+        if stale_tracks is None:
+            raise
+        print(f"Using stale cached subtitle track list for video '{video_id}': {exc}")
+        return stale_tracks
+
+    _remember_tracks(video_id, tracks)
+    return tracks
+
+
 def _language_matches(track_language: str, desired_language: str) -> bool:
     track_base = track_language.split("-")[0].lower()
     desired_base = desired_language.split("-")[0].lower()
     return track_language.lower() == desired_language.lower() or track_base == desired_base
 
 
-def select_preferred_subtitle_track(video_id: str, language_code: str) -> SubtitleTrack:
-    tracks = list_available_subtitle_tracks(video_id)
-
+def _choose_preferred_track(tracks: list[SubtitleTrack], video_id: str, language_code: str) -> SubtitleTrack:
     for is_generated in (False, True):
         for track in tracks:
             if track.is_generated == is_generated and _language_matches(track.language_code, language_code):
@@ -82,30 +145,33 @@ def select_preferred_subtitle_track(video_id: str, language_code: str) -> Subtit
     raise RuntimeError(f"No subtitle track available for language '{language_code}' in video '{video_id}'.")
 
 
-def _download_track_text(video_id: str, track: SubtitleTrack) -> tuple[str, str]:
-    with tempfile.TemporaryDirectory(prefix=f"yt-dlp-{video_id}-") as temp_dir:
-        ydl_options = {
-            **_ydl_options(),
-            "writesubtitles": not track.is_generated,
-            "writeautomaticsub": track.is_generated,
-            "subtitleslangs": [track.language_code],
-            "outtmpl": f"{temp_dir}/%(id)s",
-        }
-
-        try:
-            with YoutubeDL(ydl_options) as ydl:
-                ydl.download([_youtube_url(video_id)])
-        except DownloadError as exc:
-            raise RuntimeError(describe_subtitle_error(video_id, exc)) from exc
-
-        candidates = sorted(Path(temp_dir).glob("*.vtt"))
-        if not candidates:
-            raise RuntimeError(
-                f"yt-dlp did not produce a VTT subtitle file for video '{video_id}' and language '{track.language_code}'."
-            )
+def select_preferred_subtitle_track(video_id: str, language_code: str) -> SubtitleTrack:
+    return _choose_preferred_track(list_available_subtitle_tracks(video_id), video_id, language_code)
+
+
+def _read_track_body(ydl: YoutubeDL, info: dict, video_id: str, track: SubtitleTrack) -> str:
+    # Read the VTT body straight from the subtitle URL yt-dlp already resolved, with the
+    # same networking setup (cookies, proxy, headers) as the extraction.
+    source = info.get("automatic_captions" if track.is_generated else "subtitles") or {}
+    formats = [
+        subtitle_format
+        for subtitle_format in source.get(track.language_code, [])
+        if subtitle_format.get("ext") == "vtt" and subtitle_format.get("url")
+    ]
+    if not formats:
+        raise RuntimeError(
+            f"No VTT subtitle format is available for video '{video_id}' and language '{track.language_code}'."
+        )
 
-        subtitle_file = candidates[0]
-        return subtitle_file.read_text(encoding="utf-8"), subtitle_file.name
+    started = time.perf_counter()
+    try:
+        with ydl.urlopen(formats[0]["url"]) as response:
+            return response.read().decode("utf-8")
+    except Exception as exc:
+        count("fetch", failed_requests=1)
+        raise RuntimeError(describe_subtitle_error(video_id, exc)) from exc
+    finally:
+        count("fetch", requests=1, latency_seconds=time.perf_counter() - started)
 
 
 def _parse_timestamp(value: str) -> float:
@@ -114,65 +180,204 @@ def _parse_timestamp(value: str) -> float:
 
 
 def _clean_cue_text(lines: list[str]) -> str:
-    text = " ".join(line.strip() for line in lines if line.strip())
-    text = TAG_RE.sub("", text)
-    return html.unescape(text).strip()
+    # Lines arrive stripped and non-empty; tag and entity passes only run when needed.
+    text = " ".join(lines)
+    if "<" in text:
+        text = TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return text.strip()
+
+
+def _parse_timecode_line(line: str) -> tuple[float, float] | None:
+    # Fast path for the common "HH:MM:SS.mmm --> HH:MM:SS.mmm ..." layout; anything else
+    # goes through TIMECODE_RE.
+    if (
+        len(line) >= 29
+        and line[13:16] == "-->"
+        and line[2] == ":" and line[5] == ":" and line[8] == "."
+        and line[19] == ":" and line[22] == ":" and line[25] == "."
+    ):
+        try:
+            start = int(line[0:2]) * 3600 + int(line[3:5]) * 60 + float(line[6:12])
+            end = int(line[17:19]) * 3600 + int(line[20:22]) * 60 + float(line[23:29])
+        except ValueError:
+            pass
+        else:
+            return start, end
 
+    match = TIMECODE_RE.match(line)
+    if not match:
+        return None
+    return _parse_timestamp(match.group("start")), _parse_timestamp(match.group("end"))
 
-def parse_vtt_segments(vtt_text: str) -> list[dict[str, float | str]]:
-    segments: list[dict[str, float | str]] = []
+
+def iter_vtt_cues(source: str | Iterable[str]) -> Iterator[SubtitleCue]:
+    lines = io.StringIO(source, newline=None) if isinstance(source, str) else source
     cue_lines: list[str] = []
     start: float | None = None
     end: float | None = None
 
-    def flush() -> None:
-        nonlocal cue_lines, start, end
-        if start is None or end is None:
-            cue_lines = []
-            return
-        text = _clean_cue_text(cue_lines)
-        if text:
-            segments.append({
-                "text": text,
-                "start": start,
-                "duration": max(0.0, end - start),
-            })
-        cue_lines = []
-        start = None
-        end = None
-
-    for raw_line in vtt_text.splitlines():
+    for raw_line in lines:
         line = raw_line.strip("\ufeff").strip()
         if not line:
-            flush()
+            if start is not None and end is not None and cue_lines:
+                text = _clean_cue_text(cue_lines)
+                if text:
+                    yield SubtitleCue(text, start, max(0.0, end - start))
+            cue_lines = []
+            start = None
+            end = None
             continue
         if line == "WEBVTT" or line.startswith(("NOTE", "STYLE", "REGION")):
             continue
         if "-->" in line:
-            match = TIMECODE_RE.match(line)
-            if not match:
-                continue
-            start = _parse_timestamp(match.group("start"))
-            end = _parse_timestamp(match.group("end"))
+            timecodes = _parse_timecode_line(line)
+            if timecodes is not None:
+                start, end = timecodes
             continue
         if start is None and line.isdigit():
             continue
         cue_lines.append(line)
 
-    flush()
-    return segments
-
-
-def fetch_subtitle_segments(video_id: str, language_code: str) -> tuple[list[dict[str, float | str]], SubtitleTrack]:
-    track = select_preferred_subtitle_track(video_id, language_code)
-    subtitle_text, subtitle_file_name = _download_track_text(video_id, track)
-    segments = parse_vtt_segments(subtitle_text)
+    if start is not None and end is not None and cue_lines:
+        text = _clean_cue_text(cue_lines)
+        if text:
+            yield SubtitleCue(text, start, max(0.0, end - start))
+
+
+def parse_vtt_segments(vtt_text: str | Iterable[str]) -> list[SubtitleCue]:
+    return list(iter_vtt_cues(vtt_text))
+
+
+def _fetch_preferred_track_text(video_id: str, language_code: str) -> tuple[SubtitleTrack, str]:
+    with YoutubeDL(_ydl_options()) as ydl:
+        info = _extract_video_info(ydl, video_id)
+        tracks = _tracks_from_info(info)
+        _remember_tracks(video_id, tracks)
+        track = _choose_preferred_track(tracks, video_id, language_code)
+        subtitle_text = _read_track_body(ydl, info, video_id, track)
+    _remember_body(video_id, track, subtitle_text)
+    return track, subtitle_text
+
+
+def _cached_preferred_track_text(
+    video_id: str,
+    language_code: str,
+    allow_stale: bool,
+) -> tuple[SubtitleTrack, str] | None:
+    tracks = _cached_tracks(video_id, allow_stale)
+    if tracks is None:
+        return None
+    track = _choose_preferred_track(tracks, video_id, language_code)
+    subtitle_text = _cached_body(video_id, track, allow_stale)
+    if subtitle_text is None:
+        return None
+    return track, subtitle_text
+
+
+def fetch_subtitle_segments(
+    video_id: str,
+    language_code: str,
+    offline: bool = False,
+) -> tuple[list[SubtitleCue], SubtitleTrack]:
+    with stage("fetch") as fetch_counters:
+        cached = _cached_preferred_track_text(video_id, language_code, allow_stale=offline)
+        if cached is not None:
+            fetch_counters["cache_hits"] = 1
+            track, subtitle_text = cached
+        elif offline:
+            raise _offline_miss(video_id, f"The '{language_code}' subtitle track")
+        else:
+            try:
+                track, subtitle_text = _fetch_preferred_track_text(video_id, language_code)
+            except RuntimeError as exc:
+                stale = _cached_preferred_track_text(video_id, language_code, allow_stale=True)
+                if stale is None:
+                    raise
+                print(f"Using stale cached subtitles for video '{video_id}': {exc}")
+                track, subtitle_text = stale
+
+    with stage("parse") as parse_counters:
+        segments = parse_vtt_segments(subtitle_text)
+        parse_counters["cues"] = len(segments)
     if not segments:
         raise RuntimeError(
-            f"yt-dlp downloaded subtitle file '{subtitle_file_name}' for video '{video_id}', but it contained no parseable cues."
+            f"yt-dlp downloaded subtitle track '{track.language_code}' for video '{video_id}', but it contained no parseable cues."
         )
     return segments, track
 
 
-def download_subtitle_track(video_id: str, track: SubtitleTrack) -> tuple[str, str]:
-    return _download_track_text(video_id, track)
+def _stale_track_bodies(
+    video_id: str,
+    select: Callable[[list[SubtitleTrack]], list[SubtitleTrack]],
+    bodies: dict[SubtitleTrack, str],
+    errors: dict[SubtitleTrack, str],
+    exc: RuntimeError,
+) -> None:
+    tracks = _cached_tracks(video_id, allow_stale=True)
+    if tracks is None:
+        raise exc
+    print(f"Using stale cached subtitle track list for video '{video_id}': {exc}")
+    for track in select(tracks):
+        if track in bodies:
+            continue
+        text = _cached_body(video_id, track, allow_stale=True)
+        if text is None:
+            errors[track] = str(exc)
+        else:
+            bodies[track] = text
+
+
+def fetch_subtitle_tracks(
+    video_id: str,
+    select: Callable[[list[SubtitleTrack]], list[SubtitleTrack]],
+    offline: bool = False,
+) -> tuple[dict[SubtitleTrack, str], dict[SubtitleTrack, str]]:
+    # Bodies of every track chosen by `select`, from the cache where possible and otherwise from
+    # a single yt-dlp extraction whose resolved subtitle URLs are all read with the same session.
+    # Returns the bodies and, separately, an error message for each track that could not be fetched.
+    bodies: dict[SubtitleTrack, str] = {}
+    errors: dict[SubtitleTrack, str] = {}
+    tracks = _cached_tracks(video_id, allow_stale=offline)
+    if tracks is not None:
+        missing = []
+        for track in select(tracks):
+            text = _cached_body(video_id, track, allow_stale=offline)
+            if text is None:
+                missing.append(track)
+            else:
+                bodies[track] = text
+        count("fetch", video_id, cache_hits=len(bodies))
+        if not missing:
+            return bodies, errors
+        if offline:
+            for track in missing:
+                errors[track] = str(_offline_miss(video_id, f"The '{track.language_code}' subtitle track"))
+            return bodies, errors
+    elif offline:
+        raise _offline_miss(video_id, "The subtitle track list")
+
+    try:
+        with YoutubeDL(_ydl_options()) as ydl:
+            info = _extract_video_info(ydl, video_id)
+            tracks = _tracks_from_info(info)
+            _remember_tracks(video_id, tracks)
+            for track in select(tracks):
+                if track in bodies:
+                    continue
+                try:
+                    text = _read_track_body(ydl, info, video_id, track)
+                except RuntimeError as exc:
+                    stale_text = _cached_body(video_id, track, allow_stale=True)
+                    if stale_text is None:
+                        errors[track] = str(exc)
+                        continue
+                    print(f"Using stale cached subtitle '{track.language_code}' for video '{video_id}': {exc}")
+                    text = stale_text
+                else:
+                    _remember_body(video_id, track, text)
+                bodies[track] = text
+    except RuntimeError as exc:
+        _stale_track_bodies(video_id, select, bodies, errors, exc)
+    return bodies, errors
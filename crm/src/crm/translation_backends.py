@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Protocol
+
+from crm.course_index import CourseDefinition
+from crm.env import get_required_env_var
+from crm.settings import ARGOS_BACKEND, OPENAI_BACKEND, OPENAI_COMPATIBLE_BACKEND, TRANSLATION_BACKENDS
+
+# The SDKs are imported where they are used, so the CLI can list backend names without them.
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncOpenAI, OpenAI
+    from pydantic import BaseModel
+
+    from crm.rate_limit import RequestScheduler
+
+DEFAULT_OPENAI_MODEL = "gpt-5.4-mini"
+DEFAULT_API_KEY_ENV = "OPENAI_API_KEY"
+# Local servers usually ignore the key, but the SDK refuses to send a request without one.
+UNUSED_API_KEY = "not-needed"
+
+# How a failed translation request is handled: rate limits and transient errors are retried
+# with backoff, shape mismatches are retried and then split, anything else is given up on.
+RATE_LIMITED = "rate-limited"
+TRANSIENT = "transient"
+SHAPE_MISMATCH = "shape-mismatch"
+PERMANENT = "permanent"
+RETRYABLE_STATUS_CODES = (408, 409)
+
+# course.json "translation" keys and the settings fields they map to.
+COURSE_SETTING_KEYS = {
+    "backend": "name",
+    "model": "model",
+    "baseUrl": "base_url",
+    "apiKeyEnv": "api_key_env",
+    "timeoutSeconds": "timeout_seconds",
+    "connectTimeoutSeconds": "connect_timeout_seconds",
+    "maxConnections": "max_connections",
+    "keepaliveConnections": "keepalive_connections",
+    "keepaliveSeconds": "keepalive_seconds",
+    "maxRetries": "max_retries",
+    "requestsPerMinute": "requests_per_minute",
+    "tokensPerMinute": "tokens_per_minute",
+    "maxAttempts": "max_attempts",
+    "backoffSeconds": "backoff_seconds",
+    "maxBackoffSeconds": "max_backoff_seconds",
+    "breakerFailures": "breaker_failures",
+    "breakerCooldownSeconds": "breaker_cooldown_seconds",
+}
+
+
+@dataclass(frozen=True)
+class BackendSettings:
+    name: str = OPENAI_BACKEND
+    model: str | None = None
+    base_url: str | None = None
+    api_key_env: str | None = None
+    timeout_seconds: float = 120.0
+    connect_timeout_seconds: float = 10.0
+    max_connections: int = 16
+    keepalive_connections: int = 8
+    keepalive_seconds: float = 30.0
+    # The SDK's own retries would bypass the shared scheduler, so crm retries instead.
+    max_retries: int = 0
+    requests_per_minute: float = 0.0
+    tokens_per_minute: float = 0.0
+    max_attempts: int = 5
+    backoff_seconds: float = 1.0
+    max_backoff_seconds: float = 60.0
+    breaker_failures: int = 5
+    breaker_cooldown_seconds: float = 30.0
+
+    def timeout(self) -> httpx.Timeout:
+        import httpx
+
+        return httpx.Timeout(self.timeout_seconds, connect=self.connect_timeout_seconds)
+
+    def limits(self) -> httpx.Limits:
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.keepalive_connections,
+            keepalive_expiry=self.keepalive_seconds,
+        )
+
+    def scheduler(self) -> RequestScheduler:
+        from crm.rate_limit import CircuitBreaker, RequestScheduler, RetryPolicy
+
+        return RequestScheduler(
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            retry_policy=RetryPolicy(
+                max_attempts=self.max_attempts,
+                base_delay_seconds=self.backoff_seconds,
+                max_delay_seconds=self.max_backoff_seconds,
+            ),
+            breaker=CircuitBreaker(self.breaker_failures, self.breaker_cooldown_seconds),
+        )
+
+
+def load_backend_settings(course: CourseDefinition, **overrides: Any) -> BackendSettings:
+    # Defaults, then the course's optional "translation" block, then non-None CLI overrides.
+    unknown_keys = sorted(set(course.translation) - set(COURSE_SETTING_KEYS))
+    if unknown_keys:
+        raise ValueError(
+            f"Unknown translation setting(s) {', '.join(unknown_keys)} in course '{course.language_code}'. "
+            f"Known settings: {', '.join(COURSE_SETTING_KEYS)}."
+        )
+    values = {COURSE_SETTING_KEYS[key]: value for key, value in course.translation.items()}
+    known_fields = {settings_field.name for settings_field in fields(BackendSettings)}
+    values.update({name: value for name, value in overrides.items() if name in known_fields and value is not None})
+    settings = BackendSettings(**values)
+
+    if settings.name not in TRANSLATION_BACKENDS:
+        raise ValueError(
+            f"Unknown translation backend '{settings.name}'. Known backends: {', '.join(TRANSLATION_BACKENDS)}."
+        )
+    if settings.name == OPENAI_COMPATIBLE_BACKEND and not (settings.base_url and settings.model):
+        raise ValueError(f"The '{OPENAI_COMPATIBLE_BACKEND}' backend needs both a base URL and a model name.")
+    return settings
+
+
+def model_backend_settings(settings: BackendSettings) -> BackendSettings:
+    # Argos translates words without context; anything it cannot translate goes to OpenAI,
+    # using the same connection settings.
+    if settings.name == ARGOS_BACKEND:
+        return replace(settings, name=OPENAI_BACKEND, model=None, base_url=None)
+    return settings
+
+
+class OutputShapeError(RuntimeError):
+    pass
+
+
+def classify_failure(exc: Exception) -> str:
+    import httpx
+    from openai import (
+        APIConnectionError,
+        APIStatusError,
+        APITimeoutError,
+        ContentFilterFinishReasonError,
+        LengthFinishReasonError,
+        RateLimitError,
+    )
+    from pydantic import ValidationError
+
+    if isinstance(exc, (OutputShapeError, LengthFinishReasonError, ValidationError)):
+        return SHAPE_MISMATCH
+    if isinstance(exc, ContentFilterFinishReasonError):
+        return PERMANENT
+    if isinstance(exc, RateLimitError):
+        # An exhausted quota answers 429 as well, but waiting does not help.
+        return PERMANENT if getattr(exc, "code", None) == "insufficient_quota" else RATE_LIMITED
+    if isinstance(exc, APIStatusError):
+        if exc.status_code in RETRYABLE_STATUS_CODES or exc.status_code >= 500:
+            return TRANSIENT
+        return PERMANENT
+    if isinstance(exc, (APITimeoutError, APIConnectionError, httpx.TransportError)):
+        return TRANSIENT
+    # Anything else is most likely a bug on this side; retrying it would only stall every
+    # worker behind the shared scheduler and trip the breaker.
+    return PERMANENT
+
+
+def failure_retry_after(exc: Exception) -> float | None:
+    from crm.rate_limit import retry_after_seconds
+
+    response = getattr(exc, "response", None)
+    return retry_after_seconds(getattr(response, "headers", None))
+
+
+@dataclass(frozen=True)
+class StructuredResponse:
+    # Token counts are None when the server reports no usage, as many OpenAI-compatible servers
+    # do; the scheduler then keeps its estimate instead of refunding the reservation.
+    output_parsed: BaseModel | None
+    input_tokens: int | None
+    output_tokens: int | None
+
+    @property
+    def used_tokens(self) -> int | None:
+        if self.input_tokens is None or self.output_tokens is None:
+            return None
+        return self.input_tokens + self.output_tokens
+
+
+def _usage_tokens(usage: Any, name: str) -> int | None:
+    value = getattr(usage, name, None)
+    return value if isinstance(value, int) else None
+
+
+class ModelBackend(Protocol):
+    name: str
+    model: str
+    scheduler: RequestScheduler
+
+    @property
+    def model_key(self) -> str: ...
+
+    def parse(self, messages: list[dict[str, str]], text_format: type[BaseModel]) -> StructuredResponse: ...
+
+    def async_client(self) -> AsyncOpenAI: ...
+
+    async def parse_async(
+        self,
+        client: AsyncOpenAI,
+        messages: list[dict[str, str]],
+        text_format: type[BaseModel],
+    ) -> StructuredResponse: ...
+
+
+class OpenAITranslationBackend:
+    # Structured outputs through the Responses API. The sync client and its connection pool are
+    # shared by every thread; async clients are bound to one event loop, so each asyncio run
+    # opens its own with the same pool limits.
+    name = OPENAI_BACKEND
+
+    def __init__(self, settings: BackendSettings, client: OpenAI | None = None):
+        self.settings = settings
+        self.model = settings.model or DEFAULT_OPENAI_MODEL
+        self.scheduler = settings.scheduler()
+        self._client = client
+        self._lock = threading.Lock()
+
+    @property
+    def model_key(self) -> str:
+        return self.model
+
+    def _api_key(self) -> str:
+        return get_required_env_var(self.settings.api_key_env or DEFAULT_API_KEY_ENV)
+
+    def _client_options(self) -> dict[str, Any]:
+        return {
+            "api_key": self._api_key(),
+            "base_url": self.settings.base_url,
+            "timeout": self.settings.timeout(),
+            "max_retries": self.settings.max_retries,
+        }
+
+    def client(self) -> OpenAI:
+        from openai import DefaultHttpxClient, OpenAI
+
+        with self._lock:
+            if self._client is None:
+                self._client = OpenAI(
+                    **self._client_options(),
+                    http_client=DefaultHttpxClient(limits=self.settings.limits(), timeout=self.settings.timeout()),
+                )
+            return self._client
+
+    def async_client(self) -> AsyncOpenAI:
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        return AsyncOpenAI(
+            **self._client_options(),
+            http_client=DefaultAsyncHttpxClient(limits=self.settings.limits(), timeout=self.settings.timeout()),
+        )
+
+    def _from_response(self, response: Any) -> StructuredResponse:
+        usage = getattr(response, "usage", None)
+        return StructuredResponse(
+            output_parsed=response.output_parsed,
+            input_tokens=_usage_tokens(usage, "input_tokens"),
+            output_tokens=_usage_tokens(usage, "output_tokens"),
+        )
+
+    def parse(self, messages: list[dict[str, str]], text_format: type[BaseModel]) -> StructuredResponse:
+        response = self.client().responses.parse(model=self.model, input=messages, text_format=text_format)
+        return self._from_response(response)
+
+    async def parse_async(
+        self,
+        client: AsyncOpenAI,
+        messages: list[dict[str, str]],
+        text_format: type[BaseModel],
+    ) -> StructuredResponse:
+        response = await client.responses.parse(model=self.model, input=messages, text_format=text_format)
+        return self._from_response(response)
+
+
+class OpenAICompatibleTranslationBackend(OpenAITranslationBackend):
+    # Any server speaking the OpenAI Chat Completions API with JSON schema response formats
+    # (llama.cpp server, vLLM, Ollama, ...). Most of them do not implement the Responses API.
+    name = OPENAI_COMPATIBLE_BACKEND
+
+    @property
+    def model_key(self) -> str:
+        # The same model name on two servers can be different weights or quantizations.
+        return f"{self.model}@{self.settings.base_url}"
+
+    def _api_key(self) -> str:
+        if self.settings.api_key_env is None:
+            return UNUSED_API_KEY
+        return get_required_env_var(self.settings.api_key_env)
+
+    def _chat_messages(self, messages: list[dict[str, str]]) -> list[dict[str, str]]:
+        return [
+            {**message, "role": "system"} if message["role"] == "developer" else message
+            for message in messages
+        ]
+
+    def _from_completion(self, completion: Any) -> StructuredResponse:
+        usage = getattr(completion, "usage", None)
+        return StructuredResponse(
+            output_parsed=completion.choices[0].message.parsed if completion.choices else None,
+            input_tokens=_usage_tokens(usage, "prompt_tokens"),
+            output_tokens=_usage_tokens(usage, "completion_tokens"),
+        )
+
+    def parse(self, messages: list[dict[str, str]], text_format: type[BaseModel]) -> StructuredResponse:
+        completion = self.client().chat.completions.parse(
+            model=self.model,
+            messages=self._chat_messages(messages),
+            response_format=text_format,
+        )
+        return self._from_completion(completion)
+
+    async def parse_async(
+        self,
+        client: AsyncOpenAI,
+        messages: list[dict[str, str]],
+        text_format: type[BaseModel],
+    ) -> StructuredResponse:
+        completion = await client.chat.completions.parse(
+            model=self.model,
+            messages=self._chat_messages(messages),
+            response_format=text_format,
+        )
+        return self._from_completion(completion)
+
+
+@lru_cache(maxsize=None)
+def get_model_backend(settings: BackendSettings) -> ModelBackend:
+    settings = model_backend_settings(settings)
+    if settings.name == OPENAI_COMPATIBLE_BACKEND:
+        return OpenAICompatibleTranslationBackend(settings)
+    return OpenAITranslationBackend(settings)
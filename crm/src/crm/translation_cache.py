@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from crm.paths import TRANSLATION_CACHE_FILE
+from crm.word_normalization import canonical_word
+
+TRANSLATION_CACHE_MAX_ENTRIES = 500_000
+TRANSLATION_CACHE_EVICTION_RATIO = 0.1
+NO_CONTEXT_FINGERPRINT = "-"
+
+CONTEXT_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class TranslationCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+def normalize_cache_word(word: str) -> str:
+    return canonical_word(word.strip())
+
+
+def context_fingerprint(context: str) -> str:
+    # Only the word sequence counts, so contexts that differ in spacing, case or punctuation share entries.
+    tokens = CONTEXT_TOKEN_RE.findall(unicodedata.normalize("NFC", context).casefold())
+    if not tokens:
+        return NO_CONTEXT_FINGERPRINT
+    return hashlib.sha1(" ".join(tokens).encode("utf-8")).hexdigest()[:20]
+
+
+class TranslationCache:
+    def __init__(self, path: Path, max_entries: int = TRANSLATION_CACHE_MAX_ENTRIES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.stats = TranslationCacheStats()
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS translations (
+                source_language TEXT NOT NULL,
+                word TEXT NOT NULL,
+                model TEXT NOT NULL,
+                context TEXT NOT NULL,
+                meaning TEXT NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (source_language, word, model, context)
+            ) WITHOUT ROWID
+            """
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)"
+        )
+        self._connection.commit()
+        self._entry_count = self._count_entries()
+
+    @property
+    def entry_count(self) -> int:
+        return self._entry_count
+
+    def _count_entries(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def lookup(self, source_language: str, model: str, context: str, words: list[str]) -> dict[str, str]:
+        keys = sorted({normalize_cache_word(word) for word in words})
+        if not keys:
+            return {}
+
+        found: dict[str, str] = {}
+        with self._lock:
+            for offset in range(0, len(keys), 500):
+                chunk = keys[offset:offset + 500]
+                placeholders = ",".join("?" for _ in chunk)
+                rows = self._connection.execute(
+                    f"SELECT word, meaning FROM translations "
+                    f"WHERE source_language = ? AND model = ? AND context = ? AND word IN ({placeholders})",
+                    (source_language, model, context, *chunk),
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = time.time()
+                self._connection.executemany(
+                    "UPDATE translations SET last_used = ? "
+                    "WHERE source_language = ? AND word = ? AND model = ? AND context = ?",
+                    [(now, source_language, word, model, context) for word in found],
+                )
+                self._connection.commit()
+
+            self.stats.hits += len(found)
+            self.stats.misses += len(keys) - len(found)
+        return found
+
+    def store(self, source_language: str, model: str, context: str, meanings: dict[str, str]) -> None:
+        if not meanings:
+            return
+
+        now = time.time()
+        rows = [
+            (source_language, normalize_cache_word(word), model, context, meaning, now)
+            for word, meaning in meanings.items()
+        ]
+        with self._lock:
+            self._connection.executemany(
+                "INSERT INTO translations (source_language, word, model, context, meaning, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT DO UPDATE SET meaning = excluded.meaning, last_used = excluded.last_used",
+                rows,
+            )
+            self._connection.commit()
+            self.stats.stores += len(rows)
+            self._entry_count += len(rows)
+            if self._entry_count > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        self._entry_count = self._count_entries()
+        if self._entry_count <= self.max_entries:
+            return
+
+        keep = int(self.max_entries * (1 - TRANSLATION_CACHE_EVICTION_RATIO))
+        surplus = self._entry_count - keep
+        self._connection.execute(
+            "DELETE FROM translations WHERE (source_language, word, model, context) IN ("
+            "SELECT source_language, word, model, context FROM translations "
+            "ORDER BY last_used LIMIT ?)",
+            (surplus,),
+        )
+        self._connection.commit()
+        self.stats.evictions += surplus
+        self._entry_count = keep
+
+    def describe_stats(self) -> str:
+        lookups = self.stats.hits + self.stats.misses
+        hit_rate = (self.stats.hits / lookups * 100) if lookups else 0.0
+        return (
+            f"Translation cache: {self.stats.hits} hits, {self.stats.misses} misses ({hit_rate:.1f}% hit rate), "
+            f"{self.stats.stores} stored, {self.stats.evictions} evicted, {self._entry_count} entries in {self.path}"
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+@lru_cache(maxsize=1)
+def get_translation_cache() -> TranslationCache:
+    return TranslationCache(TRANSLATION_CACHE_FILE)
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import gzip
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+
+import brotli
+
+from crm.settings import (
+    CHUNKED_FORMAT,
+    COMPACT_FORMAT,
+    DEFAULT_CHUNK_SECONDS,
+    LEGACY_FORMAT,
+    VIDEO_DATA_FORMATS,
+)
+
+COMPACT_FORMAT_VERSION = 1
+CHUNKED_FORMAT_VERSION = 1
+PRECOMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+class VideoSnippet(Protocol):
+    start: float
+    duration: float
+
+
+class VideoWord(Protocol):
+    word: str
+    meaning: str
+
+
+@dataclass(frozen=True)
+class StoredWord:
+    word: str
+    meaning: str
+
+
+@dataclass(frozen=True)
+class StoredSnippet:
+    start: float
+    duration: float
+    words: tuple[StoredWord, ...]
+
+
+def video_data_file(output_dir: Path, video_id: str) -> Path:
+    return output_dir / f"{video_id}.json"
+
+
+def video_chunk_dir(output_file: Path) -> Path:
+    return output_file.with_suffix("")
+
+
+def video_chunk_file(output_file: Path, chunk_index: int) -> Path:
+    return video_chunk_dir(output_file) / f"{chunk_index}.json"
+
+
+def video_data_layout(data_format: str, chunk_seconds: float = DEFAULT_CHUNK_SECONDS) -> str:
+    # What the manifest compares to decide whether a file must be rewritten in another layout.
+    return f"{CHUNKED_FORMAT}/{chunk_seconds:g}" if data_format == CHUNKED_FORMAT else data_format
+
+
+def _to_milliseconds(seconds: float) -> int:
+    return round(seconds * 1000)
+
+
+def build_legacy_video_data(
+    snippets: Sequence[VideoSnippet],
+    translations: Sequence[Sequence[VideoWord]],
+) -> dict[str, Any]:
+    return {
+        "snippets": [
+            {
+                "start": snippet.start,
+                "duration": snippet.duration,
+                "words": [
+                    {
+                        "native": word_entry.word,
+                        "translation": word_entry.meaning,
+                    }
+                    for word_entry in translated_words
+                ],
+            }
+            for snippet, translated_words in zip(snippets, translations)
+        ]
+    }
+
+
+def build_compact_video_data(
+    snippets: Sequence[VideoSnippet],
+    translations: Sequence[Sequence[VideoWord]],
+) -> dict[str, Any]:
+    # Every distinct (native, translation) pair is stored once in the word table, in order of
+    # first appearance; snippets refer to it by index and carry times as integer milliseconds.
+    word_indexes: dict[tuple[str, str], int] = {}
+    natives: list[str] = []
+    word_translations: list[str] = []
+    starts: list[int] = []
+    durations: list[int] = []
+    snippet_words: list[list[int]] = []
+
+    for snippet, translated_words in zip(snippets, translations):
+        indexes: list[int] = []
+        for word_entry in translated_words:
+            key = (word_entry.word, word_entry.meaning)
+            index = word_indexes.get(key)
+            if index is None:
+                index = word_indexes[key] = len(natives)
+                natives.append(word_entry.word)
+                word_translations.append(word_entry.meaning)
+            indexes.append(index)
+        starts.append(_to_milliseconds(snippet.start))
+        durations.append(_to_milliseconds(snippet.duration))
+        snippet_words.append(indexes)
+
+    return {
+        "format": COMPACT_FORMAT,
+        "version": COMPACT_FORMAT_VERSION,
+        "words": {"native": natives, "translation": word_translations},
+        "snippets": {"start_ms": starts, "duration_ms": durations, "words": snippet_words},
+    }
+
+
+def _write_atomic(path: Path, payload: bytes) -> None:
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_bytes(payload)
+    temp_path.replace(path)
+
+
+def _remove_precompressed(output_file: Path) -> None:
+    for suffix in PRECOMPRESSED_SUFFIXES:
+        output_file.with_name(output_file.name + suffix).unlink(missing_ok=True)
+
+
+def _remove_chunks(output_file: Path, keep: int = 0) -> None:
+    chunk_dir = video_chunk_dir(output_file)
+    if not chunk_dir.is_dir():
+        return
+    for path in chunk_dir.iterdir():
+        chunk_index = path.name.split(".", 1)[0]
+        if not chunk_index.isdigit() or int(chunk_index) >= keep:
+            path.unlink()
+    if keep == 0:
+        chunk_dir.rmdir()
+
+
+def _write_precompressed(output_file: Path, data: dict[str, Any]) -> int:
+    payload = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    # Siblings are written first so a server never pairs a new JSON file with stale precompressed copies.
+    _write_atomic(output_file.with_name(output_file.name + ".gz"), gzip.compress(payload, compresslevel=9, mtime=0))
+    _write_atomic(output_file.with_name(output_file.name + ".br"), brotli.compress(payload, mode=brotli.MODE_TEXT))
+    _write_atomic(output_file, payload)
+    return len(payload)
+
+
+def chunk_boundaries(snippets: Sequence[VideoSnippet], chunk_seconds: float = DEFAULT_CHUNK_SECONDS) -> list[int]:
+    # Index of the first snippet of every chunk. A chunk covers a fixed window of start times;
+    # windows without snippets get no chunk, so long silences do not produce empty files.
+    if chunk_seconds <= 0:
+        raise ValueError("The chunk duration must be positive.")
+    boundaries: list[int] = []
+    window = -1
+    for index, snippet in enumerate(snippets):
+        snippet_window = int(snippet.start // chunk_seconds)
+        if snippet_window < window:
+            raise ValueError("Snippets must be sorted by start time to be split into chunks.")
+        if snippet_window != window:
+            boundaries.append(index)
+            window = snippet_window
+    return boundaries
+
+
+def _write_chunked_video_data(
+    output_file: Path,
+    snippets: Sequence[VideoSnippet],
+    translations: Sequence[Sequence[VideoWord]],
+    chunk_seconds: float,
+) -> None:
+    # Each chunk is a compact file of its own, so the player can fetch the one it is about to
+    # play. The index at the usual path holds every snippet start for a binary search, plus each
+    # chunk's start, first snippet and size. Both lookups binary-search the starts, so snippets
+    # are written in start order even when the captions overlap or arrive out of order.
+    order = sorted(range(len(snippets)), key=lambda index: snippets[index].start)
+    snippets = [snippets[index] for index in order]
+    translations = [translations[index] for index in order]
+    boundaries = chunk_boundaries(snippets, chunk_seconds)
+    video_chunk_dir(output_file).mkdir(parents=True, exist_ok=True)
+    chunk_bytes = []
+    for chunk_index, (first, end) in enumerate(zip(boundaries, [*boundaries[1:], len(snippets)])):
+        chunk_bytes.append(
+            _write_precompressed(
+                video_chunk_file(output_file, chunk_index),
+                build_compact_video_data(snippets[first:end], translations[first:end]),
+            )
+        )
+
+    starts = [_to_milliseconds(snippet.start) for snippet in snippets]
+    _write_precompressed(
+        output_file,
+        {
+            "format": CHUNKED_FORMAT,
+            "version": CHUNKED_FORMAT_VERSION,
+            "chunk_ms": _to_milliseconds(chunk_seconds),
+            "start_ms": starts,
+            "chunks": {
+                "start_ms": [starts[first] for first in boundaries],
+                "first_snippet": boundaries,
+                "bytes": chunk_bytes,
+            },
+        },
+    )
+    _remove_chunks(output_file, keep=len(boundaries))
+
+
+def write_video_data(
+    output_file: Path,
+    snippets: Sequence[VideoSnippet],
+    translations: Sequence[Sequence[VideoWord]],
+    data_format: str = LEGACY_FORMAT,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+) -> None:
+    if data_format not in VIDEO_DATA_FORMATS:
+        raise ValueError(f"Unknown video data format '{data_format}'.")
+    if data_format == CHUNKED_FORMAT:
+        _write_chunked_video_data(output_file, snippets, translations, chunk_seconds)
+        return
+
+    _remove_chunks(output_file)
+    if data_format == LEGACY_FORMAT:
+        _remove_precompressed(output_file)
+        with output_file.open("w", encoding="utf-8") as handle:
+            json.dump(build_legacy_video_data(snippets, translations), handle, ensure_ascii=False, indent=4)
+        return
+    _write_precompressed(output_file, build_compact_video_data(snippets, translations))
+
+
+def stored_video_data_bytes(output_file: Path) -> int:
+    # The JSON a client may download for one video: the file itself plus any chunk files.
+    chunk_dir = video_chunk_dir(output_file)
+    chunk_files = list(chunk_dir.glob("*.json")) if chunk_dir.is_dir() else []
+    return sum(path.stat().st_size for path in [output_file, *chunk_files] if path.exists())
+
+
+def _read_json(path: Path) -> Any:
+    with path.open("r", encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _read_compact(data: dict[str, Any]) -> list[StoredSnippet]:
+    table = [StoredWord(word, meaning) for word, meaning in zip(data["words"]["native"], data["words"]["translation"])]
+    columns = data["snippets"]
+    return [
+        StoredSnippet(
+            start=start_ms / 1000,
+            duration=duration_ms / 1000,
+            words=tuple(table[index] for index in indexes),
+        )
+        for start_ms, duration_ms, indexes in zip(columns["start_ms"], columns["duration_ms"], columns["words"])
+    ]
+
+
+def read_video_data(path: Path) -> list[StoredSnippet]:
+    data = _read_json(path)
+
+    if data.get("format") == CHUNKED_FORMAT:
+        return [
+            snippet
+            for chunk_index in range(len(data["chunks"]["first_snippet"]))
+            for snippet in _read_compact(_read_json(video_chunk_file(path, chunk_index)))
+        ]
+    if data.get("format") == COMPACT_FORMAT:
+        return _read_compact(data)
+
+    return [
+        StoredSnippet(
+            start=snippet["start"],
+            duration=snippet["duration"],
+            words=tuple(StoredWord(word["native"], word["translation"]) for word in snippet["words"]),
+        )
+        for snippet in data["snippets"]
+    ]
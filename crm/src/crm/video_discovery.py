@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+from crm.course_index import CourseDefinition
+from crm.paths import CRM_CACHE_ROOT, CRM_WORK_ROOT, course_work_dir
+from crm.settings import DEFAULT_DAILY_QUOTA
+
+# YouTube Data API v3 quota costs and the default daily allowance of a project.
+SEARCH_LIST_COST = 100
+VIDEOS_LIST_COST = 1
+# Daily quota resets at midnight Pacific time.
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+QUOTA_LEDGER_FILE = CRM_WORK_ROOT / "youtube_quota.json"
+SEARCH_CACHE_ROOT = CRM_CACHE_ROOT / "youtube_search"
+SEARCH_CACHE_TTL_SECONDS = 7 * 24 * 3600
+# Unexplored strategies are scored as if they had spent one search page and accepted one video.
+STRATEGY_PRIOR_ACCEPTED = 1
+STRATEGY_PRIOR_UNITS = SEARCH_LIST_COST + VIDEOS_LIST_COST
+
+SCRIPT_RANGES = {
+    "Arabic": "\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF",
+    "Cyrillic": "\u0400-\u04FF\u0500-\u052F",
+    "Devanagari": "\u0900-\u097F",
+    "Greek": "\u0370-\u03FF",
+    "Hangul": "\u1100-\u11FF\u3130-\u318F\uAC00-\uD7AF",
+    "Han": "\u4E00-\u9FFF\u3400-\u4DBF",
+    "Hebrew": "\u0590-\u05FF",
+    "Kana": "\u3040-\u309F\u30A0-\u30FF",
+    "Thai": "\u0E00-\u0E7F",
+}
+DEFAULT_SCRIPTS = {
+    "ar": ("Arabic",),
+    "el": ("Greek",),
+    "he": ("Hebrew",),
+    "hi": ("Devanagari",),
+    "ja": ("Kana", "Han"),
+    "ko": ("Hangul",),
+    "ru": ("Cyrillic",),
+    "th": ("Thai",),
+    "uk": ("Cyrillic",),
+    "zh": ("Han",),
+}
+
+
+@dataclass(frozen=True)
+class DiscoverySettings:
+    subtitle_language: str
+    regions: tuple[str | None, ...]
+    queries: tuple[str, ...]
+    scripts: tuple[str, ...]
+
+    @property
+    def title_pattern(self) -> re.Pattern[str] | None:
+        if not self.scripts:
+            return None
+        return re.compile(f"[{''.join(SCRIPT_RANGES[script] for script in self.scripts)}]")
+
+
+def load_discovery_settings(course: CourseDefinition) -> DiscoverySettings:
+    # Optional "discovery" block in course.json: {"regions": [...], "queries": [...], "scripts": [...]}.
+    discovery = course.discovery
+    language = course.subtitle_language.split("-")[0].lower()
+    scripts = tuple(discovery.get("scripts", DEFAULT_SCRIPTS.get(language, ())))
+    unknown_scripts = [script for script in scripts if script not in SCRIPT_RANGES]
+    if unknown_scripts:
+        raise ValueError(
+            f"Unknown script(s) {', '.join(unknown_scripts)} in course '{course.language_code}'. "
+            f"Known scripts: {', '.join(sorted(SCRIPT_RANGES))}."
+        )
+    return DiscoverySettings(
+        subtitle_language=language,
+        regions=tuple(discovery.get("regions") or [None]),
+        queries=tuple(discovery.get("queries") or [""]),
+        scripts=scripts,
+    )
+
+
+def discovery_work_dir(language_code: str) -> Path:
+    return course_work_dir(language_code) / "discovery"
+
+
+def _quota_day() -> str:
+    return datetime.now(QUOTA_TIMEZONE).date().isoformat()
+
+
+class QuotaLedger:
+    # Units spent today across all courses (the quota belongs to the API key), plus the units
+    # spent by this run, checked against the daily allowance and the run budget.
+    def __init__(self, path: Path, daily_limit: int = DEFAULT_DAILY_QUOTA, run_budget: int | None = None):
+        self.path = path
+        self.daily_limit = daily_limit
+        self.run_budget = run_budget
+        self.run_units = 0
+        self.day = _quota_day()
+        self.day_units = 0
+        self.exhausted = False
+        if path.exists():
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            if data.get("day") == self.day:
+                self.day_units = data.get("units", 0)
+                self.exhausted = data.get("exhausted", False)
+
+    def remaining(self) -> int:
+        self._roll_over()
+        if self.exhausted:
+            return 0
+        remaining = self.daily_limit - self.day_units
+        if self.run_budget is not None:
+            remaining = min(remaining, self.run_budget - self.run_units)
+        return max(0, remaining)
+
+    def can_spend(self, units: int) -> bool:
+        return units <= self.remaining()
+
+    def spend(self, units: int) -> None:
+        self._roll_over()
+        self.day_units += units
+        self.run_units += units
+        self._save()
+
+    def mark_exhausted(self) -> None:
+        # The API has said the key's quota is gone, whatever this ledger counted, so no run
+        # tries again before the quota day rolls over.
+        self._roll_over()
+        self.exhausted = True
+        self._save()
+
+    def _roll_over(self) -> None:
+        today = _quota_day()
+        if today != self.day:
+            self.day, self.day_units, self.exhausted = today, 0, False
+
+    def _save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"day": self.day, "units": self.day_units, "exhausted": self.exhausted}, handle)
+        temp_path.replace(self.path)
+
+
+class SearchPageCache:
+    def __init__(self, root: Path = SEARCH_CACHE_ROOT, ttl_seconds: float = SEARCH_CACHE_TTL_SECONDS):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+
+    def _path(self, params: dict[str, Any]) -> Path:
+        key = hashlib.sha1(json.dumps(params, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json"
+
+    def get(self, params: dict[str, Any]) -> dict[str, Any] | None:
+        path = self._path(params)
+        if not path.exists():
+            return None
+        with path.open("r", encoding="utf-8") as handle:
+            entry = json.load(handle)
+        if time.time() - entry["fetched_at"] >= self.ttl_seconds:
+            return None
+        return entry["page"]
+
+    def put(self, params: dict[str, Any], page: dict[str, Any]) -> None:
+        path = self._path(params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            json.dump({"params": params, "fetched_at": time.time(), "page": page}, handle, ensure_ascii=False)
+        temp_path.replace(path)
+
+
+@dataclass
+class SearchStrategy:
+    query: str
+    region: str | None
+    next_page_token: str | None = None
+    pages: int = 0
+    units: int = 0
+    accepted: int = 0
+    consecutive_empty: int = 0
+    exhausted: bool = False
+
+    @property
+    def key(self) -> str:
+        return f"{self.region or '*'}:{self.query}"
+
+    def score(self) -> float:
+        return (self.accepted + STRATEGY_PRIOR_ACCEPTED) / (self.units + STRATEGY_PRIOR_UNITS)
+
+
+@dataclass
+class StrategyBook:
+    strategies: list[SearchStrategy] = field(default_factory=list)
+
+    def pick(self) -> SearchStrategy | None:
+        # Highest accepted-per-unit first; strategies that ran out of pages rest until all have.
+        available = [strategy for strategy in self.strategies if not strategy.exhausted]
+        if not available:
+            if not self.strategies:
+                return None
+            for strategy in self.strategies:
+                strategy.exhausted = False
+            available = self.strategies
+        return max(available, key=lambda strategy: strategy.score())
+
+
+def load_strategy_book(path: Path, settings: DiscoverySettings) -> StrategyBook:
+    saved: dict[str, SearchStrategy] = {}
+    if path.exists():
+        with path.open("r", encoding="utf-8") as handle:
+            for data in json.load(handle).get("strategies", []):
+                strategy = SearchStrategy(**data)
+                saved[strategy.key] = strategy
+
+    strategies = []
+    for region in settings.regions:
+        for query in settings.queries:
+            strategy = SearchStrategy(query=query, region=region)
+            strategies.append(saved.get(strategy.key, strategy))
+    return StrategyBook(strategies=strategies)
+
+
+def save_strategy_book(path: Path, book: StrategyBook) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(".tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump({"strategies": [asdict(strategy) for strategy in book.strategies]}, handle, ensure_ascii=False, indent=2)
+    temp_path.replace(path)
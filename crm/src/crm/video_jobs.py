@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from tqdm import tqdm
+
+from crm.instrumentation import video_scope
+
+
+def _run_isolated(process: Callable[[str], bool | None], video_id: str) -> bool:
+    try:
+        with video_scope(video_id):
+            return bool(process(video_id))
+    except Exception as exc:
+        print(f"Error processing video '{video_id}': {exc}")
+        return False
+
+
+def run_video_jobs(
+    video_ids: list[str],
+    process: Callable[[str], bool | None],
+    jobs: int,
+    desc: str,
+    stop_after_first_success: bool = False,
+) -> int:
+    if jobs <= 1:
+        completed = 0
+        for video_id in tqdm(video_ids, desc=desc):
+            if _run_isolated(process, video_id):
+                completed += 1
+                if stop_after_first_success:
+                    print("Stopped after processing one new video.")
+                    break
+        return completed
+
+    completed = 0
+    stop_scheduling = False
+    pending_ids: Iterator[str] = iter(video_ids)
+    with ThreadPoolExecutor(max_workers=jobs) as executor, tqdm(total=len(video_ids), desc=desc) as progress:
+        in_flight: set[Future[bool]] = set()
+
+        def schedule() -> None:
+            while not stop_scheduling and len(in_flight) < jobs:
+                video_id = next(pending_ids, None)
+                if video_id is None:
+                    return
+                in_flight.add(executor.submit(_run_isolated, process, video_id))
+
+        schedule()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                progress.update(1)
+                if future.result():
+                    completed += 1
+                    if stop_after_first_success and not stop_scheduling:
+                        stop_scheduling = True
+                        print(
+                            "Stopped scheduling after processing one new video; "
+                            f"waiting for {len(in_flight)} running video(s) to finish."
+                        )
+            schedule()
+
+    return completed
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from crm.paths import course_work_dir
+from crm.snippet_packing import SnippetSource
+
+VIDEO_MANIFEST_VERSION = 1
+
+
+@dataclass(frozen=True)
+class VideoManifest:
+    # One input hash per snippet, in file order, plus a fingerprint of the snippet timings and
+    # output format so timing-only changes still rewrite the file without re-translating.
+    settings: str
+    layout: str
+    snippets: list[str]
+    version: int = VIDEO_MANIFEST_VERSION
+
+
+def video_manifest_dir(language_code: str) -> Path:
+    return course_work_dir(language_code) / "manifests"
+
+
+def video_manifest_file(manifest_dir: Path, video_id: str) -> Path:
+    return manifest_dir / f"{video_id}.json"
+
+
+def _sha1(*parts: str) -> str:
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def translation_settings_fingerprint(settings: dict[str, Any]) -> str:
+    return _sha1(json.dumps(settings, sort_keys=True))
+
+
+def snippet_input_hash(settings_fingerprint: str, source: SnippetSource) -> str:
+    return _sha1(settings_fingerprint, source.text, source.context)
+
+
+def snippet_source_hash(start: float, duration: float, words: Sequence[str]) -> str:
+    # What a video file still shows of a snippet's input: its timing in whole milliseconds and
+    # its words. Lets --refresh adopt files written before manifests existed.
+    return _sha1(str(round(start * 1000)), str(round(duration * 1000)), *words)
+
+
+def layout_fingerprint(sources: list[SnippetSource], data_format: str) -> str:
+    return _sha1(data_format, *(f"{source.start!r}/{source.duration!r}" for source in sources))
+
+
+def load_video_manifest(path: Path) -> VideoManifest | None:
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as handle:
+        data = json.load(handle)
+    if data.get("version") != VIDEO_MANIFEST_VERSION:
+        return None
+    return VideoManifest(**data)
+
+
+def save_video_manifest(path: Path, manifest: VideoManifest) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(asdict(manifest), handle, ensure_ascii=False)
+    temp_path.replace(path)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from crm.paths import course_vocab_dir, course_vocab_file
+from crm.video_data import VideoWord, read_video_data, video_data_file
+from crm.word_normalization import canonical_word
+
+VOCAB_INDEX_VERSION = 2
+
+
+@dataclass
+class VocabEntry:
+    original: str
+    first_snippet: int
+    forms: list[str] = field(default_factory=list)
+    meanings: list[str] = field(default_factory=list)
+    count: int = 0
+
+    def add(self, form: str, meaning: str) -> None:
+        self.count += 1
+        if form not in self.forms:
+            self.forms.append(form)
+        meaning = meaning.strip()
+        if meaning and meaning not in self.meanings:
+            self.meanings.append(meaning)
+
+
+def video_vocab_file(vocab_dir: Path, video_id: str) -> Path:
+    return vocab_dir / f"{video_id}.json"
+
+
+def build_video_vocab_index(translations: Sequence[Sequence[VideoWord]]) -> dict[str, Any]:
+    # Words are merged by canonical key, so case and optional marks do not split them, and listed
+    # most frequent first so Vocab practice can introduce common words without sorting. The first
+    # form seen is the one shown; the others are kept for lookups.
+    entries: dict[str, VocabEntry] = {}
+    for snippet_index, translated_words in enumerate(translations):
+        for word_entry in translated_words:
+            key = canonical_word(word_entry.word)
+            entry = entries.get(key)
+            if entry is None:
+                entry = entries[key] = VocabEntry(original=word_entry.word, first_snippet=snippet_index)
+            entry.add(word_entry.word, word_entry.meaning)
+
+    ranked = sorted(entries.values(), key=lambda entry: (-entry.count, entry.first_snippet))
+    return {
+        "version": VOCAB_INDEX_VERSION,
+        "snippetCount": len(translations),
+        "words": [
+            {
+                "original": entry.original,
+                "forms": entry.forms,
+                "meanings": entry.meanings,
+                "count": entry.count,
+                "firstSnippet": entry.first_snippet,
+            }
+            for entry in ranked
+        ],
+    }
+
+
+def _write_json(path: Path, data: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    with temp_path.open("w", encoding="utf-8") as handle:
+        json.dump(data, handle, ensure_ascii=False, separators=(",", ":"))
+    temp_path.replace(path)
+
+
+def write_video_vocab_index(
+    vocab_dir: Path,
+    video_id: str,
+    translations: Sequence[Sequence[VideoWord]],
+) -> dict[str, Any]:
+    index = build_video_vocab_index(translations)
+    _write_json(video_vocab_file(vocab_dir, video_id), index)
+    return index
+
+
+def _load_or_build_video_index(vocab_dir: Path, video_dir: Path, video_id: str) -> dict[str, Any] | None:
+    index_file = video_vocab_file(vocab_dir, video_id)
+    data_file = video_data_file(video_dir, video_id)
+    if index_file.exists() and (not data_file.exists() or index_file.stat().st_mtime >= data_file.stat().st_mtime):
+        with index_file.open("r", encoding="utf-8") as handle:
+            index = json.load(handle)
+        if index.get("version") == VOCAB_INDEX_VERSION:
+            return index
+    if not data_file.exists():
+        return None
+    snippets = read_video_data(data_file)
+    return write_video_vocab_index(vocab_dir, video_id, [snippet.words for snippet in snippets])
+
+
+def write_course_vocab_index(language_code: str, video_ids: Sequence[str], video_dir: Path) -> dict[str, Any]:
+    # Document frequency counts the videos a word appears in; occurrences sum its counts across them.
+    # Words are merged by canonical key and shown in the form of the first video that has them.
+    originals: dict[str, str] = {}
+    document_frequency: dict[str, int] = {}
+    occurrences: dict[str, int] = {}
+    indexed_videos: list[str] = []
+    for video_id in video_ids:
+        index = _load_or_build_video_index(course_vocab_dir(language_code), video_dir, video_id)
+        if index is None:
+            continue
+        indexed_videos.append(video_id)
+        for word in index["words"]:
+            key = canonical_word(word["original"])
+            originals.setdefault(key, word["original"])
+            document_frequency[key] = document_frequency.get(key, 0) + 1
+            occurrences[key] = occurrences.get(key, 0) + word["count"]
+
+    ranked = sorted(document_frequency, key=lambda key: (-document_frequency[key], -occurrences[key]))
+    course_index = {
+        "version": VOCAB_INDEX_VERSION,
+        "videos": indexed_videos,
+        "words": [
+            {
+                "original": originals[key],
+                "videoCount": document_frequency[key],
+                "count": occurrences[key],
+            }
+            for key in ranked
+        ],
+    }
+    _write_json(course_vocab_file(language_code), course_index)
+    return course_index
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Tatweel and the Arabic vowel, shadda and Quranic marks are optional in writing, so a word
+# is the same with or without them. Latin diacritics stay significant (Vietnamese tones,
+# French accents). Both rules only touch their own script, so one key serves every course.
+ARABIC_OPTIONAL_MARKS_RE = re.compile(
+    "[\u0640\u0610-\u061A\u064B-\u065F\u0670"
+    "\u06D6-\u06DC\u06DF-\u06E4\u06E7\u06E8\u06EA-\u06ED]"
+)
+
+
+WORD_RE = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=1)
+def _marks_re() -> re.Pattern[str]:
+    # Every combining mark of the Basic Multilingual Plane. \w leaves them out, which splits
+    # words with harakat, Indic vowel signs or accents that have no precomposed form.
+    marks = "".join(chr(code) for code in range(0x10000) if unicodedata.category(chr(code)).startswith("M"))
+    return re.compile(f"[{re.escape(marks)}]")
+
+
+@lru_cache(maxsize=1)
+def _marked_word_re() -> re.Pattern[str]:
+    return re.compile(f"(?:[^\\W_]+|{_marks_re().pattern}+)+")
+
+
+def extract_words(text: str) -> list[str]:
+    # Display forms in NFC; runs of digits or stray marks are not words. Text without marks
+    # after composition, which is most subtitle text, takes the plain pattern.
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    if _marks_re().search(text) is None:
+        return [token for token in WORD_RE.findall(text) if not token.isnumeric()]
+    return [
+        token
+        for token in _marked_word_re().findall(text)
+        if any(character.isalpha() for character in token)
+    ]
+
+
+def canonical_word(word: str) -> str:
+    # NFC first, so hamza and madda compose onto their letters before the optional marks go.
+    word = ARABIC_OPTIONAL_MARKS_RE.sub("", unicodedata.normalize("NFC", word.strip()))
+    return unicodedata.normalize("NFC", word.casefold())
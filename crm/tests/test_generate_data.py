@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from crm.commands.generate_data import WordEntry, _reusable_translations
+from crm.settings import COMPACT_FORMAT, LEGACY_FORMAT
+from crm.snippet_packing import build_snippet_sources
+from crm.video_data import video_data_file, write_video_data
+
+CUES = [
+    {"text": "hola mundo", "start": 0.0, "duration": 1.5},
+    {"text": "buenos días", "start": 1.5, "duration": 2.0},
+    {"text": "hasta luego", "start": 3.5, "duration": 1.0},
+]
+
+
+def _translate(source):
+    return [WordEntry(word=word, meaning=f"gloss of {word}") for word in source.words]
+
+
+def test_refresh_without_manifest_reuses_snippets_whose_timing_and_words_match(tmp_path: Path):
+    for data_format in (LEGACY_FORMAT, COMPACT_FORMAT):
+        output_file = video_data_file(tmp_path, f"video-{data_format}")
+        old_sources = build_snippet_sources(CUES)
+        write_video_data(
+            output_file,
+            old_sources,
+            [_translate(source) for source in old_sources],
+            data_format=data_format,
+        )
+        edited_cues = [CUES[0], {**CUES[1], "text": "buenas noches"}, CUES[2]]
+        sources = build_snippet_sources(edited_cues)
+
+        reused = _reusable_translations(output_file, None, ["unused"] * len(sources), sources)
+
+        assert sorted(reused) == [0, 2]
+        assert reused[0] == _translate(sources[0])
+        assert reused[2] == _translate(sources[2])
+
+
+def test_refresh_without_stored_file_reuses_nothing(tmp_path: Path):
+    sources = build_snippet_sources(CUES)
+
+    assert _reusable_translations(tmp_path / "missing.json", None, [], sources) == {}
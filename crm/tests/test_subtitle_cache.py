@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+from crm.subtitle_cache import SubtitleCache
+
+BODY = "WEBVTT\n\n00:00:00.000 --> 00:00:01.000\nhola\n"
+
+
+def test_prune_keeps_blobs_other_bodies_still_reference(tmp_path: Path):
+    cache = SubtitleCache(tmp_path)
+    cache.put_body("video00001", "es", False, BODY)
+    cache.put_body("video00002", "es", False, BODY)
+    cache.put_body("video00002", "en", True, BODY + "extra\n")
+
+    removed_entries, removed_blobs = cache.prune(video_id="video00002")
+
+    assert (removed_entries, removed_blobs) == (2, 1)
+    assert cache.get_body("video00001", "es", False).text == BODY
+
+
+def test_put_body_waits_for_a_running_prune_in_another_process(tmp_path: Path):
+    # Two caches on one directory stand in for two crm processes.
+    pruning = SubtitleCache(tmp_path)
+    writing = SubtitleCache(tmp_path)
+    finished = threading.Event()
+
+    def put_body() -> None:
+        writing.put_body("video00001", "es", False, BODY)
+        finished.set()
+
+    with pruning._write_transaction():
+        thread = threading.Thread(target=put_body)
+        thread.start()
+        assert not finished.wait(0.3)
+        assert not list(tmp_path.glob("blobs/*/*.vtt"))
+    thread.join(timeout=5)
+
+    assert finished.is_set()
+    assert pruning.get_body("video00001", "es", False).text == BODY
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from crm.commands.generate_data import TranslationBatch, _parse_response
+from crm.translation_backends import (
+    BackendSettings,
+    OpenAICompatibleTranslationBackend,
+    OpenAITranslationBackend,
+    StructuredResponse,
+)
+
+
+class _NoUsageBackend(OpenAITranslationBackend):
+    def parse(self, messages, text_format):
+        return StructuredResponse(output_parsed=None, input_tokens=None, output_tokens=None)
+
+
+def test_missing_usage_is_reported_as_unknown():
+    backend = OpenAICompatibleTranslationBackend(BackendSettings(base_url="http://localhost:8080/v1"))
+    completion = SimpleNamespace(choices=[], usage=None)
+
+    response = backend._from_completion(completion)
+
+    assert response.input_tokens is None
+    assert response.output_tokens is None
+    assert response.used_tokens is None
+
+
+def test_reported_usage_is_summed():
+    backend = OpenAITranslationBackend(BackendSettings())
+    response = backend._from_response(
+        SimpleNamespace(output_parsed=None, usage=SimpleNamespace(input_tokens=30, output_tokens=12))
+    )
+
+    assert response.used_tokens == 42
+
+
+def test_token_budget_keeps_the_estimate_without_usage():
+    # The request reserves its estimate of 160 tokens out of 600; refunding it would leave room
+    # for another 500 at once.
+    backend = _NoUsageBackend(BackendSettings(tokens_per_minute=600))
+    messages = [{"role": "user", "content": "palabra " * 60}]
+
+    _parse_response(backend, messages, TranslationBatch)
+
+    assert backend.scheduler.tokens.reserve(500) > 0
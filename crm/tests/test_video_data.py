@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from crm.settings import CHUNKED_FORMAT
+from crm.snippet_packing import build_snippet_sources
+from crm.video_data import (
+    StoredWord,
+    chunk_boundaries,
+    read_video_data,
+    video_chunk_file,
+    write_video_data,
+)
+
+@dataclass(frozen=True)
+class _Snippet:
+    start: float
+    duration: float
+
+
+# Overlapping captions listed out of order, as some auto-generated tracks do.
+OUT_OF_ORDER_CUES = [
+    {"text": "segundo", "start": 70.0, "duration": 2.0},
+    {"text": "primero", "start": 5.0, "duration": 80.0},
+    {"text": "tercero", "start": 130.5, "duration": 1.0},
+    {"text": "cero", "start": 0.5, "duration": 1.0},
+]
+
+
+def test_snippet_sources_follow_playback_order():
+    sources = build_snippet_sources(OUT_OF_ORDER_CUES)
+
+    assert [source.text for source in sources] == ["cero", "primero", "segundo", "tercero"]
+    assert [source.index for source in sources] == [0, 1, 2, 3]
+    assert sources[1].context == "cero primero segundo"
+
+
+def test_chunked_index_is_sorted_for_out_of_order_snippets(tmp_path: Path):
+    output_file = tmp_path / "video.json"
+    snippets = [_Snippet(cue["start"], cue["duration"]) for cue in OUT_OF_ORDER_CUES]
+    translations = [[StoredWord(cue["text"], f"gloss of {cue['text']}")] for cue in OUT_OF_ORDER_CUES]
+
+    write_video_data(output_file, snippets, translations, data_format=CHUNKED_FORMAT, chunk_seconds=60)
+
+    index = json.loads(output_file.read_text(encoding="utf-8"))
+    assert index["start_ms"] == [500, 5000, 70000, 130500]
+    assert index["chunks"]["start_ms"] == [500, 70000, 130500]
+    assert index["chunks"]["first_snippet"] == [0, 2, 3]
+    first_chunk = json.loads(video_chunk_file(output_file, 0).read_text(encoding="utf-8"))
+    assert first_chunk["words"]["native"] == ["cero", "primero"]
+    assert [snippet.words[0].word for snippet in read_video_data(output_file)] == [
+        "cero",
+        "primero",
+        "segundo",
+        "tercero",
+    ]
+
+
+def test_chunk_boundaries_reject_unsorted_snippets():
+    snippets = [_Snippet(70.0, 1.0), _Snippet(5.0, 1.0)]
+
+    with pytest.raises(ValueError):
+        chunk_boundaries(snippets, 60)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from crm.video_discovery import QuotaLedger
+
+
+def test_quota_exceeded_exhausts_the_day_for_later_runs(tmp_path: Path):
+    path = tmp_path / "youtube_quota.json"
+    ledger = QuotaLedger(path, daily_limit=10000, run_budget=500)
+    ledger.spend(101)
+
+    ledger.mark_exhausted()
+
+    assert ledger.remaining() == 0
+    later_run = QuotaLedger(path, daily_limit=10000)
+    assert later_run.remaining() == 0
+    assert not later_run.can_spend(1)
+    assert later_run.day_units == 101
+
+
+def test_exhausted_day_resets_on_the_next_quota_day(tmp_path: Path):
+    path = tmp_path / "youtube_quota.json"
+    QuotaLedger(path).mark_exhausted()
+
+    ledger = QuotaLedger(path)
+    ledger.day = "2000-01-01"
+
+    assert ledger.remaining() == ledger.daily_limit
@@ -0,0 +1,96 @@
+import { afterEach, describe, expect, it, vi } from 'vitest'
+
+import {
+  getChunkIndexForTime,
+  loadSnippetsOfVideoAt,
+  snippetsFromVideoData,
+  type ChunkedVideoIndex,
+} from './snippet'
+
+const chunkedIndex: ChunkedVideoIndex = {
+  format: 'chunked',
+  version: 1,
+  chunk_ms: 60000,
+  start_ms: [500, 10000, 60000, 200000],
+  chunks: { start_ms: [500, 60000, 200000], first_snippet: [0, 2, 3], bytes: [120, 90, 90] },
+}
+
+function compactChunk(native: string, startMs: number) {
+  return {
+    format: 'compact',
+    version: 1,
+    words: { native: [native], translation: [`${native} meaning`] },
+    snippets: { start_ms: [startMs], duration_ms: [1000], words: [[0]] },
+  }
+}
+
+afterEach(() => {
+  vi.unstubAllGlobals()
+})
+
+describe('snippet', () => {
+  it('reads compact video data the same as legacy video data', () => {
+    const legacy = snippetsFromVideoData({
+      snippets: [
+        {
+          start: 1.5,
+          duration: 2.25,
+          words: [
+            { native: 'salut', translation: 'hi' },
+            { native: 'toi', translation: 'you' },
+          ],
+        },
+        {
+          start: 4,
+          duration: 1,
+          words: [{ native: 'salut', translation: 'hi' }],
+        },
+      ],
+    })
+    const compact = snippetsFromVideoData({
+      format: 'compact',
+      version: 1,
+      words: { native: ['salut', 'toi'], translation: ['hi', 'you'] },
+      snippets: { start_ms: [1500, 4000], duration_ms: [2250, 1000], words: [[0, 1], [0]] },
+    })
+
+    expect(compact).toEqual(legacy)
+  })
+
+  it('finds the chunk playing at a given time', () => {
+    expect(getChunkIndexForTime(chunkedIndex, 0)).toBe(0)
+    expect(getChunkIndexForTime(chunkedIndex, 59.9)).toBe(0)
+    expect(getChunkIndexForTime(chunkedIndex, 60)).toBe(1)
+    expect(getChunkIndexForTime(chunkedIndex, 150)).toBe(1)
+    expect(getChunkIndexForTime(chunkedIndex, 500)).toBe(2)
+  })
+
+  it('loads the chunk at the start time before the rest of a chunked video', async () => {
+    const files: Record<string, unknown> = {
+      '/data/fra/videos/abc.json': chunkedIndex,
+      '/data/fra/videos/abc/0.json': {
+        ...compactChunk('salut', 500),
+        snippets: { start_ms: [500, 10000], duration_ms: [1000, 1000], words: [[0], [0]] },
+      },
+      '/data/fra/videos/abc/1.json': compactChunk('toi', 60000),
+      '/data/fra/videos/abc/2.json': compactChunk('moi', 200000),
+    }
+    const fetchMock = vi.fn(async (path: string) => ({
+      ok: path in files,
+      json: async () => files[path],
+    }))
+    vi.stubGlobal('fetch', fetchMock)
+
+    const { snippets, isComplete, complete } = await loadSnippetsOfVideoAt('fra', 'abc', 90)
+
+    expect(snippets.map((snippet) => snippet.words[0]?.original)).toEqual(['toi'])
+    expect(isComplete).toBe(false)
+    expect(fetchMock.mock.calls.map(([path]) => path)).toEqual([
+      '/data/fra/videos/abc.json',
+      '/data/fra/videos/abc/1.json',
+      '/data/fra/videos/abc/0.json',
+      '/data/fra/videos/abc/2.json',
+    ])
+    expect((await complete).map((snippet) => snippet.start)).toEqual([0.5, 10, 60, 200])
+  })
+})
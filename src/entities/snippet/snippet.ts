@@ -9,34 +9,92 @@ export interface Snippet {
   duration: number
 }
 
-interface SavedVideoData {
-  snippets: Array<{
-    start: number
-    duration: number
-    words: Array<{
-      native: string
-      translation: string
-    }>
-  }>
-}
-
-async function fetchVideoData(languageCode: string, videoId: string): Promise<SavedVideoData> {
-  const response = await fetch(`/data/${languageCode}/videos/${videoId}.json`)
+interface SavedWord {
+  native: string
+  translation: string
+}
+
+interface SavedSnippet {
+  start: number
+  duration: number
+  words: SavedWord[]
+}
+
+interface LegacyVideoData {
+  snippets: SavedSnippet[]
+}
+
+interface CompactVideoData {
+  format: 'compact'
+  version: number
+  words: {
+    native: string[]
+    translation: string[]
+  }
+  snippets: {
+    start_ms: number[]
+    duration_ms: number[]
+    words: number[][]
+  }
+}
+
+type SavedVideoData = LegacyVideoData | CompactVideoData
+
+export interface ChunkedVideoIndex {
+  format: 'chunked'
+  version: number
+  chunk_ms: number
+  start_ms: number[]
+  chunks: {
+    start_ms: number[]
+    first_snippet: number[]
+    bytes: number[]
+  }
+}
+
+export interface VideoSnippetLoad {
+  snippets: Snippet[]
+  isComplete: boolean
+  complete: Promise<Snippet[]>
+}
+
+function videoDataPath(languageCode: string, videoId: string): string {
+  return `/data/${languageCode}/videos/${videoId}`
+}
+
+async function fetchJson<T>(path: string, description: string): Promise<T> {
+  const response = await fetch(path)
   if (!response.ok) {
-    throw new Error(`Failed to load video data for '${languageCode}/${videoId}'`)
+    throw new Error(`Failed to load ${description}`)
   }
 
-  return (await response.json()) as SavedVideoData
+  return (await response.json()) as T
 }
 
-function toWord(word: SavedVideoData['snippets'][number]['words'][number]): Word {
+async function fetchVideoData(
+  languageCode: string,
+  videoId: string,
+): Promise<SavedVideoData | ChunkedVideoIndex> {
+  return fetchJson<SavedVideoData | ChunkedVideoIndex>(
+    `${videoDataPath(languageCode, videoId)}.json`,
+    `video data for '${languageCode}/${videoId}'`,
+  )
+}
+
+function isChunkedVideoIndex(
+  videoData: SavedVideoData | ChunkedVideoIndex,
+): videoData is ChunkedVideoIndex {
+  return 'format' in videoData && videoData.format === 'chunked'
+}
+
+function toWord(word: SavedWord): Word {
   return {
     original: word.native,
     meanings: [word.translation],
   }
 }
 
-function toSnippet(snippet: SavedVideoData['snippets'][number]): Snippet {
+function toSnippet(snippet: SavedSnippet): Snippet {
   return {
     words: snippet.words.map(toWord),
     start: snippet.start,
@@ -44,7 +102,92 @@ function toSnippet(snippet: SavedVideoData['snippets'][number]): Snippet {
   }
 }
 
-export async function getSnippetsOfVideo(languageCode: string, videoId: string): Promise<Snippet[]> {
+function expandCompactSnippets(videoData: CompactVideoData): SavedSnippet[] {
+  const table = videoData.words.native.map((native, index) => ({
+    native,
+    translation: videoData.words.translation[index] ?? '',
+  }))
+  const { start_ms: starts, duration_ms: durations, words } = videoData.snippets
+
+  return starts.map((startMs, index) => ({
+    start: startMs / 1000,
+    duration: (durations[index] ?? 0) / 1000,
+    words: (words[index] ?? []).map((wordIndex) => table[wordIndex]).filter((word) => word !== undefined),
+  }))
+}
+
+export function snippetsFromVideoData(videoData: SavedVideoData): Snippet[] {
+  const snippets = 'format' in videoData ? expandCompactSnippets(videoData) : videoData.snippets
+  return snippets.map(toSnippet)
+}
+
+function findLastAtOrBefore(sortedValues: number[], value: number): number {
+  let low = 0
+  let high = sortedValues.length - 1
+  let matchingIndex = 0
+
+  while (low <= high) {
+    const middle = Math.floor((low + high) / 2)
+
+    if (value >= sortedValues[middle]) {
+      matchingIndex = middle
+      low = middle + 1
+      continue
+    }
+
+    high = middle - 1
+  }
+
+  return matchingIndex
+}
+
+export function getChunkIndexForTime(videoIndex: ChunkedVideoIndex, currentTimeSeconds: number): number {
+  const snippetIndex = findLastAtOrBefore(videoIndex.start_ms, currentTimeSeconds * 1000)
+  return findLastAtOrBefore(videoIndex.chunks.first_snippet, snippetIndex)
+}
+
+async function fetchChunk(languageCode: string, videoId: string, chunkIndex: number): Promise<Snippet[]> {
+  const chunk = await fetchJson<CompactVideoData>(
+    `${videoDataPath(languageCode, videoId)}/${chunkIndex}.json`,
+    `chunk ${chunkIndex} of video data for '${languageCode}/${videoId}'`,
+  )
+  return snippetsFromVideoData(chunk)
+}
+
+// Chunked videos resolve with the chunk playing at startSeconds first, so practice can begin
+// before the rest of the video has arrived; `complete` holds every snippet once it has, and
+// `isComplete` tells whether `snippets` already is the whole video.
+export async function loadSnippetsOfVideoAt(
+  languageCode: string,
+  videoId: string,
+  startSeconds: number,
+): Promise<VideoSnippetLoad> {
   const videoData = await fetchVideoData(languageCode, videoId)
-  return videoData.snippets.map(toSnippet)
+  if (!isChunkedVideoIndex(videoData)) {
+    const snippets = snippetsFromVideoData(videoData)
+    return { snippets, isComplete: true, complete: Promise.resolve(snippets) }
+  }
+
+  const chunkCount = videoData.chunks.first_snippet.length
+  if (chunkCount === 0) {
+    return { snippets: [], isComplete: true, complete: Promise.resolve([]) }
+  }
+
+  const firstChunkIndex = getChunkIndexForTime(videoData, startSeconds)
+  const snippets = await fetchChunk(languageCode, videoId, firstChunkIndex)
+  if (chunkCount === 1) {
+    return { snippets, isComplete: true, complete: Promise.resolve(snippets) }
+  }
+
+  const complete = Promise.all(
+    Array.from({ length: chunkCount }, (_, chunkIndex) =>
+      chunkIndex === firstChunkIndex ? snippets : fetchChunk(languageCode, videoId, chunkIndex),
+    ),
+  ).then((chunks) => chunks.flat())
+
+  return { snippets, isComplete: false, complete }
+}
+
+export async function getSnippetsOfVideo(languageCode: string, videoId: string): Promise<Snippet[]> {
+  return (await loadSnippetsOfVideoAt(languageCode, videoId, 0)).complete
 }
@@ -8,7 +8,7 @@ const {
   getCourse,
   getSavedCardsForWords,
   getVideoById,
-  getSnippetsOfVideo,
+  loadSnippetsOfVideoAt,
   loadYoutubeIframeApi,
   pickRandomVideo,
   push,
@@ -18,7 +18,7 @@ const {
   getCourse: vi.fn(),
   getSavedCardsForWords: vi.fn(),
   getVideoById: vi.fn(),
-  getSnippetsOfVideo: vi.fn(),
+  loadSnippetsOfVideoAt: vi.fn(),
   loadYoutubeIframeApi: vi.fn(),
   pickRandomVideo: vi.fn(),
   push: vi.fn(),
@@ -29,12 +29,15 @@ const { loadVideoByIdMock, destroyMock } = vi.hoisted(() => ({
   destroyMock: vi.fn(),
 }))
 
+const routeQuery = vi.hoisted((): Record<string, string> => ({}))
+
 vi.mock('vue-router', () => ({
   useRoute: () => ({
     params: {
       videoId: 'abc123',
       practiceMode: 'parallel',
     },
+    query: routeQuery,
   }),
   useRouter: () => ({ push }),
   RouterLink: {
@@ -54,7 +57,7 @@ vi.mock('@/entities/course/course', () => ({
 }))
 
 vi.mock('@/entities/snippet/snippet', () => ({
-  getSnippetsOfVideo,
+  loadSnippetsOfVideoAt,
 }))
 
 vi.mock('@/entities/flashcard/flashcardStore', () => ({
@@ -100,6 +103,10 @@ vi.mock('@/features/flashcard-review/FlashCard.vue', () => ({
 
 import FlowPage from './FlowPage.vue'
 
+function loadedSnippets(snippets: unknown[]) {
+  return { snippets, isComplete: true, complete: Promise.resolve(snippets) }
+}
+
 afterEach(() => {
   cleanup()
 })
@@ -112,11 +119,12 @@ describe('FlowPage', () => {
     getCourse.mockReset()
     getSavedCardsForWords.mockReset()
     getVideoById.mockReset()
-    getSnippetsOfVideo.mockReset()
+    loadSnippetsOfVideoAt.mockReset()
     loadYoutubeIframeApi.mockReset()
     pickRandomVideo.mockReset()
     loadVideoByIdMock.mockReset()
     destroyMock.mockReset()
+    delete routeQuery.t
     getCourse.mockResolvedValue({
       languageCode: 'deu',
       label: 'German',
@@ -124,16 +132,18 @@ describe('FlowPage', () => {
     })
     getSavedCardsForWords.mockResolvedValue([])
     getVideoById.mockResolvedValue({ youtubeId: 'abc123', languageCode: 'deu' })
-    getSnippetsOfVideo.mockResolvedValue([
-      {
-        start: 0,
-        duration: 4,
-        words: [
-          { original: 'hallo', meanings: ['hello'] },
-          { original: 'welt', meanings: ['world'] },
-        ],
-      },
-    ])
+    loadSnippetsOfVideoAt.mockResolvedValue(
+      loadedSnippets([
+        {
+          start: 0,
+          duration: 4,
+          words: [
+            { original: 'hallo', meanings: ['hello'] },
+            { original: 'welt', meanings: ['world'] },
+          ],
+        },
+      ]),
+    )
     loadYoutubeIframeApi.mockResolvedValue(undefined)
     window.YT = {
       PlayerState: {
@@ -159,7 +169,7 @@ describe('FlowPage', () => {
 
     await waitFor(() => {
       expect(getVideoById).toHaveBeenCalledWith('deu', 'abc123')
-      expect(getSnippetsOfVideo).toHaveBeenCalledWith('deu', 'abc123')
+      expect(loadSnippetsOfVideoAt).toHaveBeenCalledWith('deu', 'abc123', 0)
     })
 
     expect(await findByText('Intro hallo')).toBeTruthy()
@@ -192,25 +202,95 @@ describe('FlowPage', () => {
     randomSpy.mockRestore()
   })
 
-  it('can prefer a due seen card from elsewhere in the video', async () => {
+  it('starts practice on the first chunk before the rest of the video arrives', async () => {
     const randomSpy = vi.spyOn(Math, 'random').mockReturnValue(0)
-    getSnippetsOfVideo.mockResolvedValue([
-      {
-        start: 0,
-        duration: 4,
-        words: [{ original: 'hallo', meanings: ['hello'] }],
-      },
-      {
-        start: 4,
-        duration: 4,
-        words: [{ original: 'welt', meanings: ['world'] }],
-      },
+    loadSnippetsOfVideoAt.mockResolvedValue({
+      snippets: [
+        {
+          start: 0,
+          duration: 4,
+          words: [{ original: 'hallo', meanings: ['hello'] }],
+        },
+      ],
+      isComplete: false,
+      complete: new Promise(() => {}),
+    })
+
+    const { findByText } = render(FlowPage)
+
+    expect(await findByText('Intro hallo')).toBeTruthy()
+    randomSpy.mockRestore()
+  })
+
+  it('waits for every chunk before offering due cards from elsewhere in the video', async () => {
+    const randomSpy = vi.spyOn(Math, 'random').mockReturnValue(0)
+    loadSnippetsOfVideoAt.mockResolvedValue({
+      snippets: [
+        {
+          start: 0,
+          duration: 4,
+          words: [{ original: 'hallo', meanings: ['hello'] }],
+        },
+      ],
+      isComplete: false,
+      complete: new Promise(() => {}),
+    })
+    getSavedCardsForWords.mockResolvedValue([
       {
-        start: 8,
-        duration: 4,
-        words: [{ original: 'tschuss', meanings: ['bye'] }],
+        cardId: 'deu::tschuss',
+        languageCode: 'deu',
+        original: 'tschuss',
+        meanings: ['bye'],
+        due: new Date('2026-04-20T12:00:00'),
+        stability: 0,
+        difficulty: 0,
+        elapsed_days: 0,
+        scheduled_days: 0,
+        learning_steps: 0,
+        reps: 1,
+        lapses: 0,
+        state: 2,
       },
     ])
+
+    const { findByText, queryByText } = render(FlowPage)
+
+    expect(await findByText('Intro hallo')).toBeTruthy()
+    expect(queryByText('Review tschuss')).toBeNull()
+    randomSpy.mockRestore()
+  })
+
+  it('loads the snippets around the start time in the route', async () => {
+    routeQuery.t = '754'
+
+    render(FlowPage)
+
+    await waitFor(() => {
+      expect(loadSnippetsOfVideoAt).toHaveBeenCalledWith('deu', 'abc123', 754)
+    })
+  })
+
+  it('can prefer a due seen card from elsewhere in the video', async () => {
+    const randomSpy = vi.spyOn(Math, 'random').mockReturnValue(0)
+    loadSnippetsOfVideoAt.mockResolvedValue(
+      loadedSnippets([
+        {
+          start: 0,
+          duration: 4,
+          words: [{ original: 'hallo', meanings: ['hello'] }],
+        },
+        {
+          start: 4,
+          duration: 4,
+          words: [{ original: 'welt', meanings: ['world'] }],
+        },
+        {
+          start: 8,
+          duration: 4,
+          words: [{ original: 'tschuss', meanings: ['bye'] }],
+        },
+      ]),
+    )
     getSavedCardsForWords.mockResolvedValue([
       {
         cardId: 'deu::tschuss',
@@ -306,7 +386,7 @@ describe('FlowPage', () => {
     const { getByRole } = render(FlowPage)
 
     await waitFor(() => {
-      expect(getSnippetsOfVideo).toHaveBeenCalledWith('deu', 'abc123')
+      expect(loadSnippetsOfVideoAt).toHaveBeenCalledWith('deu', 'abc123', 0)
     })
 
     await fireEvent.click(getByRole('button', { name: 'Switch Video' }))